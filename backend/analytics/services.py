@@ -7,12 +7,12 @@ from dataclasses import dataclass
 from datetime import datetime, time, timedelta
 from typing import Any, Iterable, Sequence
 
-from django.db import models
 from django.db.models import Prefetch, QuerySet
 from django.utils import timezone
 
 from accounts.models import User
 from correspondence.models import Correspondence, Minute
+from correspondence.services import CorrespondenceSearchService
 from dms.models import Document
 from organization.models import Office, OfficeMembership
 
@@ -472,14 +472,8 @@ class AnalyticsService:
             "is_deleted": False,
         }
         qs = Correspondence.objects.filter(**filters).select_related("owning_office").order_by("-updated_at")
-        if query:
-            qs = qs.filter(
-                (
-                    models.Q(subject__icontains=query)
-                    | models.Q(reference_number__icontains=query)
-                    | models.Q(sender_name__icontains=query)
-                )
-            )
+        if query and query.strip():
+            qs = CorrespondenceSearchService.search(qs, query).order_by("-search_rank", "-updated_at")
         records = []
         for item in qs[:limit]:
             records.append(
@@ -31,6 +31,8 @@ class ActivityLog(UUIDModel):
         CORRESPONDENCE_APPROVED = "correspondence_approved", "Correspondence Approved"
         CORRESPONDENCE_REJECTED = "correspondence_rejected", "Correspondence Rejected"
         CORRESPONDENCE_COMPLETED = "correspondence_completed", "Correspondence Completed"
+        CORRESPONDENCE_ATTACHMENT_DOWNLOADED = "correspondence_attachment_downloaded", "Correspondence Attachment Downloaded"
+        CORRESPONDENCE_EXPORTED = "correspondence_exported", "Correspondence Exported"
 
         # User actions
         USER_LOGIN = "user_login", "User Login"
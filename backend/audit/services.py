@@ -114,6 +114,44 @@ class AuditService:
             success=success,
         )
 
+    @staticmethod
+    def log_document_activities(
+        user,
+        action: str,
+        documents,
+        request=None,
+        description: str = "",
+        metadata: dict[str, Any] | None = None,
+        success: bool = True,
+    ) -> list[ActivityLog]:
+        """Log the same document activity for many documents with a single bulk insert.
+
+        ``documents`` is an iterable of ``Document`` instances or ``(id, title)`` pairs.
+        """
+        ip_address = AuditService.get_client_ip(request) if request else None
+        user_agent = AuditService.get_user_agent(request) if request else ""
+        entries = []
+        for document in documents:
+            document_id, title = (document.id, document.title) if hasattr(document, "id") else document
+            entries.append(
+                ActivityLog(
+                    user=user,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                    action=action,
+                    object_type="document",
+                    object_id=str(document_id),
+                    object_repr=(title or "")[:255],
+                    module="dms",
+                    description=description or f"{action.replace('_', ' ').title()} for document: {title}",
+                    metadata=metadata or {},
+                    success=success,
+                )
+            )
+        created = ActivityLog.objects.bulk_create(entries, batch_size=500)
+        logger.info(f"Audit logs created: {action} by {user} on {len(created)} document(s)")
+        return created
+
     @staticmethod
     def log_correspondence_activity(
         user,
@@ -4,15 +4,24 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets
 from rest_framework.permissions import IsAuthenticated
 
+from common.pagination import KeysetPagination, KeysetPaginationMixin
+
 from .models import ActivityLog
 from .serializers import ActivityLogSerializer
 
 
-class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class ActivityLogCursorPagination(KeysetPagination):
+    ordering = ("-timestamp", "-id")
+    page_size = 50
+    max_page_size = 200
+
+
+class ActivityLogViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for audit logs."""
 
     serializer_class = ActivityLogSerializer
     permission_classes = [IsAuthenticated]
+    keyset_pagination_class = ActivityLogCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ["user", "action", "object_type", "module", "severity", "success"]
     search_fields = ["description", "object_repr", "user__username", "user__email"]
@@ -1,3 +1,20 @@
+"""Admin registrations for shared models."""
+
 from django.contrib import admin
 
-# Register your models here.
+from .models import ExportJob, StoredBlob
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "size", "content_type", "ref_count", "created_at")
+    search_fields = ("sha256", "storage_path")
+    readonly_fields = ("sha256", "size", "content_type", "storage_path", "ref_count", "created_at", "updated_at")
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "kind", "status", "requested_by", "file_size", "created_at", "expires_at")
+    list_filter = ("kind", "status")
+    search_fields = ("file_name", "requested_by__username")
+    readonly_fields = ("params", "storage_path", "file_size", "error", "completed_at", "created_at", "updated_at")
@@ -0,0 +1,131 @@
+"""Authorized delivery of stored files.
+
+Views check access and record the event, then hand the byte transfer to
+nginx through ``X-Accel-Redirect`` (``MEDIA_ACCEL_REDIRECT_PREFIX``), which
+serves ``Range`` requests from disk without tying up a Python worker. When no
+prefix is configured (local development) the file is streamed by Django with
+single-range support so PDF viewers behave the same way.
+"""
+
+from __future__ import annotations
+
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, parse_etags, quote_etag
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Return the inclusive ``(start, end)`` of a single byte range, or ``None`` for the whole file.
+
+    Raises ``ValueError`` when the range cannot be satisfied.
+    """
+
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        # Multi-range and malformed headers fall back to a full response.
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def is_range_continuation(request) -> bool:
+    """True for follow-up range fetches (a viewer paging through a PDF) rather than a fresh open."""
+
+    match = RANGE_PATTERN.match((request.headers.get("Range") or "").strip())
+    return bool(match and match.group(1) and int(match.group(1)) > 0)
+
+
+def _stream(storage_path: str, start: int, length: int):
+    with default_storage.open(storage_path, "rb") as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = handle.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def _django_response(request, storage_path: str, content_type: str) -> HttpResponse:
+    try:
+        size = default_storage.size(storage_path)
+    except (FileNotFoundError, OSError) as exc:
+        raise Http404("File not found") from exc
+
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        response = StreamingHttpResponse(_stream(storage_path, 0, size), content_type=content_type)
+        response["Content-Length"] = str(size)
+        return response
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(_stream(storage_path, start, length), status=206, content_type=content_type)
+    response["Content-Length"] = str(length)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+def protected_file_response(
+    request,
+    storage_path: str | None,
+    *,
+    file_name: str,
+    content_type: str = "",
+    etag: str | None = None,
+    inline: bool = False,
+    cache_control: str = "private, max-age=0, must-revalidate",
+) -> HttpResponse:
+    """Build the response for an already-authorized download of ``storage_path``."""
+
+    if not storage_path:
+        raise Http404("File not found")
+
+    quoted_etag = quote_etag(etag) if etag else None
+    if quoted_etag and quoted_etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = quoted_etag
+        response["Cache-Control"] = cache_control
+        return response
+
+    content_type = content_type or "application/octet-stream"
+    accel_prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "")
+    if accel_prefix:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{quote(storage_path.lstrip('/'))}"
+    else:
+        response = _django_response(request, storage_path, content_type)
+
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = content_disposition_header(not inline, file_name)
+    response["Cache-Control"] = cache_control
+    if quoted_etag:
+        response["ETag"] = quoted_etag
+    return response
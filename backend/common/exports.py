@@ -0,0 +1,131 @@
+"""Streaming ZIP exports built from files in ``default_storage``.
+
+Archives are produced by a generator: each stored file is read in chunks and
+deflated straight into the response (or a temporary file for background
+jobs), so memory use does not grow with the size of the export. A
+``manifest.json`` describing every entry is written last.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+READ_CHUNK_SIZE = 64 * 1024
+UNSAFE_NAME_CHARACTERS = re.compile(r"[^\w.\- ]+")
+
+
+@dataclass
+class ExportEntry:
+    """One file in an export: either a stored file or inline bytes."""
+
+    archive_name: str
+    storage_path: str | None = None
+    data: bytes | None = None
+    size: int | None = None
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable sink that hands written bytes back to the generator."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def safe_name(value: str, default: str = "file") -> str:
+    """A file or folder name that is safe inside an archive."""
+
+    cleaned = UNSAFE_NAME_CHARACTERS.sub("_", value or "").strip(" ._")
+    return cleaned[:120] or default
+
+
+class ArchiveNames:
+    """Hands out unique archive paths, suffixing duplicates with ``-2``, ``-3``..."""
+
+    def __init__(self):
+        self._seen: set[str] = set()
+
+    def __call__(self, path: str) -> str:
+        candidate, counter = path, 1
+        stem, dot, extension = path.rpartition(".")
+        if not dot or "/" in extension:
+            stem, dot, extension = path, "", ""
+        while candidate.lower() in self._seen:
+            counter += 1
+            candidate = f"{stem}-{counter}{dot}{extension}"
+        self._seen.add(candidate.lower())
+        return candidate
+
+
+def estimated_size(entries: Iterable[ExportEntry]) -> int:
+    return sum(entry.size or (len(entry.data) if entry.data is not None else 0) for entry in entries)
+
+
+def stream_zip(entries: Iterable[ExportEntry], manifest: dict) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``entries`` followed by ``manifest.json``."""
+
+    sink = _ZipSink()
+    files, missing = [], []
+    date_time = timezone.localtime().timetuple()[:6]
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for entry in entries:
+            if entry.data is None and not (entry.storage_path and default_storage.exists(entry.storage_path)):
+                missing.append(entry.archive_name)
+                continue
+
+            info = zipfile.ZipInfo(entry.archive_name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            digest, size = hashlib.sha256(), 0
+            with archive.open(info, mode="w", force_zip64=True) as target:
+                if entry.data is not None:
+                    chunks = [entry.data]
+                else:
+                    chunks = _read_chunks(entry.storage_path)
+                for chunk in chunks:
+                    target.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    yield from _drain(sink)
+            files.append({"path": entry.archive_name, "size": size, "sha256": digest.hexdigest()})
+            yield from _drain(sink)
+
+        body = {**manifest, "exported_at": timezone.now(), "files": files, "missing": missing}
+        archive.writestr("manifest.json", json.dumps(body, cls=DjangoJSONEncoder, indent=2))
+    yield from _drain(sink)
+
+
+def _drain(sink: _ZipSink) -> Iterator[bytes]:
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _read_chunks(storage_path: str) -> Iterator[bytes]:
+    with default_storage.open(storage_path, "rb") as handle:
+        while True:
+            chunk = handle.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
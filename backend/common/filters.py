@@ -0,0 +1,33 @@
+"""Reusable DRF filter backends."""
+
+from __future__ import annotations
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class TagFilter(BaseFilterBackend):
+    """Keep rows whose JSON tag list contains every ``?tag=`` value.
+
+    Uses jsonb containment (``@>``) so the lookup is served by a
+    ``jsonb_path_ops`` GIN index on the view's ``tag_field`` (default ``tags``).
+    """
+
+    query_param = "tag"
+
+    def filter_queryset(self, request, queryset, view):
+        tags = [tag.strip() for tag in request.query_params.getlist(self.query_param) if tag.strip()]
+        if not tags:
+            return queryset
+        field = getattr(view, "tag_field", "tags")
+        return queryset.filter(**{f"{field}__contains": tags})
+
+
+def facet_limit(request, default: int = 50, maximum: int = 500) -> int:
+    """Read ``?limit=`` for facet endpoints, capped at ``maximum``."""
+
+    try:
+        limit = int(request.query_params.get("limit", default))
+    except (TypeError, ValueError):
+        raise ValidationError({"limit": "A valid integer is required."})
+    return max(1, min(limit, maximum))
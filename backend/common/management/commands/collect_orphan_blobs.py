@@ -0,0 +1,46 @@
+"""Delete stored blobs that are no longer referenced by any version or attachment."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from common.services import BlobStorageService
+
+
+class Command(BaseCommand):
+    help = "Garbage-collect unreferenced content-addressed blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Only collect blobs untouched for at least this many hours",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the blobs that would be removed without deleting anything",
+        )
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Rebuild ref_count from live references before collecting",
+        )
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            corrected = BlobStorageService.recount()
+            self.stdout.write(f"Corrected reference counts on {corrected} blob(s)")
+
+        blobs = BlobStorageService.collect_garbage(
+            grace_hours=max(options["grace_hours"], 0),
+            dry_run=options["dry_run"],
+        )
+        reclaimed = sum(blob.size for blob in blobs)
+        if options["dry_run"]:
+            for blob in blobs:
+                self.stdout.write(f"{blob.sha256}  {blob.size}  {blob.storage_path}")
+            self.stdout.write(self.style.WARNING(f"{len(blobs)} orphan blob(s), {reclaimed} bytes (dry run)"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Removed {len(blobs)} orphan blob(s), reclaimed {reclaimed} bytes"))
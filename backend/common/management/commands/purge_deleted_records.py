@@ -0,0 +1,81 @@
+"""Permanently remove soft-deleted records past the retention window."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from common.services import RetentionService
+
+
+class Command(BaseCommand):
+    help = "Hard-delete (or archive) soft-deleted documents and correspondence older than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=list(RetentionService.PURGERS),
+            help="Record type to purge; may be repeated (default: all)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.RETENTION_DAYS,
+            help="Purge records soft-deleted more than this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.RETENTION_BATCH_SIZE,
+            help="Number of records to delete per transaction",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=settings.RETENTION_MAX_BATCHES,
+            help="Stop after this many batches per record type",
+        )
+        archive = parser.add_mutually_exclusive_group()
+        archive.add_argument(
+            "--archive",
+            dest="archive",
+            action="store_true",
+            default=None,
+            help="Write each batch to a ZIP under retention/ before deleting it",
+        )
+        archive.add_argument(
+            "--no-archive",
+            dest="archive",
+            action="store_false",
+            help="Delete without archiving, whatever RETENTION_ARCHIVE says",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be purged without deleting anything",
+        )
+
+    def handle(self, *args, **options):
+        reports = RetentionService.run(
+            labels=options.get("only"),
+            days=max(options["days"], 0),
+            archive=options["archive"],
+            dry_run=options["dry_run"],
+            batch_size=options["batch_size"],
+            max_batches=max(options["max_batches"], 1),
+        )
+        for report in reports:
+            summary = (
+                f"{report.label}: {report.records} record(s) deleted before {report.cutoff:%Y-%m-%d}, "
+                f"{report.files} file(s), {report.bytes} bytes"
+            )
+            if report.dry_run:
+                self.stdout.write(self.style.WARNING(f"{summary} (dry run)"))
+                continue
+            for path in report.archives:
+                self.stdout.write(f"  archived to {path}")
+            if report.error:
+                self.stderr.write(self.style.ERROR(f"{summary}; stopped after an error: {report.error}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,32 @@
+"""Rebuild the MinHash signatures used for near-duplicate detection."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from common.models import ContentSignature
+from common.services import DuplicateDetectionService
+
+
+class Command(BaseCommand):
+    help = "Recompute content signatures for document versions and correspondence."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            action="append",
+            choices=[choice for choice, _ in ContentSignature.Source.choices],
+            help="Source to rebuild; may be repeated (default: all)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows to read per database round trip",
+        )
+
+    def handle(self, *args, **options):
+        sources = options.get("source") or [choice for choice, _ in ContentSignature.Source.choices]
+        for source in sources:
+            indexed = DuplicateDetectionService.rebuild(source, batch_size=max(options["batch_size"], 1))
+            self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} {source} signature(s)"))
@@ -27,6 +27,7 @@ from dms.models import (
     DocumentVersion,
     DocumentWorkspace,
 )
+from dms.services import DocumentSearchService, DocumentVisibilityService
 from organization.models import Department, Directorate, Division, Office, OfficeMembership, Role
 from support.models import FaqEntry, HelpGuide, SupportTicket
 from workflow.models import ApprovalTask, TaskAction, WorkflowStep, WorkflowTemplate
@@ -679,6 +680,9 @@ class Command(BaseCommand):
             defaults={},
         )
 
+        DocumentSearchService.refresh([document.id])
+        DocumentVisibilityService.refresh([document.id])
+
         DocumentAccessLog.objects.update_or_create(
             document=document,
             user=users.get("md") or users.get("user-md"),
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:04
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredBlob",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("size", models.BigIntegerField(help_text="Size in bytes")),
+                ("content_type", models.CharField(blank=True, max_length=100)),
+                ("storage_path", models.CharField(max_length=500)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["ref_count", "updated_at"],
+                        name="common_stor_ref_cou_72a736_idx",
+                    )
+                ],
+            },
+        ),
+    ]
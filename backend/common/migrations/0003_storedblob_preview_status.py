@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0002_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storedblob",
+            name="preview_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("", "Not requested"),
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                    ("unsupported", "Unsupported"),
+                ],
+                default="",
+                max_length=16,
+            ),
+        ),
+    ]
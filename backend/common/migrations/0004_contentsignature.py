@@ -0,0 +1,70 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:40
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0003_storedblob_preview_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentSignature",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("document_version", "Document version"),
+                            ("correspondence", "Correspondence"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("group_id", models.UUIDField()),
+                (
+                    "minhash",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), size=None
+                    ),
+                ),
+                (
+                    "bands",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), size=None
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["bands"], name="content_signature_bands_gin"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="contentsignature",
+            constraint=models.UniqueConstraint(
+                fields=("source", "object_id"),
+                name="content_signature_source_object_uniq",
+            ),
+        ),
+    ]
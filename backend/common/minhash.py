@@ -0,0 +1,75 @@
+"""MinHash signatures and LSH band keys for near-duplicate text.
+
+Text is normalised to lower-case word tokens and cut into overlapping word
+shingles. A signature keeps the minimum of ``PERMUTATIONS`` universal hashes
+over the shingle set; the share of equal positions between two signatures
+estimates their Jaccard similarity. Signatures are split into ``BANDS`` bands
+whose hashes are indexed, so candidates are found by band equality instead of
+comparing against every stored signature.
+
+The hash parameters are fixed: changing ``SEED``, ``PERMUTATIONS``,
+``BANDS`` or ``SHINGLE_SIZE`` invalidates every stored signature.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import struct
+
+SHINGLE_SIZE = 5
+PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = PERMUTATIONS // BANDS
+MIN_SHINGLES = 8
+# Only the start of very long texts is hashed; duplicates are obvious well before that.
+MAX_TEXT_CHARS = 50_000
+
+SEED = 20240611
+MERSENNE_PRIME = (1 << 61) - 1
+_random = random.Random(SEED)
+_PARAMETERS = [
+    (_random.randrange(1, MERSENNE_PRIME), _random.randrange(0, MERSENNE_PRIME)) for _ in range(PERMUTATIONS)
+]
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text: str) -> set[int]:
+    """64-bit hashes of the word shingles in ``text``."""
+
+    words = WORD_PATTERN.findall((text or "")[:MAX_TEXT_CHARS].lower())
+    if len(words) < SHINGLE_SIZE:
+        return set()
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[index : index + SHINGLE_SIZE]).encode(), digest_size=8).digest(), "big")
+        for index in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(text: str) -> list[int] | None:
+    """MinHash signature of ``text``, or ``None`` when it is too short to compare."""
+
+    hashed = shingles(text)
+    if len(hashed) < MIN_SHINGLES:
+        return None
+    return [min((a * value + b) % MERSENNE_PRIME for value in hashed) for a, b in _PARAMETERS]
+
+
+def band_keys(minhash: list[int]) -> list[int]:
+    """One signed 64-bit key per band; the band number is part of the key."""
+
+    keys = []
+    for band in range(BANDS):
+        rows = minhash[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f">H{ROWS_PER_BAND}Q", band, *rows), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def similarity(first: list[int], second: list[int]) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(1 for left, right in zip(first, second) if left == right) / len(first)
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import uuid
 
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils import timezone
 
@@ -32,7 +35,8 @@ class SoftDeleteQuerySet(models.QuerySet):
 
     def delete(self):
         """Soft delete queryset records."""
-        return super().update(is_deleted=True, updated_at=timezone.now())
+        now = timezone.now()
+        return super().update(is_deleted=True, deleted_at=now, updated_at=now)
 
     def hard_delete(self):
         """Permanently delete records."""
@@ -45,7 +49,7 @@ class SoftDeleteQuerySet(models.QuerySet):
         return self.filter(is_deleted=True)
 
     def restore(self):
-        return self.update(is_deleted=False, updated_at=timezone.now())
+        return self.update(is_deleted=False, deleted_at=None, updated_at=timezone.now())
 
 
 class SoftDeleteManager(models.Manager):
@@ -65,6 +69,8 @@ class SoftDeleteModel(models.Model):
     """Abstract model providing ``is_deleted`` flag instead of hard deletes."""
 
     is_deleted = models.BooleanField(default=False, db_index=True)
+    # When the row was soft-deleted; the retention purge counts its age from here.
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
 
     objects = SoftDeleteManager()
     all_objects = SoftDeleteQuerySet.as_manager()
@@ -74,8 +80,9 @@ class SoftDeleteModel(models.Model):
 
     def delete(self, using=None, keep_parents=False):
         """Mark the instance as deleted."""
-        update_fields = ["is_deleted"]
+        update_fields = ["is_deleted", "deleted_at"]
         self.is_deleted = True
+        self.deleted_at = timezone.now()
         if hasattr(self, "updated_at"):
             self.updated_at = timezone.now()
             update_fields.append("updated_at")
@@ -83,8 +90,9 @@ class SoftDeleteModel(models.Model):
 
     def restore(self, using=None):
         """Restore a soft-deleted instance."""
-        update_fields = ["is_deleted"]
+        update_fields = ["is_deleted", "deleted_at"]
         self.is_deleted = False
+        self.deleted_at = None
         if hasattr(self, "updated_at"):
             self.updated_at = timezone.now()
             update_fields.append("updated_at")
@@ -93,3 +101,95 @@ class SoftDeleteModel(models.Model):
     def hard_delete(self, using=None, keep_parents=False):
         """Permanently delete the instance."""
         super().delete(using=using, keep_parents=keep_parents)
+
+
+class StoredBlob(UUIDModel, TimeStampedModel):
+    """Content-addressed file shared by every record that uploads identical bytes."""
+
+    class PreviewStatus(models.TextChoices):
+        NONE = "", "Not requested"
+        PENDING = "pending", "Pending"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+        UNSUPPORTED = "unsupported", "Unsupported"
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField(help_text="Size in bytes")
+    content_type = models.CharField(max_length=100, blank=True)
+    storage_path = models.CharField(max_length=500)
+    ref_count = models.PositiveIntegerField(default=0)
+    preview_status = models.CharField(max_length=16, choices=PreviewStatus.choices, default=PreviewStatus.NONE, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["ref_count", "updated_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
+
+class ExportJob(UUIDModel, TimeStampedModel):
+    """ZIP export too large to stream in the request, built by a background task."""
+
+    class Kind(models.TextChoices):
+        DOCUMENTS = "documents", "Documents"
+        CORRESPONDENCE = "correspondence", "Correspondence"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    params = models.JSONField(default=dict, blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+    )
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    file_name = models.CharField(max_length=255)
+    storage_path = models.CharField(max_length=500, blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} export {self.file_name} ({self.status})"
+
+
+class ContentSignature(UUIDModel, TimeStampedModel):
+    """MinHash signature of a record's text with its LSH band keys (see ``common.minhash``)."""
+
+    class Source(models.TextChoices):
+        DOCUMENT_VERSION = "document_version", "Document version"
+        CORRESPONDENCE = "correspondence", "Correspondence"
+
+    source = models.CharField(max_length=32, choices=Source.choices)
+    object_id = models.UUIDField()
+    # The record duplicates are reported for: the document of a version, or the correspondence itself.
+    group_id = models.UUIDField()
+    minhash = ArrayField(models.BigIntegerField())
+    bands = ArrayField(models.BigIntegerField())
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source", "object_id"], name="content_signature_source_object_uniq"),
+        ]
+        indexes = [
+            # Candidate lookup: ``bands && ARRAY[...]``.
+            GinIndex(fields=["bands"], name="content_signature_bands_gin"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.source} {self.object_id}"
@@ -0,0 +1,148 @@
+"""Opt-in keyset (cursor) pagination for high-volume list endpoints."""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+KEYSET_QUERY_PARAM = "pagination"
+KEYSET_QUERY_VALUE = "cursor"
+
+
+def use_keyset_pagination(request) -> bool:
+    """Keyset mode is requested with ``?pagination=cursor``."""
+
+    return request is not None and request.query_params.get(KEYSET_QUERY_PARAM) == KEYSET_QUERY_VALUE
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only keyset pagination over ``(ordering field, tie-breaker)``.
+
+    Each page seeks past the last row of the previous one with
+    ``field <= value AND (field < value OR (field = value AND id < pk))``
+    instead of OFFSET, so the index is entered at the cursor, and no
+    ``COUNT(*)`` is issued, so page 500 costs the same as page 1. The cursor is
+    an opaque base64 token of the last row's key.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def parse_position(self, model, field: str, tiebreaker: str, position):
+        """Coerce the decoded cursor to the key's field types, rejecting tampered values."""
+        value, pk = position
+        try:
+            return (
+                model._meta.get_field(field).to_python(value),
+                model._meta.get_field(tiebreaker).to_python(pk),
+            )
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_cursor(value, pk) -> str:
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        payload = json.dumps([value, str(pk)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        field, tiebreaker = (name.lstrip("-") for name in self.ordering)
+        lookup = "lt" if self.ordering[0].startswith("-") else "gt"
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = self.parse_position(queryset.model, field, tiebreaker, position)
+            # The leading ``field <= value`` is the index range; the OR only trims the boundary rows.
+            queryset = queryset.filter(
+                Q(**{f"{field}__{lookup}e": value}),
+                Q(**{f"{field}__{lookup}": value}) | Q(**{field: value, f"{tiebreaker}__{lookup}": pk}),
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_cursor = (
+            self.encode_cursor(getattr(rows[-1], field), getattr(rows[-1], tiebreaker)) if self.has_next else None
+        )
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("first", self.get_first_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "first": {"type": "string", "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """Switch a viewset to ``keyset_pagination_class`` when ``?pagination=cursor`` is passed."""
+
+    keyset_pagination_class: type[KeysetPagination] | None = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.keyset_pagination_class is not None and use_keyset_pagination(getattr(self, "request", None)):
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
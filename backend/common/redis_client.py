@@ -0,0 +1,20 @@
+"""Shared Redis connection for short-lived application state."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """Return a process-wide client for ``REDIS_URL`` (buffers, presence)."""
+
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=1,
+        socket_timeout=2,
+    )
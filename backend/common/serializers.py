@@ -0,0 +1,33 @@
+"""Serializers for shared ECM models."""
+
+from __future__ import annotations
+
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "file_name",
+            "file_size",
+            "error",
+            "download_url",
+            "created_at",
+            "completed_at",
+            "expires_at",
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj) -> str | None:
+        if obj.status != ExportJob.Status.COMPLETED:
+            return None
+        return reverse("api_v1:export-job-download", args=[obj.pk], request=self.context.get("request"))
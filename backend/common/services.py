@@ -0,0 +1,723 @@
+"""Shared services used across ECM apps."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Iterable
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.module_loading import import_string
+from django.db import transaction
+from django.db.models import CharField, Count, Exists, F, Func, OuterRef, Q, QuerySet, Value
+from django.db.models.functions import ExtractYear, Greatest
+from django.utils import timezone
+
+from . import minhash
+from .exports import stream_zip
+from .storage import local_copy, storage_path_from_url
+from .models import ContentSignature, ExportJob, StoredBlob
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStorageService:
+    """Deduplicated, reference-counted storage keyed by SHA-256.
+
+    Identical uploads (the same scanned letter attached to several
+    correspondence items, or re-uploaded as a DMS version) share one file under
+    ``blobs/<aa>/<bb>/<sha256><ext>``. ``ref_count`` is maintained on
+    store/release; garbage collection additionally checks live references so a
+    drifted counter can never delete a file still in use.
+    """
+
+    ROOT = "blobs"
+
+    @classmethod
+    def blob_path(cls, sha256: str, file_name: str = "") -> str:
+        extension = Path(file_name or "").suffix.lower()[:16]
+        return f"{cls.ROOT}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+    @staticmethod
+    def hash_file(file_obj: IO[bytes]) -> tuple[str, int]:
+        """Return ``(sha256, size)`` by streaming ``file_obj`` in chunks."""
+
+        digest = hashlib.sha256()
+        size = 0
+        wrapped = file_obj if isinstance(file_obj, File) else File(file_obj)
+        for chunk in wrapped.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+        return digest.hexdigest(), size
+
+    @classmethod
+    def store_file(
+        cls,
+        file_obj: IO[bytes],
+        *,
+        file_name: str = "",
+        content_type: str = "",
+        sha256: str | None = None,
+        size: int | None = None,
+    ) -> StoredBlob:
+        """Store ``file_obj`` (or reuse the existing copy) and take one reference to it."""
+
+        if sha256 is None or size is None:
+            sha256, size = cls.hash_file(file_obj)
+
+        with transaction.atomic():
+            blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                sha256=sha256,
+                defaults={
+                    "size": size,
+                    "content_type": content_type or "",
+                    "storage_path": cls.blob_path(sha256, file_name),
+                },
+            )
+            if not default_storage.exists(blob.storage_path):
+                if hasattr(file_obj, "seek"):
+                    file_obj.seek(0)
+                saved_path = default_storage.save(
+                    blob.storage_path,
+                    file_obj if isinstance(file_obj, File) else File(file_obj, name=Path(blob.storage_path).name),
+                )
+                if saved_path != blob.storage_path:
+                    blob.storage_path = saved_path
+                    blob.save(update_fields=["storage_path", "updated_at"])
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1, updated_at=timezone.now())
+            blob.refresh_from_db(fields=["ref_count", "updated_at"])
+        if created:
+            BlobPreviewService.request(blob)
+        return blob
+
+    @classmethod
+    def store_bytes(cls, data: bytes, *, file_name: str = "", content_type: str = "") -> StoredBlob:
+        return cls.store_file(
+            ContentFile(data, name=file_name or "blob"),
+            file_name=file_name,
+            content_type=content_type,
+            sha256=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+        )
+
+    @staticmethod
+    def for_media_url(file_url: str | None) -> StoredBlob | None:
+        """The blob a media URL issued by this server points at, if any."""
+
+        storage_path = storage_path_from_url(file_url)
+        if not storage_path:
+            return None
+        return StoredBlob.objects.filter(storage_path=storage_path).first()
+
+    @staticmethod
+    def retain(blob_id) -> None:
+        """Take one more reference to an existing blob."""
+
+        StoredBlob.objects.filter(pk=blob_id).update(ref_count=F("ref_count") + 1, updated_at=timezone.now())
+
+    @staticmethod
+    def release(blob_id) -> None:
+        """Drop one reference; the file itself is removed later by ``collect_garbage``."""
+
+        if not blob_id:
+            return
+        StoredBlob.objects.filter(pk=blob_id).update(
+            ref_count=Greatest(F("ref_count") - 1, 0),
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def _reference_relations():
+        return [
+            relation
+            for relation in StoredBlob._meta.related_objects
+            if relation.one_to_many and relation.field.name == "blob"
+        ]
+
+    @classmethod
+    def unreferenced(cls):
+        """Blobs that no model row points at any more."""
+
+        queryset = StoredBlob.objects.all()
+        for relation in cls._reference_relations():
+            model = relation.related_model
+            manager = getattr(model, "all_objects", model._default_manager)
+            queryset = queryset.filter(~Exists(manager.filter(blob=OuterRef("pk"))))
+        return queryset
+
+    @classmethod
+    def recount(cls) -> int:
+        """Rebuild ``ref_count`` from live references; returns the number of corrected blobs."""
+
+        corrected = 0
+        annotations = {
+            f"refs_{index}": Count(relation.get_accessor_name(), distinct=True)
+            for index, relation in enumerate(cls._reference_relations())
+        }
+        for blob in StoredBlob.objects.annotate(**annotations).iterator():
+            actual = sum(getattr(blob, name) for name in annotations)
+            if actual != blob.ref_count:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+                corrected += 1
+        return corrected
+
+    @classmethod
+    def collect_garbage(cls, *, grace_hours: int = 24, dry_run: bool = False, blob_ids=None) -> list[StoredBlob]:
+        """Delete files and rows for unreferenced blobs idle for longer than ``grace_hours``.
+
+        ``blob_ids`` limits collection to those blobs, e.g. the ones just released by a purge.
+        """
+
+        cutoff = timezone.now() - timedelta(hours=grace_hours)
+        orphans = cls.unreferenced().filter(updated_at__lt=cutoff)
+        if blob_ids is not None:
+            orphans = orphans.filter(pk__in=blob_ids)
+        orphans = list(orphans)
+        if dry_run:
+            return orphans
+
+        removed = []
+        for blob in orphans:
+            with transaction.atomic():
+                locked = cls.unreferenced().select_for_update().filter(pk=blob.pk).first()
+                if locked is None:
+                    continue
+                try:
+                    if default_storage.exists(locked.storage_path):
+                        default_storage.delete(locked.storage_path)
+                except OSError:
+                    logger.warning("Unable to delete blob file %s", locked.storage_path, exc_info=True)
+                    continue
+                BlobPreviewService.delete(locked)
+                locked.delete()
+                removed.append(blob)
+        return removed
+
+
+class BlobPreviewService:
+    """First-page thumbnails for stored PDFs and images, cached by content hash.
+
+    Every size in ``PREVIEW_SIZES`` is rendered once per blob, as WebP and
+    PNG, under ``previews/<aa>/<bb>/<sha256>/<size>.<format>``. Identical
+    uploads share one set of previews, and since the bytes never change for a
+    hash they can be served with long-lived ETags. Rendering runs in the
+    ``common.render_blob_previews`` Celery task.
+    """
+
+    ROOT = "previews"
+    FORMATS = {"webp": ("WEBP", "image/webp"), "png": ("PNG", "image/png")}
+    IMAGE_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp", "image/tiff", "image/bmp"}
+    PDF_TYPE = "application/pdf"
+
+    @staticmethod
+    def sizes() -> dict[str, int]:
+        return getattr(settings, "PREVIEW_SIZES", {"small": 160, "medium": 320, "large": 640})
+
+    @classmethod
+    def is_previewable(cls, content_type: str | None) -> bool:
+        content_type = (content_type or "").split(";")[0].strip().lower()
+        return content_type == cls.PDF_TYPE or content_type in cls.IMAGE_TYPES
+
+    @classmethod
+    def preview_path(cls, sha256: str, size: str, image_format: str) -> str:
+        return f"{cls.ROOT}/{sha256[:2]}/{sha256[2:4]}/{sha256}/{size}.{image_format}"
+
+    @classmethod
+    def request(cls, blob: StoredBlob) -> str:
+        """Queue rendering for ``blob`` unless it was already requested; returns the preview status."""
+
+        if blob.preview_status != StoredBlob.PreviewStatus.NONE:
+            return blob.preview_status
+        if not cls.is_previewable(blob.content_type):
+            status = StoredBlob.PreviewStatus.UNSUPPORTED
+        else:
+            status = StoredBlob.PreviewStatus.PENDING
+        claimed = StoredBlob.objects.filter(pk=blob.pk, preview_status=StoredBlob.PreviewStatus.NONE).update(
+            preview_status=status
+        )
+        blob.preview_status = status
+        if claimed and status == StoredBlob.PreviewStatus.PENDING:
+            from .tasks import queue_preview_render
+
+            queue_preview_render(blob.pk)
+        return status
+
+    @classmethod
+    def render(cls, blob: StoredBlob) -> str:
+        """Render and store every preview size for ``blob``; returns the resulting status."""
+
+        try:
+            page = cls._first_page(blob)
+            outputs = {}
+            for size, pixels in cls.sizes().items():
+                thumbnail = page.copy()
+                thumbnail.thumbnail((pixels, pixels))
+                for image_format, (pil_format, _) in cls.FORMATS.items():
+                    buffer = io.BytesIO()
+                    thumbnail.save(buffer, pil_format)
+                    outputs[cls.preview_path(blob.sha256, size, image_format)] = buffer.getvalue()
+        except Exception:  # noqa: BLE001 - a broken file must not retry forever
+            logger.warning("Unable to render previews for blob %s", blob.sha256, exc_info=True)
+            status = StoredBlob.PreviewStatus.FAILED
+        else:
+            for path, data in outputs.items():
+                if default_storage.exists(path):
+                    default_storage.delete(path)
+                default_storage.save(path, ContentFile(data))
+            status = StoredBlob.PreviewStatus.READY
+
+        StoredBlob.objects.filter(pk=blob.pk).update(preview_status=status)
+        blob.preview_status = status
+        return status
+
+    @classmethod
+    def delete(cls, blob: StoredBlob) -> None:
+        for size in cls.sizes():
+            for image_format in cls.FORMATS:
+                path = cls.preview_path(blob.sha256, size, image_format)
+                try:
+                    if default_storage.exists(path):
+                        default_storage.delete(path)
+                except OSError:
+                    logger.warning("Unable to delete preview %s", path, exc_info=True)
+
+    @classmethod
+    def _first_page(cls, blob: StoredBlob):
+        from PIL import Image, ImageOps
+
+        largest = max(cls.sizes().values())
+        with local_copy(blob.storage_path) as path:
+            if blob.content_type == cls.PDF_TYPE:
+                from pdf2image import convert_from_path
+
+                # Rasterise only page one, straight at the largest thumbnail width.
+                pages = convert_from_path(
+                    path,
+                    first_page=1,
+                    last_page=1,
+                    size=(largest, None),
+                    timeout=getattr(settings, "PREVIEW_RENDER_TIMEOUT_SECONDS", 60),
+                )
+                image = pages[0]
+            else:
+                with Image.open(path) as source:
+                    # ``draft`` lets JPEG decode at a reduced scale instead of full resolution.
+                    source.draft("RGB", (largest, largest))
+                    image = ImageOps.exif_transpose(source)
+                    image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        return image
+
+
+class DuplicateDetectionService:
+    """Near-duplicate lookup over MinHash signatures stored in an LSH band index.
+
+    Each app indexes its records' text under a ``ContentSignature.Source``;
+    ``find`` fetches only the records sharing at least one band key (one GIN
+    index probe) and keeps those whose estimated similarity reaches
+    ``DUPLICATE_SIMILARITY_THRESHOLD``. ``INDEXERS`` name the per-app services
+    that can rebuild the index from existing rows.
+    """
+
+    INDEXERS = {
+        ContentSignature.Source.DOCUMENT_VERSION: "dms.services.DocumentDuplicateService",
+        ContentSignature.Source.CORRESPONDENCE: "correspondence.services.CorrespondenceDuplicateService",
+    }
+    # Upper bound on band matches scored per lookup.
+    CANDIDATE_LIMIT = 200
+
+    @staticmethod
+    def threshold() -> float:
+        return getattr(settings, "DUPLICATE_SIMILARITY_THRESHOLD", 0.8)
+
+    @staticmethod
+    def index(source: str, object_id, group_id, text: str) -> ContentSignature | None:
+        """Store (or drop, for texts too short to compare) the signature of ``text``."""
+
+        signature = minhash.signature(text)
+        if signature is None:
+            ContentSignature.objects.filter(source=source, object_id=object_id).delete()
+            return None
+        record, _ = ContentSignature.objects.update_or_create(
+            source=source,
+            object_id=object_id,
+            defaults={"group_id": group_id, "minhash": signature, "bands": minhash.band_keys(signature)},
+        )
+        return record
+
+    @staticmethod
+    def remove(source: str, object_id) -> None:
+        ContentSignature.objects.filter(source=source, object_id=object_id).delete()
+
+    @staticmethod
+    def remove_groups(source: str, group_ids) -> None:
+        ContentSignature.objects.filter(source=source, group_id__in=group_ids).delete()
+
+    @staticmethod
+    def signature_for(source: str, object_id) -> list[int] | None:
+        return (
+            ContentSignature.objects.filter(source=source, object_id=object_id)
+            .values_list("minhash", flat=True)
+            .first()
+        )
+
+    @classmethod
+    def find(cls, signature: list[int] | None, *, source: str, exclude_group=None, limit: int = 10) -> list[dict]:
+        """Best match per group, most similar first: ``{"group_id", "object_id", "similarity"}``."""
+
+        if not signature:
+            return []
+        candidates = ContentSignature.objects.filter(source=source, bands__overlap=minhash.band_keys(signature))
+        if exclude_group is not None:
+            candidates = candidates.exclude(group_id=exclude_group)
+
+        threshold = cls.threshold()
+        best: dict = {}
+        for object_id, group_id, other in candidates.values_list("object_id", "group_id", "minhash")[
+            : cls.CANDIDATE_LIMIT
+        ]:
+            score = minhash.similarity(signature, other)
+            if score >= threshold and score > best.get(group_id, {}).get("similarity", 0):
+                best[group_id] = {"group_id": group_id, "object_id": object_id, "similarity": round(score, 3)}
+        return sorted(best.values(), key=lambda match: match["similarity"], reverse=True)[:limit]
+
+    @classmethod
+    def rebuild(cls, source: str, *, batch_size: int = 500) -> int:
+        return import_string(cls.INDEXERS[source]).rebuild(batch_size=batch_size)
+
+
+class TagFacetService:
+    """Tag -> count facets over a JSON tag list column."""
+
+    @staticmethod
+    def counts(queryset: QuerySet, *, field: str = "tags", limit: int = 50) -> list[dict]:
+        """Count rows per tag in ``queryset`` with one ``GROUP BY`` over ``jsonb_array_elements_text``."""
+
+        tag = Func(F(field), function="jsonb_array_elements_text", output_field=CharField())
+        rows = (
+            queryset.order_by()
+            # Only arrays can be expanded; this also skips empty lists.
+            .filter(**{f"{field}__contains": []})
+            .annotate(tag=tag)
+            .values("tag")
+            .annotate(count=Count("pk"))
+            .order_by("-count", "tag")[:limit]
+        )
+        return [{"tag": row["tag"], "count": row["count"]} for row in rows]
+
+
+class RecordSummaryService:
+    """Summary counters for records listings, computed in a single aggregate query.
+
+    Endpoints describe their buckets as ``name -> Q`` (``None`` counts every
+    row); each becomes a ``COUNT(*) FILTER (WHERE ...)`` over the filtered
+    queryset, and the distinct years of ``years_field`` are collected in the
+    same pass, so a summary never costs more than one round trip.
+    """
+
+    @staticmethod
+    def summarize(queryset: QuerySet, buckets: dict[str, Q | None], *, years_field: str | None = None) -> dict:
+        aggregates = {
+            name: Count("pk", filter=condition) if condition is not None else Count("pk")
+            for name, condition in buckets.items()
+        }
+        if years_field:
+            aggregates["available_years"] = ArrayAgg(
+                ExtractYear(years_field),
+                distinct=True,
+                filter=Q(**{f"{years_field}__isnull": False}),
+                default=Value([]),
+            )
+        summary = queryset.order_by().aggregate(**aggregates)
+        if years_field:
+            summary["available_years"] = sorted(summary["available_years"], reverse=True)
+        return summary
+
+
+class ExportJobService:
+    """Builds ZIP exports in the background when they are too large to stream.
+
+    Each export kind names a builder with an ``archive(params)`` classmethod
+    returning ``(file_name, entries, manifest)``; the same builder serves the
+    streamed response, so both paths produce identical archives.
+    """
+
+    BUILDERS = {
+        ExportJob.Kind.DOCUMENTS: "dms.services.DocumentExportService",
+        ExportJob.Kind.CORRESPONDENCE: "correspondence.services.CorrespondenceExportService",
+    }
+    ROOT = "exports"
+
+    @classmethod
+    def builder(cls, kind: str):
+        return import_string(cls.BUILDERS[kind])
+
+    @classmethod
+    def run(cls, job: ExportJob) -> ExportJob:
+        """Write the archive for ``job`` to storage and notify the requester."""
+
+        ExportJob.objects.filter(pk=job.pk).update(status=ExportJob.Status.RUNNING, updated_at=timezone.now())
+        try:
+            file_name, entries, manifest = cls.builder(job.kind).archive(job.params)
+            with tempfile.TemporaryFile(prefix="ecm-export-") as spool:
+                for chunk in stream_zip(entries, manifest):
+                    spool.write(chunk)
+                size = spool.tell()
+                spool.seek(0)
+                storage_path = default_storage.save(f"{cls.ROOT}/{job.id}/{file_name}", File(spool, name=file_name))
+        except Exception as exc:  # noqa: BLE001 - the failure is recorded on the job
+            logger.exception("Export job %s failed", job.id)
+            job.status = ExportJob.Status.FAILED
+            job.error = str(exc)[:2000]
+            job.save(update_fields=["status", "error", "updated_at"])
+            return job
+
+        now = timezone.now()
+        job.status = ExportJob.Status.COMPLETED
+        job.storage_path = storage_path
+        job.file_size = size
+        job.completed_at = now
+        job.expires_at = now + timedelta(hours=settings.EXPORT_RETENTION_HOURS)
+        job.save(update_fields=["status", "storage_path", "file_size", "completed_at", "expires_at", "updated_at"])
+        cls.notify(job)
+        return job
+
+    @staticmethod
+    def notify(job: ExportJob) -> None:
+        from notifications.models import Notification
+        from notifications.services import NotificationService
+
+        NotificationService.create_notification(
+            recipient=job.requested_by,
+            title="Export ready",
+            message=f"{job.file_name} is ready to download for the next {settings.EXPORT_RETENTION_HOURS} hours.",
+            notification_type=Notification.NotificationType.SYSTEM,
+            module="dms" if job.kind == ExportJob.Kind.DOCUMENTS else "correspondence",
+            related_object_type="export_job",
+            related_object_id=str(job.id),
+            action_url=f"/api/v1/common/exports/{job.id}/download/",
+        )
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Delete archives (and their jobs) past ``expires_at``."""
+
+        purged = 0
+        for job in ExportJob.objects.filter(expires_at__lt=timezone.now()):
+            try:
+                if job.storage_path and default_storage.exists(job.storage_path):
+                    default_storage.delete(job.storage_path)
+            except OSError:
+                logger.warning("Unable to delete export %s", job.storage_path, exc_info=True)
+                continue
+            job.delete()
+            purged += 1
+        return purged
+
+
+@dataclass
+class RetainedFile:
+    """A stored file held by a row due for purging: a blob reference or a legacy media path."""
+
+    storage_path: str
+    size: int
+    blob_id: uuid.UUID | None = None
+
+
+@dataclass
+class RetentionReport:
+    label: str
+    cutoff: datetime
+    dry_run: bool = False
+    records: int = 0
+    batches: int = 0
+    files: int = 0
+    bytes: int = 0
+    archives: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+class RetentionService:
+    """Final removal of soft-deleted rows once they have sat in the bin for ``RETENTION_DAYS``.
+
+    Each entry in ``PURGERS`` names an app service exposing ``LABEL``,
+    ``model`` (a ``SoftDeleteModel``), ``files(ids)``, ``archive(ids)``,
+    ``purge(ids)`` and ``paths_in_use(storage_paths)``. Rows are removed in
+    batches of ``RETENTION_BATCH_SIZE``, each in its own transaction, so the
+    purge never holds long locks; at most ``RETENTION_MAX_BATCHES`` run per
+    label. With ``RETENTION_ARCHIVE`` every batch is first written to a ZIP
+    under ``retention/`` (records in the manifest, files alongside), outside
+    the transaction; a batch whose rows changed meanwhile is re-archived.
+    Released blobs and legacy media files are removed once the batch has
+    committed.
+    """
+
+    PURGERS = {
+        "documents": "dms.services.DocumentRetentionService",
+        "correspondence": "correspondence.services.CorrespondenceRetentionService",
+    }
+    ROOT = "retention"
+
+    @classmethod
+    def purgers(cls, labels: Iterable[str] | None = None) -> list:
+        return [import_string(path) for label, path in cls.PURGERS.items() if not labels or label in labels]
+
+    @staticmethod
+    def expired(purger, cutoff) -> QuerySet:
+        return purger.model.all_objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+
+    @classmethod
+    def run(
+        cls,
+        *,
+        labels: Iterable[str] | None = None,
+        days: int | None = None,
+        archive: bool | None = None,
+        dry_run: bool = False,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+    ) -> list[RetentionReport]:
+        days = settings.RETENTION_DAYS if days is None else days
+        archive = settings.RETENTION_ARCHIVE if archive is None else archive
+        batch_size = max(batch_size or settings.RETENTION_BATCH_SIZE, 1)
+        max_batches = settings.RETENTION_MAX_BATCHES if max_batches is None else max_batches
+        cutoff = timezone.now() - timedelta(days=days)
+
+        reports = []
+        for purger in cls.purgers(labels):
+            report = RetentionReport(label=purger.LABEL, cutoff=cutoff, dry_run=dry_run)
+            if dry_run:
+                cls._survey(purger, report, batch_size)
+            else:
+                cls._purge(purger, report, archive=archive, batch_size=batch_size, max_batches=max_batches)
+            reports.append(report)
+        return reports
+
+    @classmethod
+    def _survey(cls, purger, report: RetentionReport, batch_size: int) -> None:
+        # Walk the expired rows by primary key so the report never loads them all at once.
+        expired = cls.expired(purger, report.cutoff).order_by("pk").values_list("pk", flat=True)
+        seen: set = set()
+        last = None
+        while True:
+            page = expired if last is None else expired.filter(pk__gt=last)
+            ids = list(page[:batch_size])
+            if not ids:
+                return
+            report.records += len(ids)
+            report.batches += 1
+            cls._count_files(purger.files(ids), report, seen)
+            last = ids[-1]
+
+    @classmethod
+    def _purge(cls, purger, report: RetentionReport, *, archive: bool, batch_size: int, max_batches: int) -> None:
+        expired = cls.expired(purger, report.cutoff)
+        seen: set = set()
+        while report.batches < max_batches:
+            ids = list(expired.order_by("deleted_at", "pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return
+            archive_path = None
+            try:
+                if archive:
+                    archive_path = cls._write_archive(purger, ids)
+                with transaction.atomic():
+                    # Re-check under lock: a row restored since the select means the
+                    # archive no longer matches the batch, so nothing is deleted.
+                    locked = list(expired.filter(pk__in=ids).select_for_update().values_list("pk", flat=True))
+                    if len(locked) == len(ids):
+                        files = purger.files(ids)
+                        for retained in files:
+                            if retained.blob_id:
+                                BlobStorageService.release(retained.blob_id)
+                        purger.purge(ids)
+            except Exception as exc:  # noqa: BLE001 - reported; the next run retries the batch
+                logger.exception("Retention purge of %s failed", purger.LABEL)
+                report.error = str(exc)[:2000]
+                cls._discard_archive(archive_path)
+                return
+            if len(locked) != len(ids):
+                cls._discard_archive(archive_path)
+                continue
+
+            if archive_path:
+                report.archives.append(archive_path)
+            report.records += len(ids)
+            report.batches += 1
+            cls._count_files(files, report, seen)
+            cls._remove_files(files)
+
+    @staticmethod
+    def _count_files(files: list[RetainedFile], report: RetentionReport, seen: set) -> None:
+        for retained in files:
+            if retained.storage_path in seen:
+                continue
+            seen.add(retained.storage_path)
+            report.files += 1
+            report.bytes += retained.size or 0
+
+    @classmethod
+    def _remove_files(cls, files: list[RetainedFile]) -> None:
+        blob_ids = {retained.blob_id for retained in files if retained.blob_id}
+        if blob_ids:
+            BlobStorageService.collect_garbage(grace_hours=0, blob_ids=blob_ids)
+
+        legacy_paths = {retained.storage_path for retained in files if not retained.blob_id}
+        if not legacy_paths:
+            return
+        in_use = set(StoredBlob.objects.filter(storage_path__in=legacy_paths).values_list("storage_path", flat=True))
+        for purger in cls.purgers():
+            in_use |= purger.paths_in_use(legacy_paths - in_use)
+        for storage_path in legacy_paths - in_use:
+            try:
+                if default_storage.exists(storage_path):
+                    default_storage.delete(storage_path)
+            except OSError:
+                logger.warning("Unable to delete retained file %s", storage_path, exc_info=True)
+
+    @staticmethod
+    def referenced_paths(queryset: QuerySet, storage_paths: Iterable[str]) -> set[str]:
+        """Which of ``storage_paths`` a ``file_url`` in ``queryset`` still points at, in one query."""
+
+        storage_paths = set(storage_paths)
+        if not storage_paths:
+            return set()
+        matches = Q()
+        for storage_path in storage_paths:
+            matches |= Q(file_url__endswith=storage_path)
+        urls = set(queryset.filter(matches).values_list("file_url", flat=True))
+        return {storage_path for storage_path in storage_paths if any(url.endswith(storage_path) for url in urls)}
+
+    @staticmethod
+    def _discard_archive(archive_path: str | None) -> None:
+        if not archive_path:
+            return
+        try:
+            default_storage.delete(archive_path)
+        except OSError:
+            logger.warning("Unable to delete retention archive %s", archive_path, exc_info=True)
+
+    @classmethod
+    def _write_archive(cls, purger, ids: list) -> str:
+        entries, records = purger.archive(ids)
+        now = timezone.now()
+        file_name = f"{purger.LABEL}-{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.zip"
+        manifest = {"kind": "retention", "label": purger.LABEL, "records": records}
+        with tempfile.TemporaryFile(prefix="ecm-retention-") as spool:
+            for chunk in stream_zip(entries, manifest):
+                spool.write(chunk)
+            spool.seek(0)
+            return default_storage.save(f"{cls.ROOT}/{purger.LABEL}/{now:%Y/%m}/{file_name}", File(spool, name=file_name))
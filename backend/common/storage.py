@@ -0,0 +1,55 @@
+"""Helpers for locating uploaded files in ``default_storage``."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+
+def storage_path_from_url(file_url: str | None) -> str | None:
+    """Translate a stored ``file_url`` (absolute or relative media URL) into a storage path."""
+
+    if not file_url or file_url.startswith("data:"):
+        return None
+    path = unquote(urlparse(file_url).path or "")
+    media_url = urlparse(settings.MEDIA_URL or "/media/").path or "/media/"
+    if not media_url.endswith("/"):
+        media_url = f"{media_url}/"
+    if path.startswith(media_url):
+        path = path[len(media_url):]
+    elif not urlparse(file_url).scheme:
+        path = path.lstrip("/")
+    else:
+        return None
+    return path or None
+
+
+@contextmanager
+def local_copy(storage_path: str) -> Iterator[str]:
+    """Yield a filesystem path for ``storage_path``, copying remote storage to a temp file if needed."""
+
+    try:
+        local_path = default_storage.path(storage_path)
+    except NotImplementedError:
+        local_path = None
+    if local_path:
+        yield local_path
+        return
+
+    suffix = Path(storage_path).suffix
+    with tempfile.NamedTemporaryFile(prefix="ecm-storage-", suffix=suffix, delete=False) as tmp:
+        with default_storage.open(storage_path, "rb") as source:
+            shutil.copyfileobj(source, tmp)
+        temp_path = tmp.name
+    try:
+        yield temp_path
+    finally:
+        os.unlink(temp_path)
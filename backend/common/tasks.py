@@ -0,0 +1,84 @@
+"""Celery tasks shared across ECM apps."""
+
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+
+from .models import ExportJob, StoredBlob
+from .services import BlobPreviewService, ExportJobService, RetentionService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="common.build_export", ignore_result=True)
+def build_export(job_id: str) -> None:
+    """Build the archive for a queued export job."""
+
+    job = ExportJob.objects.select_related("requested_by").filter(pk=job_id, status=ExportJob.Status.PENDING).first()
+    if job is None:
+        logger.info("Skipping missing or already started export job %s", job_id)
+        return
+    ExportJobService.run(job)
+
+
+@shared_task(name="common.purge_expired_exports", ignore_result=True)
+def purge_expired_exports() -> int:
+    """Delete export archives past their retention window."""
+
+    return ExportJobService.purge_expired()
+
+
+@shared_task(name="common.purge_soft_deleted", ignore_result=True)
+def purge_soft_deleted() -> int:
+    """Hard-delete (or archive) soft-deleted rows past the retention window."""
+
+    purged = 0
+    for report in RetentionService.run():
+        logger.info(
+            "Retention purge of %s: %s record(s) in %s batch(es), %s file(s), %s bytes",
+            report.label,
+            report.records,
+            report.batches,
+            report.files,
+            report.bytes,
+        )
+        purged += report.records
+    return purged
+
+
+@shared_task(name="common.render_blob_previews", ignore_result=True)
+def render_blob_previews(blob_id: str) -> None:
+    """Render the thumbnail set for a stored PDF or image."""
+
+    blob = StoredBlob.objects.filter(pk=blob_id).first()
+    if blob is None:
+        logger.info("Skipping previews for missing blob %s", blob_id)
+        return
+    BlobPreviewService.render(blob)
+
+
+def queue_export_job(job_id) -> None:
+    """Schedule an export build once the job row is committed."""
+
+    def _enqueue():
+        try:
+            build_export.delay(str(job_id))
+        except Exception:  # noqa: BLE001 - the job stays pending and can be re-queued
+            logger.warning("Unable to queue export job %s", job_id, exc_info=True)
+
+    transaction.on_commit(_enqueue)
+
+
+def queue_preview_render(blob_id) -> None:
+    """Schedule preview rendering once the blob row is committed."""
+
+    def _enqueue():
+        try:
+            render_blob_previews.delay(str(blob_id))
+        except Exception:  # noqa: BLE001 - uploads must not fail because the broker is down
+            logger.warning("Unable to queue preview rendering for blob %s", blob_id, exc_info=True)
+
+    transaction.on_commit(_enqueue)
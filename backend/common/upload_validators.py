@@ -63,7 +63,12 @@ def _normalize_mime(mime_type: str | None, file_name: str) -> str | None:
     return mime
 
 
-def _scan_with_clamav(file_bytes: bytes, file_name: str, field_name: str) -> None:
+def _scan_with_clamav(
+    file_bytes: bytes | None,
+    file_name: str,
+    field_name: str,
+    file_path: str | None = None,
+) -> None:
     if not getattr(settings, 'CLAMAV_SCAN_ENABLED', False):
         return
 
@@ -72,34 +77,41 @@ def _scan_with_clamav(file_bytes: bytes, file_name: str, field_name: str) -> Non
         logger.warning('ClamAV scanning enabled but `clamscan` binary not found.')
         return
 
+    if file_path:
+        _run_clamscan(clamscan_path, file_path, field_name)
+        return
+
     with tempfile.NamedTemporaryFile(prefix='ecm-upload-', suffix=Path(file_name).suffix) as tmp:
-        tmp.write(file_bytes)
+        tmp.write(file_bytes or b'')
         tmp.flush()
-        result = subprocess.run(  # noqa: S603,S607
-            [clamscan_path, '--no-summary', tmp.name],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 1:
-            raise ValidationError({field_name: 'Upload rejected: malware detected.'})
-        if result.returncode not in (0, 1):
-            logger.error('ClamAV scan failed: %s', result.stderr.strip())
-            raise ValidationError({field_name: 'Unable to verify uploaded file.'})
+        _run_clamscan(clamscan_path, tmp.name, field_name)
 
 
-def validate_file_upload(
+def _run_clamscan(clamscan_path: str, target: str, field_name: str) -> None:
+    result = subprocess.run(  # noqa: S603,S607
+        [clamscan_path, '--no-summary', target],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode == 1:
+        raise ValidationError({field_name: 'Upload rejected: malware detected.'})
+    if result.returncode not in (0, 1):
+        logger.error('ClamAV scan failed: %s', result.stderr.strip())
+        raise ValidationError({field_name: 'Unable to verify uploaded file.'})
+
+
+def validate_upload_metadata(
     *,
     file_name: str,
     mime_type: str | None,
-    file_bytes: bytes,
+    file_size: int,
     field_name: str = 'file',
 ) -> None:
-    """Validate extension, mime-type, size and run AV scan on uploaded bytes."""
+    """Validate name, extension, mime-type and size before any bytes are stored."""
 
     if not file_name:
         raise ValidationError({field_name: 'File name is required.'})
 
-    file_size = len(file_bytes)
     if file_size == 0:
         raise ValidationError({field_name: 'Uploaded file is empty.'})
 
@@ -114,4 +126,30 @@ def validate_file_upload(
     if normalized_mime and normalized_mime not in ALLOWED_MIME_TYPES:
         raise ValidationError({field_name: f'Unsupported file type: {normalized_mime}.'})
 
-    _scan_with_clamav(file_bytes, file_name, field_name)
+
+def validate_file_upload(
+    *,
+    file_name: str,
+    mime_type: str | None,
+    file_bytes: bytes | None = None,
+    file_path: str | None = None,
+    file_size: int | None = None,
+    field_name: str = 'file',
+) -> None:
+    """Validate extension, mime-type, size and run AV scan on an upload.
+
+    Pass ``file_bytes`` for small in-memory uploads, or ``file_path`` plus
+    ``file_size`` for files already spooled to disk so they are never read into memory.
+    """
+
+    if file_size is None:
+        file_size = len(file_bytes or b'')
+
+    validate_upload_metadata(
+        file_name=file_name,
+        mime_type=mime_type,
+        file_size=file_size,
+        field_name=field_name,
+    )
+
+    _scan_with_clamav(file_bytes, file_name, field_name, file_path=file_path)
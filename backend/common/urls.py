@@ -0,0 +1,12 @@
+"""URL routes for shared ECM endpoints."""
+
+from rest_framework.routers import DefaultRouter
+
+from .views import ExportJobViewSet
+
+
+router = DefaultRouter()
+router.register(r"exports", ExportJobViewSet, basename="export-job")
+
+
+urlpatterns = router.urls
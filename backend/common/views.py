@@ -1,9 +1,22 @@
 """Common views and utilities."""
 
+from django.conf import settings
 from django.db import connection
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
 from django.views.decorators.http import require_http_methods
 from django.core.cache import cache
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from .downloads import protected_file_response
+from .exports import estimated_size, stream_zip
+from .models import ExportJob, StoredBlob
+from .serializers import ExportJobSerializer
+from .services import BlobPreviewService, ExportJobService
 
 
 @require_http_methods(["GET"])
@@ -46,3 +59,87 @@ def health_check(request):
         status["status"] = "unhealthy"
 
     return JsonResponse(status, status=http_status)
+
+
+def export_response(request, kind: str, params: dict):
+    """Stream a ZIP export, or queue it as an :class:`ExportJob` when it is too large.
+
+    Returns a ``StreamingHttpResponse`` for archives up to
+    ``EXPORT_STREAM_MAX_BYTES`` (estimated from stored file sizes) and a DRF
+    ``202 Accepted`` response describing the queued job otherwise.
+    """
+
+    from .tasks import queue_export_job
+
+    file_name, entries, manifest = ExportJobService.builder(kind).archive(params)
+    if estimated_size(entries) <= settings.EXPORT_STREAM_MAX_BYTES:
+        response = StreamingHttpResponse(stream_zip(entries, manifest), content_type="application/zip")
+        response["Content-Disposition"] = content_disposition_header(True, file_name)
+        response["Cache-Control"] = "private, no-store"
+        return response
+
+    job = ExportJob.objects.create(kind=kind, params=params, requested_by=request.user, file_name=file_name)
+    queue_export_job(job.id)
+    return Response(ExportJobSerializer(job, context={"request": request}).data, status=status.HTTP_202_ACCEPTED)
+
+
+def preview_response(request, blob: StoredBlob | None):
+    """Serve a cached thumbnail of ``blob`` for an already-authorized request.
+
+    ``?size=`` picks one of ``PREVIEW_SIZES`` (default ``medium``) and
+    ``?image_format=`` is ``webp`` (default) or ``png``. Previews are immutable per
+    content hash, so browsers may cache them for a year. While the preview is
+    still rendering the response is ``202 Accepted`` with ``Retry-After``.
+    """
+
+    size = request.query_params.get("size", "medium")
+    image_format = request.query_params.get("image_format", "webp")
+    if size not in BlobPreviewService.sizes():
+        raise ValidationError({"size": f"Choose one of: {', '.join(BlobPreviewService.sizes())}."})
+    if image_format not in BlobPreviewService.FORMATS:
+        raise ValidationError({"image_format": f"Choose one of: {', '.join(BlobPreviewService.FORMATS)}."})
+    if blob is None:
+        raise NotFound("No preview is available for this file.")
+
+    preview_status = BlobPreviewService.request(blob)
+    if preview_status == StoredBlob.PreviewStatus.PENDING:
+        response = Response({"status": preview_status}, status=status.HTTP_202_ACCEPTED)
+        response["Retry-After"] = "5"
+        return response
+    if preview_status != StoredBlob.PreviewStatus.READY:
+        raise NotFound("No preview is available for this file.")
+
+    return protected_file_response(
+        request,
+        BlobPreviewService.preview_path(blob.sha256, size, image_format),
+        file_name=f"{size}.{image_format}",
+        content_type=BlobPreviewService.FORMATS[image_format][1],
+        etag=f"{blob.sha256}-{size}.{image_format}",
+        inline=True,
+        cache_control="private, max-age=31536000, immutable",
+    )
+
+
+class ExportJobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Background exports requested by the current user."""
+
+    serializer_class = ExportJobSerializer
+    filterset_fields = ["kind", "status"]
+    search_fields = ["file_name"]
+    ordering_fields = ["created_at", "completed_at"]
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(requested_by=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ExportJob.Status.COMPLETED or (job.expires_at and job.expires_at <= timezone.now()):
+            raise NotFound("Export is not available.")
+        return protected_file_response(
+            request,
+            job.storage_path,
+            file_name=job.file_name,
+            content_type="application/zip",
+            etag=f"{job.id}-{job.file_size}",
+        )
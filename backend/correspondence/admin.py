@@ -8,7 +8,9 @@ from .models import (
     CorrespondenceDistribution,
     CorrespondenceDocumentLink,
     Delegation,
+    InboxCounter,
     Minute,
+    ReferenceCounter,
 )
 
 
@@ -73,3 +75,17 @@ class MinuteAdmin(admin.ModelAdmin):
 class DelegationAdmin(admin.ModelAdmin):
     list_display = ("principal", "assistant", "can_approve", "can_minute", "can_forward", "active")
     list_filter = ("active",)
+
+
+@admin.register(ReferenceCounter)
+class ReferenceCounterAdmin(admin.ModelAdmin):
+    list_display = ("series", "year", "scope", "last_value", "updated_at")
+    list_filter = ("series", "year")
+    search_fields = ("scope",)
+
+
+@admin.register(InboxCounter)
+class InboxCounterAdmin(admin.ModelAdmin):
+    list_display = ("scope", "scope_id", "total", "open", "urgent", "overdue", "updated_at")
+    list_filter = ("scope",)
+    search_fields = ("scope_id",)
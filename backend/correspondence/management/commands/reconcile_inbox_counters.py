@@ -0,0 +1,15 @@
+"""Rebuild the per-office and per-approver inbox counters."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from correspondence.services import InboxCounterService
+
+
+class Command(BaseCommand):
+    help = "Recompute InboxCounter rows from the correspondence table."
+
+    def handle(self, *args, **options):
+        corrected = InboxCounterService.reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} inbox counter(s)"))
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0001_storedblob"),
+        ("correspondence", "0008_correspondence_completion_package_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="correspondenceattachment",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="correspondence_attachments",
+                to="common.storedblob",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("correspondence", "0009_correspondenceattachment_blob"),
+        ("dms", "0009_keyset_pagination_index"),
+        ("organization", "0004_office_officemembership"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="correspondence",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="corr_created_id_idx"
+            ),
+        ),
+    ]
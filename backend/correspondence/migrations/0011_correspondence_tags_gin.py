@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:24
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("correspondence", "0010_keyset_pagination_index"),
+        ("dms", "0011_document_tags_gin"),
+        ("organization", "0004_office_officemembership"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="correspondence",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags"], name="corr_tags_gin", opclasses=["jsonb_path_ops"]
+            ),
+        ),
+    ]
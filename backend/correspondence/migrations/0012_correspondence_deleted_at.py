@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:42
+
+from django.db import migrations, models
+
+# Rows deleted before the column existed were last touched when they were deleted.
+BACKFILL_DELETED_AT = """
+UPDATE correspondence_correspondence SET deleted_at = updated_at WHERE is_deleted AND deleted_at IS NULL
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("correspondence", "0011_correspondence_tags_gin"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="correspondence",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_DELETED_AT, reverse_sql=migrations.RunSQL.noop),
+    ]
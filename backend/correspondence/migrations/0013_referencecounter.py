@@ -0,0 +1,46 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("correspondence", "0012_correspondence_deleted_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReferenceCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "scope",
+                    models.CharField(
+                        blank=True,
+                        help_text="Registry office id; blank when there is none",
+                        max_length=64,
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("series", models.CharField(max_length=16)),
+                ("last_value", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="referencecounter",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "year", "series"), name="corr_reference_counter_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+# Seeds the counters from live rows with the grouping InboxCounterService.reconcile uses:
+# an item counts once per distinct owning/current office and once for its current approver.
+BACKFILL_INBOX_COUNTERS = """
+WITH item AS (
+    SELECT
+        id,
+        owning_office_id,
+        current_office_id,
+        current_approver_id,
+        CASE WHEN status NOT IN ('completed', 'archived') THEN 1 ELSE 0 END AS is_open,
+        CASE WHEN priority = 'urgent' THEN 1 ELSE 0 END AS is_urgent,
+        CASE WHEN status <> 'completed' AND received_date < CURRENT_DATE - CASE priority
+            WHEN 'urgent' THEN 2 WHEN 'high' THEN 5 WHEN 'medium' THEN 10 WHEN 'low' THEN 14
+        END THEN 1 ELSE 0 END AS is_overdue
+    FROM correspondence_correspondence
+    WHERE NOT is_deleted
+),
+scoped AS (
+    SELECT id, 'office' AS scope, owning_office_id::text AS scope_id FROM item WHERE owning_office_id IS NOT NULL
+    UNION
+    SELECT id, 'office', current_office_id::text FROM item WHERE current_office_id IS NOT NULL
+    UNION
+    SELECT id, 'approver', current_approver_id::text FROM item WHERE current_approver_id IS NOT NULL
+)
+INSERT INTO correspondence_inboxcounter (scope, scope_id, total, open, urgent, overdue, created_at, updated_at)
+SELECT scoped.scope, scoped.scope_id, COUNT(*), SUM(item.is_open), SUM(item.is_urgent), SUM(item.is_overdue), now(), now()
+FROM scoped JOIN item ON item.id = scoped.id
+GROUP BY scoped.scope, scoped.scope_id
+ON CONFLICT (scope, scope_id) DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("correspondence", "0013_referencecounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InboxCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[("office", "Office"), ("approver", "Approver")],
+                        max_length=16,
+                    ),
+                ),
+                ("scope_id", models.CharField(max_length=64)),
+                ("total", models.IntegerField(default=0)),
+                ("open", models.IntegerField(default=0)),
+                ("urgent", models.IntegerField(default=0)),
+                ("overdue", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="inboxcounter",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "scope_id"), name="corr_inbox_counter_uniq"
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_INBOX_COUNTERS, reverse_sql=migrations.RunSQL.noop),
+    ]
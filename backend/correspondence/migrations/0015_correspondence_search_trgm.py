@@ -0,0 +1,82 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:56
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import DatabaseError, migrations, transaction
+
+
+TRIGRAM_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["reference_number"],
+        name="corr_reference_trgm",
+        opclasses=["gin_trgm_ops"],
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["subject"], name="corr_subject_trgm", opclasses=["gin_trgm_ops"]
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["sender_name"],
+        name="corr_sender_name_trgm",
+        opclasses=["gin_trgm_ops"],
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["sender_organization"],
+        name="corr_sender_org_trgm",
+        opclasses=["gin_trgm_ops"],
+    ),
+]
+
+
+def install_pg_trgm(connection) -> bool:
+    """Enable pg_trgm if the server ships it and the role may; report whether it is installed."""
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT installed_version FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        row = cursor.fetchone()
+    if row is None:
+        return False
+    if row[0] is not None:
+        return True
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return False
+    return True
+
+
+def add_trigram_indexes(apps, schema_editor):
+    # Without pg_trgm the indexes are skipped and search falls back to substring matching.
+    if not install_pg_trgm(schema_editor.connection):
+        return
+    model = apps.get_model("correspondence", "Correspondence")
+    for index in TRIGRAM_INDEXES:
+        schema_editor.add_index(model, index)
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    # The indexes are absent when pg_trgm was unavailable on the way forward.
+    for index in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("correspondence", "0014_inboxcounter"),
+        ("dms", "0013_document_deleted_at"),
+        ("organization", "0004_office_officemembership"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="correspondence", index=index) for index in TRIGRAM_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(add_trigram_indexes, remove_trigram_indexes),
+            ],
+        ),
+    ]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from common.models import SoftDeleteModel, TimeStampedModel, UUIDModel
@@ -129,11 +130,62 @@ class Correspondence(UUIDModel, SoftDeleteModel, TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination for inbox and archive listings.
+            models.Index(fields=["-created_at", "-id"], name="corr_created_id_idx"),
+            # Tag containment filters and facets (``tags @> '["x"]'``).
+            GinIndex(fields=["tags"], name="corr_tags_gin", opclasses=["jsonb_path_ops"]),
+            # Fuzzy search (``CorrespondenceSearchService``); only created where pg_trgm is installed.
+            GinIndex(fields=["reference_number"], name="corr_reference_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["subject"], name="corr_subject_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["sender_name"], name="corr_sender_name_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["sender_organization"], name="corr_sender_org_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.reference_number} - {self.subject}"
 
 
+class ReferenceCounter(TimeStampedModel):
+    """Last reference number issued per registry office, year and series."""
+
+    scope = models.CharField(max_length=64, blank=True, help_text="Registry office id; blank when there is none")
+    year = models.PositiveSmallIntegerField()
+    series = models.CharField(max_length=16)
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "year", "series"], name="corr_reference_counter_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.series}/{self.year} ({self.scope or 'no office'}): {self.last_value}"
+
+
+class InboxCounter(TimeStampedModel):
+    """Running inbox totals for one office or approver, kept in step by ``InboxCounterService``."""
+
+    class Scope(models.TextChoices):
+        OFFICE = "office", "Office"
+        APPROVER = "approver", "Approver"
+
+    scope = models.CharField(max_length=16, choices=Scope.choices)
+    scope_id = models.CharField(max_length=64)
+    total = models.IntegerField(default=0)
+    open = models.IntegerField(default=0)
+    urgent = models.IntegerField(default=0)
+    overdue = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "scope_id"], name="corr_inbox_counter_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scope} {self.scope_id}: {self.total}"
+
+
 class CorrespondenceDocumentLink(UUIDModel, TimeStampedModel):
     """Link between correspondence and DMS documents."""
 
@@ -201,6 +253,13 @@ class CorrespondenceAttachment(UUIDModel, TimeStampedModel):
     file_type = models.CharField(max_length=100)
     file_size = models.BigIntegerField(help_text="Size in bytes")
     file_url = models.URLField(blank=True)
+    blob = models.ForeignKey(
+        "common.StoredBlob",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="correspondence_attachments",
+    )
 
 
 class Minute(UUIDModel, TimeStampedModel):
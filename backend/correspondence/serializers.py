@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 from accounts.serializers import UserSerializer
+from common.services import BlobPreviewService, BlobStorageService
 from organization.models import Department, Division, Directorate, Office
 
 from .models import (
@@ -15,6 +18,7 @@ from .models import (
     Delegation,
     Minute,
 )
+from .services import CorrespondenceAccessService
 
 
 class CorrespondenceDocumentLinkSerializer(serializers.ModelSerializer):
@@ -25,6 +29,59 @@ class CorrespondenceDocumentLinkSerializer(serializers.ModelSerializer):
 
 
 class CorrespondenceAttachmentSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+
+    def validate_correspondence(self, value):
+        visible = CorrespondenceAccessService.visible_to(Correspondence.objects.filter(pk=value.pk), self._user())
+        if not visible.exists():
+            raise serializers.ValidationError("Correspondence not found.")
+        return value
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        file_url = attrs.get("file_url")
+        self._reused_blob = None
+        if file_url and file_url != getattr(self.instance, "file_url", None):
+            # Downloads serve the linked blob, so a URL may only name a file the user can already open.
+            blob = BlobStorageService.for_media_url(file_url)
+            visible = CorrespondenceAccessService.visible_to(Correspondence.objects.all(), self._user())
+            if blob is None or not CorrespondenceAttachment.objects.filter(
+                blob=blob, correspondence__in=visible
+            ).exists():
+                raise serializers.ValidationError(
+                    {"file_url": "File URL must reference a file already stored on this server."}
+                )
+            self._reused_blob = attrs["blob"] = blob
+        return attrs
+
+    def create(self, validated_data):
+        attachment = super().create(validated_data)
+        if getattr(self, "_reused_blob", None) is not None:
+            BlobStorageService.retain(attachment.blob_id)
+        return attachment
+
+    def update(self, instance, validated_data):
+        previous_blob_id = instance.blob_id
+        attachment = super().update(instance, validated_data)
+        if getattr(self, "_reused_blob", None) is not None and attachment.blob_id != previous_blob_id:
+            BlobStorageService.retain(attachment.blob_id)
+            BlobStorageService.release(previous_blob_id)
+        return attachment
+
+    def _user(self):
+        return getattr(self.context.get("request"), "user", None)
+
+    def get_download_url(self, obj) -> str | None:
+        if not (obj.blob_id or obj.file_url) or not obj.pk:
+            return None
+        return reverse("api_v1:correspondence-attachment-download", args=[obj.pk], request=self.context.get("request"))
+
+    def get_preview_url(self, obj) -> str | None:
+        if not obj.blob_id or not obj.pk or not BlobPreviewService.is_previewable(obj.file_type):
+            return None
+        return reverse("api_v1:correspondence-attachment-preview", args=[obj.pk], request=self.context.get("request"))
+
     class Meta:
         model = CorrespondenceAttachment
         fields = [
@@ -34,6 +91,8 @@ class CorrespondenceAttachmentSerializer(serializers.ModelSerializer):
             "file_type",
             "file_size",
             "file_url",
+            "download_url",
+            "preview_url",
             "created_at",
             "updated_at",
         ]
@@ -176,12 +235,19 @@ class CorrespondenceSerializer(serializers.ModelSerializer):
         required=False,
     )
     completion_package = serializers.SerializerMethodField()
+    # Series to number from when ``reference_number`` is left blank.
+    reference_series = serializers.ChoiceField(
+        choices=list(settings.CORRESPONDENCE_REFERENCE_SERIES),
+        write_only=True,
+        required=False,
+    )
 
     class Meta:
         model = Correspondence
         fields = [
             "id",
             "reference_number",
+            "reference_series",
             "subject",
             "summary",
             "body_html",
@@ -258,6 +324,59 @@ class CorrespondenceSerializer(serializers.ModelSerializer):
         }
 
 
+class CorrespondenceListSerializer(serializers.ModelSerializer):
+    """Read-only list row: registry metadata, office and approver names, and timeline counts."""
+
+    owning_office_name = serializers.CharField(source="owning_office.name", read_only=True, default=None)
+    current_office_name = serializers.CharField(source="current_office.name", read_only=True, default=None)
+    current_approver_name = serializers.SerializerMethodField()
+    minutes_count = serializers.IntegerField(read_only=True, default=0)
+    attachments_count = serializers.IntegerField(read_only=True, default=0)
+
+    def get_current_approver_name(self, obj):
+        approver = obj.current_approver
+        if approver is None:
+            return None
+        return approver.get_full_name() or approver.username
+
+    class Meta:
+        model = Correspondence
+        fields = [
+            "id",
+            "reference_number",
+            "subject",
+            "source",
+            "status",
+            "priority",
+            "document_type",
+            "direction",
+            "received_date",
+            "sender_name",
+            "owning_office",
+            "owning_office_name",
+            "current_office",
+            "current_office_name",
+            "current_approver",
+            "current_approver_name",
+            "minutes_count",
+            "attachments_count",
+            "tags",
+            "is_deleted",
+            "completed_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class ReferenceReservationSerializer(serializers.Serializer):
+    """Block of reference numbers reserved ahead of a bulk registry intake."""
+
+    count = serializers.IntegerField(min_value=1, max_value=settings.CORRESPONDENCE_REFERENCE_RESERVE_MAX)
+    series = serializers.ChoiceField(choices=list(settings.CORRESPONDENCE_REFERENCE_SERIES), required=False)
+    office = serializers.PrimaryKeyRelatedField(queryset=Office.objects.all(), allow_null=True, required=False)
+
+
 class DelegationSerializer(serializers.ModelSerializer):
     principal = UserSerializer(read_only=True)
     principal_id = serializers.PrimaryKeyRelatedField(
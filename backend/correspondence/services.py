@@ -2,30 +2,457 @@
 
 from __future__ import annotations
 
+import json
 import textwrap
-import uuid
+from contextlib import contextmanager
+from datetime import timedelta
 from io import BytesIO
 from typing import Iterable, List, Sequence
 
 from django.conf import settings
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
-from django.db import transaction
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Lookup, Q, QuerySet, Value
+from django.db.models.functions import Greatest
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 from django.utils.text import slugify
 from reportlab.lib.pagesizes import LETTER
 from reportlab.pdfgen import canvas
+from rest_framework.exceptions import ValidationError
 
 from accounts.models import User
-from correspondence.models import Correspondence
+from common.exports import ArchiveNames, ExportEntry, safe_name
+from common.models import ContentSignature, StoredBlob
+from common.services import (
+    BlobStorageService,
+    DuplicateDetectionService,
+    RecordSummaryService,
+    RetainedFile,
+    RetentionService,
+)
+from common.storage import storage_path_from_url
+from correspondence.models import (
+    Correspondence,
+    CorrespondenceAttachment,
+    InboxCounter,
+    Minute,
+    ReferenceCounter,
+)
 from dms.models import Document, DocumentPermission, DocumentVersion
+from dms.services import DocumentExportService
 from notifications.models import Notification
 from notifications.services import NotificationService
 from organization.models import Office, OfficeMembership
 
 
+class CorrespondenceSummaryService:
+    """Summary buckets shared by the inbox and records endpoints (see ``RecordSummaryService``)."""
+
+    # Days after receipt before open correspondence of each priority counts as overdue.
+    OVERDUE_AFTER_DAYS = {
+        Correspondence.Priority.URGENT: 2,
+        Correspondence.Priority.HIGH: 5,
+        Correspondence.Priority.MEDIUM: 10,
+        Correspondence.Priority.LOW: 14,
+    }
+
+    @classmethod
+    def overdue_filter(cls, today=None) -> Q:
+        today = today or timezone.now().date()
+        overdue = Q()
+        for priority, days in cls.OVERDUE_AFTER_DAYS.items():
+            overdue |= Q(priority=priority, received_date__lt=today - timedelta(days=days))
+        return overdue & ~Q(status=Correspondence.Status.COMPLETED)
+
+    @classmethod
+    def is_overdue(cls, priority: str, received_date, status: str, today=None) -> bool:
+        """Python form of :meth:`overdue_filter` for a single item."""
+        if received_date is None or priority not in cls.OVERDUE_AFTER_DAYS:
+            return False
+        if status == Correspondence.Status.COMPLETED:
+            return False
+        today = today or timezone.now().date()
+        return received_date < today - timedelta(days=cls.OVERDUE_AFTER_DAYS[priority])
+
+    @classmethod
+    def inbox(cls, queryset: QuerySet, user) -> dict:
+        return RecordSummaryService.summarize(
+            queryset,
+            {
+                "total": None,
+                "urgent": Q(priority=Correspondence.Priority.URGENT),
+                "overdue": cls.overdue_filter(),
+                "assigned_to_user": Q(current_approver=user),
+            },
+        )
+
+    @staticmethod
+    def archive(queryset: QuerySet) -> dict:
+        return RecordSummaryService.summarize(
+            queryset,
+            {
+                "total": None,
+                "downward": Q(direction=Correspondence.Direction.DOWNWARD),
+                "upward": Q(direction=Correspondence.Direction.UPWARD),
+                "this_year": Q(received_date__year=timezone.now().year),
+            },
+            years_field="received_date",
+        )
+
+    @staticmethod
+    def department(queryset: QuerySet, office_ids) -> dict:
+        buckets = {
+            "total": None,
+            "completed": Q(status=Correspondence.Status.COMPLETED),
+            "archived": Q(status=Correspondence.Status.ARCHIVED),
+        }
+        if office_ids:
+            buckets["office_owned"] = Q(owning_office_id__in=office_ids)
+        summary = RecordSummaryService.summarize(queryset, buckets, years_field="received_date")
+        summary.setdefault("office_owned", 0)
+        return summary
+
+
+class _ContainsInsensitive(Lookup):
+    """``column ILIKE '%term%'`` on the bare column, which the trigram indexes can serve.
+
+    ``icontains`` compiles to ``UPPER(column::text) LIKE UPPER(...)`` instead,
+    which no index on the column matches.
+    """
+
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        patterns = [f"%{connection.ops.prep_for_like_query(param)}%" for param in rhs_params]
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *patterns]
+
+
+class CorrespondenceSearchService:
+    """Typo-tolerant search over reference numbers, subjects and senders.
+
+    With pg_trgm installed each field matches on substring (``ILIKE``) or word
+    similarity (``%>``), both served by the ``*_trgm`` GIN indexes, and rows are
+    ranked by their best ``word_similarity`` to the term. The operator uses the
+    server's ``pg_trgm.word_similarity_threshold`` (0.6 by default), which can be
+    tuned per database. Without the extension the search degrades to the plain
+    substring match with a constant rank.
+    """
+
+    FIELDS = ("reference_number", "subject", "sender_name", "sender_organization")
+    # Shorter terms have too few trigrams to be similar to anything meaningful.
+    MIN_FUZZY_LENGTH = 3
+
+    _trigram_installed: bool | None = None
+
+    @classmethod
+    def fuzzy_enabled(cls) -> bool:
+        if not getattr(settings, "CORRESPONDENCE_SEARCH_FUZZY", True):
+            return False
+        if cls._trigram_installed is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                cls._trigram_installed = cursor.fetchone() is not None
+        return cls._trigram_installed
+
+    @classmethod
+    def search(cls, queryset: QuerySet, term: str | None, *, fields: Sequence[str] = FIELDS) -> QuerySet:
+        """Filter ``queryset`` to rows matching ``term``, annotated with ``search_rank``."""
+
+        term = (term or "").strip()
+        if not term:
+            return queryset
+        matches = Q()
+        for field in fields:
+            matches |= Q(_ContainsInsensitive(F(field), term))
+        if len(term) < cls.MIN_FUZZY_LENGTH or not cls.fuzzy_enabled():
+            return queryset.filter(matches).annotate(search_rank=Value(1.0, output_field=FloatField()))
+
+        for field in fields:
+            matches |= Q(**{f"{field}__trigram_word_similar": term})
+        similarities = [TrigramWordSimilarity(term, field) for field in fields]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+
+class CorrespondenceAccessService:
+    """Which correspondence a user may open, used to scope attachments and exports.
+
+    A user sees items they registered or are approving, items owned by or
+    sitting with one of their offices, items filed under or distributed to
+    their department, division or directorate, and items in divisions or
+    directorates they head. Superusers see everything.
+    """
+
+    @staticmethod
+    def access_filter(user) -> Q:
+        office_ids = OfficeMembership.objects.filter(user=user, is_active=True).values("office_id")
+        access = (
+            Q(created_by=user)
+            | Q(current_approver=user)
+            | Q(owning_office_id__in=office_ids)
+            | Q(current_office_id__in=office_ids)
+            | Q(division__general_manager=user)
+            | Q(division__directorate__executive_director=user)
+        )
+        if user.department_id:
+            access |= Q(department_id=user.department_id) | Q(distribution__department_id=user.department_id)
+        if user.division_id:
+            access |= Q(division_id=user.division_id) | Q(distribution__division_id=user.division_id)
+        if user.directorate_id:
+            access |= Q(distribution__directorate_id=user.directorate_id)
+        return access
+
+    @classmethod
+    def visible_to(cls, queryset: QuerySet[Correspondence], user) -> QuerySet[Correspondence]:
+        """Restrict ``queryset`` to live correspondence ``user`` may see."""
+
+        queryset = queryset.filter(is_deleted=False)
+        if not user or not user.is_authenticated:
+            return queryset.none()
+        if user.is_superuser:
+            return queryset
+        # A semi-join keeps distribution fan-out from duplicating rows.
+        visible = Correspondence.objects.filter(cls.access_filter(user)).values("id")
+        return queryset.filter(id__in=visible)
+
+
+class InboxCounterService:
+    """Per-office and per-approver inbox counters, kept current by the write paths.
+
+    A live item counts towards its owning office, its current office (once
+    when both are the same) and its current approver, in ``total``, ``open``
+    (not completed or archived), ``urgent`` and ``overdue``. Views wrap each
+    change in :meth:`tracking`, which reads the affected items before and
+    after the block and applies the difference in the same transaction with
+    one upsert. Items also become overdue as days pass, so :meth:`reconcile`
+    rebuilds every counter nightly.
+    """
+
+    BUCKETS = ("total", "open", "urgent", "overdue")
+    STATE_FIELDS = (
+        "id",
+        "is_deleted",
+        "status",
+        "priority",
+        "received_date",
+        "owning_office_id",
+        "current_office_id",
+        "current_approver_id",
+    )
+    CLOSED_STATUSES = (Correspondence.Status.COMPLETED, Correspondence.Status.ARCHIVED)
+
+    @classmethod
+    @contextmanager
+    def tracking(cls, *correspondence_ids):
+        """Apply the counter changes made inside the block.
+
+        Items created in the block are appended to the yielded list.
+        """
+        tracked = [pk for pk in correspondence_ids if pk]
+        with transaction.atomic():
+            before = cls._states(tracked)
+            yield tracked
+            cls.apply(before, cls._states(tracked))
+
+    @classmethod
+    def contributions(cls, state: dict | None, today) -> dict[tuple[str, str], tuple[int, ...]]:
+        if not state or state["is_deleted"]:
+            return {}
+        values = (
+            1,
+            int(state["status"] not in cls.CLOSED_STATUSES),
+            int(state["priority"] == Correspondence.Priority.URGENT),
+            int(
+                CorrespondenceSummaryService.is_overdue(
+                    state["priority"], state["received_date"], state["status"], today
+                )
+            ),
+        )
+        scopes = {
+            (InboxCounter.Scope.OFFICE, str(office_id))
+            for office_id in (state["owning_office_id"], state["current_office_id"])
+            if office_id
+        }
+        if state["current_approver_id"]:
+            scopes.add((InboxCounter.Scope.APPROVER, str(state["current_approver_id"])))
+        return {scope: values for scope in scopes}
+
+    @classmethod
+    def apply(cls, before: dict, after: dict) -> None:
+        today = timezone.now().date()
+        deltas: dict = {}
+        for states, sign in ((before, -1), (after, 1)):
+            for state in states.values():
+                for scope, values in cls.contributions(state, today).items():
+                    current = deltas.get(scope, (0,) * len(cls.BUCKETS))
+                    deltas[scope] = tuple(total + sign * value for total, value in zip(current, values))
+        # Sorted so concurrent writers lock counter rows in the same order.
+        rows = [(scope, scope_id, *values) for (scope, scope_id), values in sorted(deltas.items()) if any(values)]
+        if rows:
+            cls._increment(rows)
+
+    @classmethod
+    def counts(cls, scope: str, scope_ids) -> dict[str, dict[str, int]]:
+        counters = InboxCounter.objects.filter(scope=scope, scope_id__in=[str(pk) for pk in scope_ids])
+        return {counter.scope_id: {name: getattr(counter, name) for name in cls.BUCKETS} for counter in counters}
+
+    @classmethod
+    def reconcile(cls, *, batch_size: int = 2000) -> int:
+        """Rebuild every counter from the correspondence table; returns the number of corrected counters.
+
+        The table is scanned without blocking writers, reading the counters from
+        the same snapshot. Writers change items and counters in one transaction,
+        so the gap between the two is exactly the drift; it is then added to the
+        live counters, on top of whatever writers committed during the scan.
+        """
+
+        zero = (0,) * len(cls.BUCKETS)
+        expected, counters = cls._snapshot(batch_size)
+
+        corrections = {}
+        for key in expected.keys() | counters.keys():
+            current = counters[key][1] if key in counters else zero
+            correction = tuple(want - have for want, have in zip(expected.get(key, zero), current))
+            if any(correction):
+                corrections[key] = correction
+        stale = {key: pk for key, (pk, _) in counters.items() if key not in expected}
+
+        rows = [(scope, scope_id, *values) for (scope, scope_id), values in sorted(corrections.items())]
+        with transaction.atomic():
+            for start in range(0, len(rows), batch_size):
+                cls._increment(rows[start : start + batch_size])
+            # Counters writers touched since the snapshot are no longer empty and stay.
+            InboxCounter.objects.filter(pk__in=stale.values(), **{name: 0 for name in cls.BUCKETS}).delete()
+        return len(corrections.keys() | stale.keys())
+
+    @classmethod
+    def _snapshot(cls, batch_size: int) -> tuple[dict, dict]:
+        """Expected counter values from the items, and the stored ``(pk, values)`` per counter."""
+
+        # Nested in an outer transaction (tests), that transaction's snapshot is used.
+        own_transaction = not connection.in_atomic_block
+        with transaction.atomic():
+            if own_transaction:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            today = timezone.now().date()
+            expected: dict = {}
+            for state in Correspondence.objects.values(*cls.STATE_FIELDS).iterator(chunk_size=batch_size):
+                for scope, values in cls.contributions(state, today).items():
+                    current = expected.get(scope, (0,) * len(cls.BUCKETS))
+                    expected[scope] = tuple(total + value for total, value in zip(current, values))
+            counters = {
+                (scope, scope_id): (pk, tuple(values))
+                for pk, scope, scope_id, *values in InboxCounter.objects.values_list(
+                    "pk", "scope", "scope_id", *cls.BUCKETS
+                ).iterator(chunk_size=batch_size)
+            }
+        return expected, counters
+
+    @classmethod
+    def _states(cls, correspondence_ids) -> dict:
+        if not correspondence_ids:
+            return {}
+        rows = Correspondence.all_objects.filter(pk__in=correspondence_ids).values(*cls.STATE_FIELDS)
+        return {row["id"]: row for row in rows}
+
+    @classmethod
+    def _increment(cls, rows: list[tuple]) -> None:
+        table = InboxCounter._meta.db_table
+        columns = ", ".join(cls.BUCKETS)
+        updates = ", ".join(f"{name} = {table}.{name} + EXCLUDED.{name}" for name in cls.BUCKETS)
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, now(), now())"] * len(rows))
+        sql = f"""
+            INSERT INTO {table} (scope, scope_id, {columns}, created_at, updated_at)
+            VALUES {placeholders}
+            ON CONFLICT (scope, scope_id) DO UPDATE SET {updates}, updated_at = now()
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [value for row in rows for value in row])
+
+
+class ReferenceNumberService:
+    """Reference numbers for new correspondence, one counter per (registry office, year, series).
+
+    Counters live in ``ReferenceCounter`` and are advanced with a single
+    ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``: the row lock it takes
+    serialises concurrent registrations on the same counter only, and no
+    query ever counts the correspondence table. A counter is bumped by
+    ``count`` at once, so bulk registry intake can reserve a block of numbers
+    in one round trip. Formats come from ``CORRESPONDENCE_REFERENCE_SERIES``.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    @staticmethod
+    def series_choices() -> list[str]:
+        return list(settings.CORRESPONDENCE_REFERENCE_SERIES)
+
+    @classmethod
+    def reserve(
+        cls,
+        office: Office | None,
+        *,
+        count: int = 1,
+        series: str | None = None,
+        year: int | None = None,
+    ) -> list[str]:
+        """``count`` unused reference numbers for ``office``, in issue order."""
+
+        series = series or settings.CORRESPONDENCE_REFERENCE_DEFAULT_SERIES
+        if series not in settings.CORRESPONDENCE_REFERENCE_SERIES:
+            raise ValidationError({"series": f"Unknown reference series: {series}."})
+        year = year or timezone.localdate().year
+        scope = str(office.pk) if office else ""
+
+        references: list[str] = []
+        for _ in range(cls.MAX_ATTEMPTS):
+            wanted = count - len(references)
+            last = cls._advance(scope, year, series, wanted)
+            batch = [cls.format(office, series, year, number) for number in range(last - wanted + 1, last + 1)]
+            # Numbers typed in by hand (or issued under an older format) are skipped, not reused.
+            taken = set(
+                Correspondence.all_objects.filter(reference_number__in=batch).values_list("reference_number", flat=True)
+            )
+            references.extend(reference for reference in batch if reference not in taken)
+            if len(references) == count:
+                return references
+        raise ValidationError({"reference_number": "Unable to allocate an unused reference number."})
+
+    @classmethod
+    def allocate(cls, office: Office | None, *, series: str | None = None) -> str:
+        return cls.reserve(office, series=series)[0]
+
+    @staticmethod
+    def format(office: Office | None, series: str, year: int, number: int) -> str:
+        office_code = office.code if office else settings.CORRESPONDENCE_REFERENCE_NO_OFFICE
+        return settings.CORRESPONDENCE_REFERENCE_SERIES[series].format(
+            office=office_code.upper(),
+            year=year,
+            series=series,
+            number=number,
+        )
+
+    @staticmethod
+    def _advance(scope: str, year: int, series: str, count: int) -> int:
+        table = ReferenceCounter._meta.db_table
+        sql = f"""
+            INSERT INTO {table} (scope, year, series, last_value, created_at, updated_at)
+            VALUES (%s, %s, %s, %s, now(), now())
+            ON CONFLICT (scope, year, series)
+            DO UPDATE SET last_value = {table}.last_value + EXCLUDED.last_value, updated_at = now()
+            RETURNING last_value
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [scope, year, series, count])
+            return cursor.fetchone()[0]
+
+
 class CompletionPackageService:
     """Handles generation and distribution of correspondence completion summaries."""
 
@@ -80,8 +507,8 @@ class CompletionPackageService:
         text = strip_tags(html)
         pdf_bytes = cls._build_summary_pdf(text)
 
-        storage_path = cls._store_pdf(correspondence, pdf_bytes)
-        file_url = cls._build_media_url(storage_path)
+        blob = cls._store_pdf(correspondence, pdf_bytes)
+        file_url = cls._build_media_url(blob.storage_path)
         version_number = 1
         latest_version = document.versions.order_by("-version_number").first()
         if latest_version:
@@ -90,16 +517,18 @@ class CompletionPackageService:
         DocumentVersion.objects.create(
             document=document,
             version_number=version_number,
-            file_name=storage_path.split("/")[-1],
+            file_name=cls._pdf_filename(correspondence),
             file_type="application/pdf",
-            file_size=len(pdf_bytes),
+            file_size=blob.size,
             file_url=file_url,
+            blob=blob,
             content_html=html,
             content_text=text,
+            extraction_status=DocumentVersion.ExtractionStatus.COMPLETED,
+            extracted_at=timezone.now(),
             summary="Automated completion summary",
             uploaded_by=triggered_by or correspondence.created_by,
         )
-
         return document
 
     @staticmethod
@@ -155,13 +584,18 @@ class CompletionPackageService:
         return buffer.read()
 
     @staticmethod
-    def _store_pdf(correspondence: Correspondence, pdf_bytes: bytes) -> str:
-        directory = f"completion_packages/{correspondence.id}"
+    def _pdf_filename(correspondence: Correspondence) -> str:
         filename = slugify(correspondence.reference_number or correspondence.subject or "completion")
-        filename = filename[:80] if filename else correspondence.id
-        storage_path = f"{directory}/{filename}-{uuid.uuid4().hex}.pdf"
-        default_storage.save(storage_path, ContentFile(pdf_bytes))
-        return storage_path
+        filename = filename[:80] if filename else str(correspondence.id)
+        return f"{filename}.pdf"
+
+    @classmethod
+    def _store_pdf(cls, correspondence: Correspondence, pdf_bytes: bytes) -> StoredBlob:
+        return BlobStorageService.store_bytes(
+            pdf_bytes,
+            file_name=cls._pdf_filename(correspondence),
+            content_type="application/pdf",
+        )
 
     @staticmethod
     def _build_media_url(path: str) -> str:
@@ -351,3 +785,187 @@ class CompletionPackageService:
             path = f"/{path}"
         return f"{base}{path}"
 
+
+class CorrespondenceExportService:
+    """ZIP export builder for one correspondence item.
+
+    The package holds the letter body, every attachment, the minute trail as
+    ``minutes.json`` and, when ``include_completion_package`` is set (the
+    requester can see that document), the latest completion package version.
+    """
+
+    @classmethod
+    def archive(cls, params: dict) -> tuple[str, list[ExportEntry], dict]:
+        correspondence = (
+            Correspondence.all_objects.select_related("completion_package")
+            .prefetch_related("attachments__blob")
+            .get(pk=params["correspondence_id"])
+        )
+        names = ArchiveNames()
+        entries: list[ExportEntry] = []
+        if correspondence.body_html:
+            entries.append(ExportEntry(names("body.html"), data=correspondence.body_html.encode("utf-8")))
+
+        for attachment in correspondence.attachments.all():
+            name = names(f"attachments/{safe_name(attachment.file_name)}")
+            if attachment.blob_id:
+                entries.append(ExportEntry(name, storage_path=attachment.blob.storage_path, size=attachment.blob.size))
+            else:
+                entries.append(
+                    ExportEntry(name, storage_path=storage_path_from_url(attachment.file_url), size=attachment.file_size)
+                )
+
+        minutes = list(
+            Minute.objects.filter(correspondence=correspondence)
+            .order_by("timestamp", "id")
+            .values(
+                "id",
+                "timestamp",
+                "action_type",
+                "direction",
+                "step_number",
+                "minute_text",
+                "user__username",
+                "from_office__name",
+                "to_office__name",
+            )
+        )
+        entries.append(ExportEntry(names("minutes.json"), data=json.dumps(minutes, cls=DjangoJSONEncoder, indent=2).encode()))
+
+        package = correspondence.completion_package if params.get("include_completion_package") else None
+        if package is not None:
+            version = package.versions.select_related("blob").order_by("-version_number").first()
+            if version is not None:
+                entry = DocumentExportService.version_entry(version, "completion-package", names)
+                if entry is not None:
+                    entries.append(entry)
+
+        reference = correspondence.reference_number or str(correspondence.id)[:8]
+        manifest = {
+            "kind": "correspondence",
+            "correspondence": {
+                "id": str(correspondence.id),
+                "reference_number": correspondence.reference_number,
+                "subject": correspondence.subject,
+                "status": correspondence.status,
+                "received_date": correspondence.received_date,
+                "completed_at": correspondence.completed_at,
+            },
+        }
+        return f"{safe_name(reference, 'correspondence')}.zip", entries, manifest
+
+
+class CorrespondenceRetentionService:
+    """Purger for soft-deleted correspondence, driven by ``common.services.RetentionService``.
+
+    Deleting an item cascades to its attachments, minutes, distribution and
+    document links; the completion package is a document of its own and is
+    left alone.
+    """
+
+    LABEL = "correspondence"
+    model = Correspondence
+
+    @staticmethod
+    def files(correspondence_ids) -> list[RetainedFile]:
+        files = []
+        attachments = (
+            CorrespondenceAttachment.objects.filter(correspondence_id__in=correspondence_ids)
+            .select_related("blob")
+            .only("blob__storage_path", "blob__size", "file_url", "file_size")
+        )
+        for attachment in attachments:
+            if attachment.blob_id:
+                files.append(RetainedFile(attachment.blob.storage_path, attachment.blob.size, attachment.blob_id))
+            elif storage_path := storage_path_from_url(attachment.file_url):
+                files.append(RetainedFile(storage_path, attachment.file_size or 0))
+        return files
+
+    @staticmethod
+    def archive(correspondence_ids) -> tuple[list[ExportEntry], list[dict]]:
+        entries, records = [], []
+        for correspondence_id in correspondence_ids:
+            _, package, manifest = CorrespondenceExportService.archive({"correspondence_id": correspondence_id})
+            folder = f"correspondence/{correspondence_id}"
+            for entry in package:
+                entry.archive_name = f"{folder}/{entry.archive_name}"
+            entries.extend(package)
+            records.append({**manifest["correspondence"], "folder": folder})
+        return entries, records
+
+    @staticmethod
+    def purge(correspondence_ids) -> None:
+        DuplicateDetectionService.remove_groups(ContentSignature.Source.CORRESPONDENCE, correspondence_ids)
+        Correspondence.all_objects.filter(pk__in=correspondence_ids).hard_delete()
+
+    @staticmethod
+    def paths_in_use(storage_paths: Iterable[str]) -> set[str]:
+        return RetentionService.referenced_paths(CorrespondenceAttachment.objects.all(), storage_paths)
+
+
+class CorrespondenceDuplicateService:
+    """Probable duplicates of a correspondence item at intake.
+
+    Items sharing an attachment blob are exact duplicates; near-duplicates
+    come from the MinHash index over subject, summary and body text.
+    """
+
+    SOURCE = ContentSignature.Source.CORRESPONDENCE
+
+    @staticmethod
+    def correspondence_text(correspondence: Correspondence) -> str:
+        return "\n".join(
+            part
+            for part in (correspondence.subject, correspondence.summary, strip_tags(correspondence.body_html or ""))
+            if part
+        )
+
+    @classmethod
+    def index(cls, correspondence: Correspondence) -> ContentSignature | None:
+        return DuplicateDetectionService.index(
+            cls.SOURCE, correspondence.pk, correspondence.pk, cls.correspondence_text(correspondence)
+        )
+
+    @classmethod
+    def probable_duplicates(cls, correspondence: Correspondence, *, limit: int = 10) -> list[dict]:
+        matches: dict = {}
+        blob_ids = [blob_id for blob_id in correspondence.attachments.values_list("blob_id", flat=True) if blob_id]
+        if blob_ids:
+            exact = (
+                Correspondence.objects.filter(attachments__blob_id__in=blob_ids)
+                .exclude(pk=correspondence.pk)
+                .values_list("id", flat=True)
+                .distinct()[:limit]
+            )
+            for correspondence_id in exact:
+                matches[correspondence_id] = {"similarity": 1.0, "match": "exact"}
+
+        signature = DuplicateDetectionService.signature_for(cls.SOURCE, correspondence.pk)
+        for match in DuplicateDetectionService.find(
+            signature, source=cls.SOURCE, exclude_group=correspondence.pk, limit=limit
+        ):
+            matches.setdefault(match["group_id"], {"similarity": match["similarity"], "match": "near"})
+        if not matches:
+            return []
+
+        rows = Correspondence.objects.filter(id__in=matches).values("id", "reference_number", "subject", "status")
+        results = [
+            {
+                "correspondence": str(row["id"]),
+                "reference_number": row["reference_number"],
+                "subject": row["subject"],
+                "status": row["status"],
+                **matches[row["id"]],
+            }
+            for row in rows
+        ]
+        return sorted(results, key=lambda result: result["similarity"], reverse=True)[:limit]
+
+    @classmethod
+    def rebuild(cls, *, batch_size: int = 500) -> int:
+        indexed = 0
+        items = Correspondence.objects.only("id", "subject", "summary", "body_html")
+        for correspondence in items.iterator(chunk_size=batch_size):
+            if cls.index(correspondence) is not None:
+                indexed += 1
+        return indexed
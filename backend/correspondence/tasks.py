@@ -0,0 +1,20 @@
+"""Celery tasks for correspondence workflows."""
+
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+from .services import InboxCounterService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="correspondence.reconcile_inbox_counters", ignore_result=True)
+def reconcile_inbox_counters() -> int:
+    """Rebuild office and approver inbox counters, picking up items that became overdue."""
+
+    corrected = InboxCounterService.reconcile()
+    logger.info("Reconciled inbox counters; corrected %s counter(s)", corrected)
+    return corrected
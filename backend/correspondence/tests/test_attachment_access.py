@@ -0,0 +1,110 @@
+"""Tests for scoping correspondence attachments to users who can see the item."""
+
+from __future__ import annotations
+
+import zipfile
+from io import BytesIO
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from audit.models import ActivityLog
+from common.services import BlobStorageService
+from correspondence.models import Correspondence, CorrespondenceAttachment
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentVisibilityService
+from organization.models import Office, OfficeMembership
+
+
+@pytest.fixture()
+def attachment(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+    clerk = User.objects.create(username="legal-clerk")
+    legal = Office.objects.create(name="Legal", code="LEG")
+    OfficeMembership.objects.create(office=legal, user=clerk, is_primary=True)
+    item = Correspondence.objects.create(
+        subject="Settlement offer", reference_number="LEG/1", owning_office=legal, current_office=legal
+    )
+    blob = BlobStorageService.store_bytes(b"settlement terms", file_name="offer.pdf", content_type="application/pdf")
+    attachment = CorrespondenceAttachment.objects.create(
+        correspondence=item,
+        file_name="offer.pdf",
+        file_type="application/pdf",
+        file_size=blob.size,
+        file_url=f"http://testserver/media/{blob.storage_path}",
+        blob=blob,
+    )
+    return clerk, attachment
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_attachments_are_hidden_from_users_who_cannot_see_the_item(attachment):
+    clerk, attachment = attachment
+    outsider = User.objects.create(username="outsider")
+    url = f"/api/v1/correspondence/attachments/{attachment.id}/download/"
+
+    assert b"".join(_client(clerk).get(url).streaming_content) == b"settlement terms"
+    assert _client(outsider).get(url).status_code == 404
+    assert _client(outsider).get(f"/api/v1/correspondence/attachments/{attachment.id}/preview/").status_code == 404
+    assert _client(outsider).get("/api/v1/correspondence/attachments/").json() == []
+
+    Correspondence.objects.filter(pk=attachment.correspondence_id).update(is_deleted=True)
+    assert _client(clerk).get(url).status_code == 404
+
+
+def test_new_attachments_cannot_point_at_files_the_user_cannot_open(attachment):
+    clerk, attachment = attachment
+    outsider = User.objects.create(username="outsider")
+    own = Correspondence.objects.create(subject="Mine", reference_number="OUT/1", created_by=outsider)
+
+    response = _client(outsider).post(
+        "/api/v1/correspondence/attachments/",
+        {"correspondence": str(own.id), "file_name": "copy.pdf", "file_url": attachment.file_url},
+        format="json",
+    )
+
+    assert response.status_code == 400
+    assert "file_url" in response.data["details"]
+
+
+def test_export_leaves_out_a_completion_package_the_user_cannot_see(attachment):
+    clerk, attachment = attachment
+    package = Document.objects.create(
+        title="Completion package",
+        document_type=Document.DocumentType.REPORT,
+        sensitivity=Document.Sensitivity.RESTRICTED,
+        author=User.objects.create(username="registry"),
+    )
+    DocumentVersion.objects.create(
+        document=package,
+        version_number=1,
+        file_name="package.html",
+        file_type="text/html",
+        file_size=4,
+        content_html="<p>Closed</p>",
+    )
+    DocumentVisibilityService.refresh([package.id])
+    Correspondence.objects.filter(pk=attachment.correspondence_id).update(completion_package=package)
+
+    url = f"/api/v1/correspondence/items/{attachment.correspondence_id}/export/"
+
+    def exported_names(user):
+        response = _client(user).get(url)
+        assert response.status_code == 200
+        return zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))).namelist()
+
+    names = exported_names(clerk)
+    assert "attachments/offer.pdf" in names
+    assert not any(name.startswith("completion-package/") for name in names)
+    admin = User.objects.create(username="records-admin", is_superuser=True)
+    assert "completion-package/v1-package.html" in exported_names(admin)
+    assert ActivityLog.objects.filter(
+        object_id=str(attachment.correspondence_id), action=ActivityLog.ActionType.CORRESPONDENCE_EXPORTED
+    ).exists()
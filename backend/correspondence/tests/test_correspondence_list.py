@@ -0,0 +1,70 @@
+"""Tests for the paginated, compact correspondence list."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from correspondence.models import Correspondence, CorrespondenceAttachment, Minute
+from organization.models import Office
+
+
+@pytest.fixture()
+def client_and_user(db):
+    user = User.objects.create(username="registry-clerk", first_name="Ada", last_name="Obi")
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, user
+
+
+def _correspondence(user, subject: str, *, minutes: int = 0, attachments: int = 0) -> Correspondence:
+    office = Office.objects.create(name=f"{subject} office", code=subject.upper().replace(" ", "-"))
+    correspondence = Correspondence.objects.create(
+        subject=subject,
+        reference_number=f"REF/{subject}",
+        owning_office=office,
+        current_office=office,
+        current_approver=user,
+        created_by=user,
+    )
+    for index in range(minutes):
+        Minute.objects.create(correspondence=correspondence, user=user, minute_text=f"Minute {index}")
+    for index in range(attachments):
+        CorrespondenceAttachment.objects.create(
+            correspondence=correspondence, file_name=f"scan-{index}.pdf", file_type="application/pdf", file_size=1
+        )
+    return correspondence
+
+
+def test_list_returns_compact_pages(client_and_user, django_assert_max_num_queries):
+    client, user = client_and_user
+    for index in range(4):
+        _correspondence(user, f"Letter {index}", minutes=3, attachments=2)
+
+    with django_assert_max_num_queries(4):
+        response = client.get("/api/v1/correspondence/items/", {"page_size": 3})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 4 and len(body["results"]) == 3 and body["next"]
+    row = body["results"][0]
+    assert "minutes" not in row and "attachments" not in row and "body_html" not in row
+    assert (row["minutes_count"], row["attachments_count"]) == (3, 2)
+    assert row["current_approver_name"] == "Ada Obi"
+    assert row["owning_office_name"].endswith("office")
+
+
+def test_cursor_pages_and_full_timeline_opt_in(client_and_user):
+    client, user = client_and_user
+    first = _correspondence(user, "Memo", minutes=1)
+    _correspondence(user, "Circular")
+
+    page = client.get("/api/v1/correspondence/items/", {"pagination": "cursor", "page_size": 1}).json()
+    following = client.get(page["next"]).json()
+    assert [row["subject"] for row in page["results"] + following["results"]] == ["Circular", "Memo"]
+
+    full = client.get("/api/v1/correspondence/items/", {"include_timeline": "true"}).json()
+    assert isinstance(full, list) and len(full) == 2
+    detail = client.get(f"/api/v1/correspondence/items/{first.id}/").json()
+    assert len(detail["minutes"]) == 1
@@ -0,0 +1,70 @@
+"""Tests for the shared correspondence search backend."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.services import AnalyticsService
+from correspondence.models import Correspondence
+from correspondence.services import CorrespondenceSearchService
+from organization.models import Office, OfficeMembership
+
+
+@pytest.fixture()
+def records(db):
+    user = User.objects.create(username="registry", is_superuser=True)
+    office = Office.objects.create(name="Registry", code="REG")
+    OfficeMembership.objects.create(office=office, user=user, is_primary=True)
+    rows = [
+        ("NPA/REG/2026/00017", "Berth allocation for Apapa", "Chidi Okeke", "Nigerian Ports Authority"),
+        ("NPA/REG/2026/00018", "Dredging survey", "Amaka Eze", "Lagos Channel Management"),
+        ("NPA/REG/2026/00019", "Staff welfare", "Tunde Bello", "Maritime Workers Union"),
+    ]
+    items = [
+        Correspondence.objects.create(
+            reference_number=reference,
+            subject=subject,
+            sender_name=sender,
+            sender_organization=organization,
+            owning_office=office,
+            current_office=office,
+            status=Correspondence.Status.ARCHIVED,
+        )
+        for reference, subject, sender, organization in rows
+    ]
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, user, office, items
+
+
+def _subjects(response):
+    return [row["subject"] for row in response.json()["results"]]
+
+
+def test_every_endpoint_matches_all_four_fields(records):
+    client, user, office, items = records
+
+    for term, subject in [("00018", "Dredging survey"), ("welfare", "Staff welfare"), ("amaka", "Dredging survey")]:
+        assert _subjects(client.get("/api/v1/correspondence/items/office-inbox/", {"search": term})) == [subject]
+        assert _subjects(client.get("/api/v1/correspondence/items/archive-records/", {"search": term})) == [subject]
+
+    # The executive records search used to ignore sender organizations.
+    payload = AnalyticsService._build_records_payload(user=user, office_ids=[office.id], limit=10, query="ports auth")
+    assert [record["id"] for record in payload] == [str(items[0].id)]
+
+    inbox = client.get("/api/v1/correspondence/items/office-inbox/", {"search": "  "}).json()
+    assert inbox["summary"]["total"] == 3
+
+
+def test_misspelt_sender_organization_ranks_best_match_first(records):
+    if not CorrespondenceSearchService.fuzzy_enabled():
+        pytest.skip("pg_trgm is not installed")
+    client, _, _, _ = records
+
+    response = client.get("/api/v1/correspondence/items/archive-records/", {"search": "Nigerain Port Authourity"})
+
+    assert _subjects(response)[0] == "Berth allocation for Apapa"
+    ranked = CorrespondenceSearchService.search(Correspondence.objects.all(), "Martime Workers").order_by("-search_rank")
+    assert ranked.first().subject == "Staff welfare"
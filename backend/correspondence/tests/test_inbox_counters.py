@@ -0,0 +1,105 @@
+"""Tests for the incrementally maintained inbox counters."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from correspondence.models import Correspondence, InboxCounter
+from correspondence.services import InboxCounterService
+from organization.models import Office, OfficeMembership
+
+
+@pytest.fixture()
+def setup(db):
+    clerk = User.objects.create(username="clerk")
+    approver = User.objects.create(username="approver")
+    registry = Office.objects.create(name="Registry", code="REG")
+    legal = Office.objects.create(name="Legal", code="LEG")
+    OfficeMembership.objects.create(office=registry, user=clerk, is_primary=True)
+    client = APIClient()
+    client.force_authenticate(clerk)
+    return client, clerk, approver, registry, legal
+
+
+def _counter(scope, scope_id):
+    counter = InboxCounter.objects.filter(scope=scope, scope_id=str(scope_id)).first()
+    return (counter.total, counter.open, counter.urgent, counter.overdue) if counter else (0, 0, 0, 0)
+
+
+def test_write_paths_keep_counters_in_step(setup):
+    client, clerk, approver, registry, legal = setup
+    received = (timezone.now().date() - timedelta(days=3)).isoformat()
+
+    created = client.post(
+        "/api/v1/correspondence/items/",
+        {"subject": "Berth request", "priority": "urgent", "received_date": received},
+        format="json",
+    )
+    item_id = created.data["id"]
+    assert _counter(InboxCounter.Scope.OFFICE, registry.pk) == (1, 1, 1, 1)
+
+    item = Correspondence.objects.get(pk=item_id)
+    item.current_office, item.current_approver = legal, approver
+    with InboxCounterService.tracking(item.pk):
+        item.save(update_fields=["current_office", "current_approver", "updated_at"])
+    # Owned by the registry, now sitting with legal and awaiting the approver.
+    assert _counter(InboxCounter.Scope.OFFICE, registry.pk) == (1, 1, 1, 1)
+    assert _counter(InboxCounter.Scope.OFFICE, legal.pk) == (1, 1, 1, 1)
+    assert _counter(InboxCounter.Scope.APPROVER, approver.pk) == (1, 1, 1, 1)
+
+    client.post(
+        "/api/v1/correspondence/minutes/",
+        {
+            "correspondence": item_id,
+            "user_id": str(clerk.pk),
+            "minute_text": "Back to registry",
+            "to_office_id": str(registry.pk),
+        },
+        format="json",
+    )
+    assert _counter(InboxCounter.Scope.OFFICE, legal.pk) == (0, 0, 0, 0)
+
+    client.patch(f"/api/v1/correspondence/items/{item_id}/", {"status": "archived"}, format="json")
+    assert _counter(InboxCounter.Scope.OFFICE, registry.pk) == (1, 0, 1, 1)
+
+    client.delete(f"/api/v1/correspondence/items/{item_id}/")
+    assert _counter(InboxCounter.Scope.OFFICE, registry.pk) == (0, 0, 0, 0)
+    assert _counter(InboxCounter.Scope.APPROVER, approver.pk) == (0, 0, 0, 0)
+
+
+def test_reconcile_rebuilds_drifted_counters_and_badges_read_them(setup, django_assert_max_num_queries):
+    client, clerk, _, registry, _ = setup
+    Correspondence.objects.create(subject="Imported", reference_number="OLD/1", owning_office=registry, current_approver=clerk)
+    InboxCounter.objects.create(scope=InboxCounter.Scope.OFFICE, scope_id="stale-office", total=4)
+
+    assert InboxCounterService.reconcile() == 3
+    assert not InboxCounter.objects.filter(scope_id="stale-office").exists()
+    assert InboxCounterService.reconcile() == 0
+
+    with django_assert_max_num_queries(3):
+        response = client.get("/api/v1/correspondence/items/inbox-counters/")
+    assert response.json()["offices"] == [{"office": str(registry.pk), "total": 1, "open": 1, "urgent": 0, "overdue": 0}]
+    assert response.json()["assigned_to_user"]["total"] == 1
+
+
+def test_reconcile_keeps_changes_committed_during_the_scan(setup, monkeypatch):
+    _, _, _, registry, _ = setup
+    Correspondence.objects.create(subject="Imported", reference_number="OLD/1", owning_office=registry)
+    snapshot = InboxCounterService._snapshot
+
+    def snapshot_then_register(batch_size):
+        scanned = snapshot(batch_size)
+        with InboxCounterService.tracking() as tracked:
+            item = Correspondence.objects.create(subject="New", reference_number="NEW/1", owning_office=registry)
+            tracked.append(item.pk)
+        return scanned
+
+    monkeypatch.setattr(InboxCounterService, "_snapshot", snapshot_then_register)
+
+    assert InboxCounterService.reconcile() == 1
+    assert _counter(InboxCounter.Scope.OFFICE, registry.pk) == (2, 2, 0, 0)
@@ -0,0 +1,90 @@
+"""Tests for the counter-backed correspondence reference allocator."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from correspondence.models import Correspondence, ReferenceCounter
+from correspondence.services import ReferenceNumberService
+from organization.models import Office, OfficeMembership
+
+
+@pytest.fixture()
+def registry(db):
+    return Office.objects.create(name="Central Registry", code="reg-hq", office_type=Office.OfficeTier.REGISTRY)
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_counters_are_per_office_year_and_series(registry, settings):
+    settings.CORRESPONDENCE_REFERENCE_SERIES = {
+        "REG": "NPA/{series}/{office}/{year}/{number:05d}",
+        "OUT": "{series}-{number}",
+    }
+    year = timezone.localdate().year
+    other = Office.objects.create(name="Legal", code="LEG")
+
+    assert ReferenceNumberService.allocate(registry) == f"NPA/REG/REG-HQ/{year}/00001"
+    assert ReferenceNumberService.allocate(registry) == f"NPA/REG/REG-HQ/{year}/00002"
+    assert ReferenceNumberService.allocate(other) == f"NPA/REG/LEG/{year}/00001"
+    assert ReferenceNumberService.allocate(registry, series="OUT") == "OUT-1"
+    assert ReferenceNumberService.reserve(registry, count=2, year=year - 1)[-1] == f"NPA/REG/REG-HQ/{year - 1}/00002"
+    assert ReferenceCounter.objects.get(scope=str(registry.pk), year=year, series="REG").last_value == 2
+
+
+def test_numbers_already_in_use_are_skipped(registry):
+    taken = ReferenceNumberService.format(registry, "REG", timezone.localdate().year, 2)
+    Correspondence.objects.create(subject="Typed in by hand", reference_number=taken)
+
+    references = ReferenceNumberService.reserve(registry, count=3)
+
+    assert taken not in references
+    assert [reference[-5:] for reference in references] == ["00001", "00003", "00004"]
+
+
+def test_create_allocates_and_reserve_hands_out_a_block(registry):
+    clerk = User.objects.create(username="clerk")
+    OfficeMembership.objects.create(office=registry, user=clerk, is_primary=True, can_register=True)
+    client = _client(clerk)
+
+    created = client.post("/api/v1/correspondence/items/", {"subject": "Berth request"}, format="json")
+    reserved = client.post("/api/v1/correspondence/items/reserve-references/", {"count": 3}, format="json")
+
+    assert created.status_code == 201
+    assert created.data["reference_number"].endswith("/00001")
+    assert reserved.status_code == 201
+    assert [reference[-5:] for reference in reserved.data["reference_numbers"]] == ["00002", "00003", "00004"]
+
+    outsider = User.objects.create(username="outsider")
+    denied = _client(outsider).post(
+        "/api/v1/correspondence/items/reserve-references/",
+        {"count": 1, "office": str(registry.pk)},
+        format="json",
+    )
+    assert denied.status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_allocations_never_collide():
+    office = Office.objects.create(name="Registry", code="REG")
+
+    def allocate(_):
+        try:
+            return [ReferenceNumberService.allocate(office) for _ in range(5)]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        references = [reference for batch in pool.map(allocate, range(6)) for reference in batch]
+
+    assert len(set(references)) == 30
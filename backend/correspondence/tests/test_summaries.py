@@ -0,0 +1,73 @@
+"""Tests for the single-query inbox and records summaries."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from correspondence.models import Correspondence
+from correspondence.services import CorrespondenceSummaryService
+from organization.models import Office, OfficeMembership
+
+
+@pytest.fixture()
+def office_user(db):
+    user = User.objects.create(username="gm-secretary")
+    office = Office.objects.create(name="General Manager", code="GM")
+    OfficeMembership.objects.create(office=office, user=user, is_primary=True)
+    return office, user
+
+
+def _item(office, subject, **fields):
+    return Correspondence.objects.create(
+        subject=subject,
+        reference_number=f"REF/{subject}",
+        owning_office=office,
+        current_office=office,
+        **fields,
+    )
+
+
+def test_inbox_summary_is_one_query(office_user, django_assert_num_queries):
+    office, user = office_user
+    today = timezone.now().date()
+    _item(office, "late", priority=Correspondence.Priority.URGENT, received_date=today - timedelta(days=3))
+    _item(office, "fresh", priority=Correspondence.Priority.URGENT, received_date=today, current_approver=user)
+    _item(office, "done", status=Correspondence.Status.COMPLETED, received_date=today - timedelta(days=30))
+
+    with django_assert_num_queries(1):
+        summary = CorrespondenceSummaryService.inbox(Correspondence.objects.all(), user)
+
+    assert summary == {"total": 3, "urgent": 2, "overdue": 1, "assigned_to_user": 1}
+
+    response = APIClient()
+    response.force_authenticate(user)
+    body = response.get("/api/v1/correspondence/items/office-inbox/").json()
+    assert body["summary"] == summary
+
+
+def test_records_summaries_collect_years_in_the_same_pass(office_user, django_assert_num_queries):
+    office, _ = office_user
+    current_year = timezone.now().year
+    _item(office, "a", direction=Correspondence.Direction.UPWARD, received_date=date(current_year, 1, 5))
+    _item(office, "b", direction=Correspondence.Direction.DOWNWARD, received_date=date(2019, 3, 1))
+    _item(office, "c", status=Correspondence.Status.ARCHIVED, received_date=date(2019, 6, 1))
+    _item(office, "d")
+
+    with django_assert_num_queries(1):
+        archive = CorrespondenceSummaryService.archive(Correspondence.objects.all())
+    assert archive == {
+        "total": 4,
+        "downward": 1,
+        "upward": 3,
+        "this_year": 1,
+        "available_years": [current_year, 2019],
+    }
+
+    department = CorrespondenceSummaryService.department(Correspondence.objects.all(), [office.id])
+    assert (department["archived"], department["office_owned"]) == (1, 4)
+    assert CorrespondenceSummaryService.department(Correspondence.objects.none(), [])["office_owned"] == 0
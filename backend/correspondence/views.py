@@ -3,23 +3,28 @@
 from __future__ import annotations
 
 import logging
-import os
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-from datetime import timedelta, datetime
+from datetime import datetime
 
-from django.db.models import Prefetch, Q
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from common.upload_validators import validate_file_upload
 from rest_framework import filters, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
 from audit.services import AuditService
+from common.downloads import is_range_continuation, protected_file_response
+from common.filters import TagFilter, facet_limit
+from common.models import ExportJob
+from common.pagination import KeysetPagination, KeysetPaginationMixin, use_keyset_pagination
+from common.services import BlobStorageService, TagFacetService
+from common.storage import storage_path_from_url
+from common.views import export_response, preview_response
 from notifications.models import Notification
 from notifications.services import NotificationService
 from rest_framework.permissions import IsAuthenticated
@@ -27,7 +32,8 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 
 from organization.models import Office, OfficeMembership
-from dms.models import DocumentVersion
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentVisibilityService
 
 from .models import (
     Correspondence,
@@ -35,17 +41,28 @@ from .models import (
     CorrespondenceDistribution,
     CorrespondenceDocumentLink,
     Delegation,
+    InboxCounter,
     Minute,
 )
 from .serializers import (
     CorrespondenceAttachmentSerializer,
     CorrespondenceDistributionSerializer,
     CorrespondenceDocumentLinkSerializer,
+    CorrespondenceListSerializer,
     CorrespondenceSerializer,
     DelegationSerializer,
     MinuteSerializer,
+    ReferenceReservationSerializer,
+)
+from .services import (
+    CompletionPackageService,
+    CorrespondenceAccessService,
+    CorrespondenceDuplicateService,
+    CorrespondenceSearchService,
+    CorrespondenceSummaryService,
+    InboxCounterService,
+    ReferenceNumberService,
 )
-from .services import CompletionPackageService
 
 
 logger = logging.getLogger(__name__)
@@ -58,7 +75,18 @@ class OfficeInboxPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class CorrespondenceViewSet(viewsets.ModelViewSet):
+class OfficeInboxCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+def get_inbox_paginator(request):
+    """Page-number pagination by default; keyset pagination with ``?pagination=cursor``."""
+    if use_keyset_pagination(request):
+        return OfficeInboxCursorPagination()
+    return OfficeInboxPagination()
+
+
+class CorrespondenceViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     queryset = Correspondence.objects.none()
     base_queryset = Correspondence.all_objects.select_related(
         "division",
@@ -88,9 +116,10 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
     )
     serializer_class = CorrespondenceSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
+    pagination_class = OfficeInboxPagination
+    keyset_pagination_class = OfficeInboxCursorPagination
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TagFilter, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = [
         "status",
         "priority",
@@ -105,8 +134,73 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "updated_at", "received_date"]
     ordering = ["-created_at"]
 
+    def use_list_representation(self) -> bool:
+        """Lists are paginated compact rows unless ``include_timeline=true`` asks for the full objects."""
+        request = getattr(self, "request", None)
+        if self.action != "list" or request is None:
+            return False
+        return request.query_params.get("include_timeline") != "true"
+
+    @property
+    def paginator(self):
+        # The full representation keeps its historical unpaginated shape.
+        if self.action == "list" and not self.use_list_representation():
+            return None
+        return super().paginator
+
+    def get_serializer_class(self):
+        if self.use_list_representation():
+            return CorrespondenceListSerializer
+        return super().get_serializer_class()
+
+    def get_list_queryset(self):
+        """Only the columns list rows show; minutes and attachments are counted, never loaded."""
+        minutes_count = (
+            Minute.objects.filter(correspondence=OuterRef("pk"))
+            .order_by()
+            .values("correspondence")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        attachments_count = (
+            CorrespondenceAttachment.objects.filter(correspondence=OuterRef("pk"))
+            .order_by()
+            .values("correspondence")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return (
+            Correspondence.all_objects.select_related("owning_office", "current_office", "current_approver")
+            .only(
+                "id",
+                "reference_number",
+                "subject",
+                "source",
+                "status",
+                "priority",
+                "document_type",
+                "direction",
+                "received_date",
+                "sender_name",
+                "tags",
+                "is_deleted",
+                "completed_at",
+                "created_at",
+                "updated_at",
+                "owning_office__name",
+                "current_office__name",
+                "current_approver__username",
+                "current_approver__first_name",
+                "current_approver__last_name",
+            )
+            .annotate(
+                minutes_count=Coalesce(Subquery(minutes_count), 0),
+                attachments_count=Coalesce(Subquery(attachments_count), 0),
+            )
+        )
+
     def get_queryset(self):
-        qs = self.base_queryset
+        qs = self.get_list_queryset() if self.use_list_representation() else self.base_queryset
         request = getattr(self, 'request', None)
         if request:
             only_deleted = request.query_params.get('only_deleted') == 'true'
@@ -131,24 +225,27 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
         creator = validated_data.get("created_by") or request.user
         priority = validated_data.get("priority") or Correspondence.Priority.MEDIUM
 
+        owning_office = validated_data.get("owning_office") or self._get_user_primary_office(request.user)
+        current_office = validated_data.get("current_office") or owning_office
+        reference_series = validated_data.pop("reference_series", None)
+
         if not validated_data.get("reference_number"):
-            count = Correspondence.all_objects.count() + 1
-            reference_number = f"NPA/REG/{request.user.username.upper()}/{count:04d}"
+            reference_number = ReferenceNumberService.allocate(owning_office, series=reference_series)
         else:
             reference_number = validated_data["reference_number"]
 
         # Create the correspondence instance
-        owning_office = validated_data.get("owning_office") or self._get_user_primary_office(request.user)
-        current_office = validated_data.get("current_office") or owning_office
 
-        correspondence = serializer.save(
-            created_by=creator,
-            priority=priority,
-            reference_number=reference_number,
-            owning_office=owning_office,
-            current_office=current_office,
-        )
-        self._sync_completed_timestamp(correspondence, None)
+        with InboxCounterService.tracking() as tracked:
+            correspondence = serializer.save(
+                created_by=creator,
+                priority=priority,
+                reference_number=reference_number,
+                owning_office=owning_office,
+                current_office=current_office,
+            )
+            tracked.append(correspondence.pk)
+            self._sync_completed_timestamp(correspondence, None)
         
         # Create audit log
         from audit.models import ActivityLog
@@ -162,15 +259,7 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
 
         # Handle file uploads
         if attachments:
-            # Ensure media directory exists
-            media_root = settings.MEDIA_ROOT
-            attachments_dir = os.path.join(media_root, 'correspondence_attachments', str(correspondence.id))
-            os.makedirs(attachments_dir, exist_ok=True)
-            
             for file in attachments:
-                # Generate file path
-                file_path = os.path.join('correspondence_attachments', str(correspondence.id), file.name)
-
                 # Validate the upload before persisting
                 if hasattr(file, 'seek'):
                     file.seek(0)
@@ -181,36 +270,49 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
                     file_bytes=file_bytes,
                     field_name='attachments',
                 )
-                file_size = len(file_bytes)
-                if hasattr(file, 'seek'):
-                    file.seek(0)
+                file_type = getattr(file, 'content_type', None) or 'application/octet-stream'
 
-                # Save file to storage
-                saved_path = default_storage.save(file_path, file)
+                # Identical files across correspondence share a single stored blob
+                blob = BlobStorageService.store_bytes(
+                    file_bytes,
+                    file_name=file.name,
+                    content_type=file_type,
+                )
 
                 # Build full URL for the file
                 # Use request.build_absolute_uri for proper URL construction
                 try:
-                    file_url = request.build_absolute_uri(settings.MEDIA_URL + saved_path)
+                    file_url = request.build_absolute_uri(settings.MEDIA_URL + blob.storage_path)
                 except Exception:
                     # Fallback if build_absolute_uri fails
                     request_scheme = getattr(request, 'scheme', 'http')
                     request_host = request.get_host() if hasattr(request, 'get_host') else 'localhost:8000'
-                    file_url = f"{request_scheme}://{request_host}{settings.MEDIA_URL}{saved_path}"
+                    file_url = f"{request_scheme}://{request_host}{settings.MEDIA_URL}{blob.storage_path}"
                 
                 # Create attachment record
-                CorrespondenceAttachment.objects.create(
-                    correspondence=correspondence,
-                    file_name=file.name,
-                    file_type=getattr(file, 'content_type', None) or 'application/octet-stream',
-                    file_size=file_size,
-                    file_url=file_url,
-                )
+                try:
+                    CorrespondenceAttachment.objects.create(
+                        correspondence=correspondence,
+                        file_name=file.name,
+                        file_type=file_type,
+                        file_size=blob.size,
+                        file_url=file_url,
+                        blob=blob,
+                    )
+                except Exception:
+                    BlobStorageService.release(blob.pk)
+                    raise
+
+        CorrespondenceDuplicateService.index(correspondence)
 
         # Return the created correspondence with attachments
         output_serializer = self.get_serializer(correspondence)
         headers = self.get_success_headers(output_serializer.data)
-        return Response(output_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        payload = {
+            **output_serializer.data,
+            "probable_duplicates": CorrespondenceDuplicateService.probable_duplicates(correspondence),
+        }
+        return Response(payload, status=status.HTTP_201_CREATED, headers=headers)
 
 
     def perform_update(self, serializer):
@@ -218,8 +320,11 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
         previous_status = instance.status
         if previous_status == Correspondence.Status.COMPLETED:
             raise ValidationError({"detail": "Completed correspondence is read-only."})
-        correspondence = serializer.save()
-        self._sync_completed_timestamp(correspondence, previous_status)
+        with InboxCounterService.tracking(instance.pk):
+            correspondence = serializer.save()
+            self._sync_completed_timestamp(correspondence, previous_status)
+        if {"subject", "summary", "body_html"} & set(serializer.validated_data):
+            CorrespondenceDuplicateService.index(correspondence)
         if (
             correspondence.status == Correspondence.Status.COMPLETED
             and previous_status != Correspondence.Status.COMPLETED
@@ -232,6 +337,10 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
                     correspondence.id,
                 )
 
+    def perform_destroy(self, instance):
+        with InboxCounterService.tracking(instance.pk):
+            instance.delete()
+
     def _sync_completed_timestamp(self, correspondence, previous_status):
         if correspondence.status == Correspondence.Status.COMPLETED:
             if not correspondence.completed_at:
@@ -292,7 +401,8 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
             correspondence.status = Correspondence.Status.IN_PROGRESS
             updates.add("status")
 
-        correspondence.save(update_fields=list(updates) + ["updated_at"])
+        with InboxCounterService.tracking(correspondence.pk):
+            correspondence.save(update_fields=list(updates) + ["updated_at"])
 
         from audit.models import ActivityLog
 
@@ -353,6 +463,88 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(correspondence)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def duplicates(self, request, pk=None):
+        """Other correspondence with the same attachments or near-identical text."""
+        correspondence = self.get_object()
+        return Response({"results": CorrespondenceDuplicateService.probable_duplicates(correspondence)})
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        """ZIP package of the letter, attachments, minutes and completion package.
+
+        Packages too large to stream are built in the background (``202 Accepted``).
+        """
+        correspondence = self.get_object()
+        # The completion package is a DMS document with its own permissions.
+        include_package = correspondence.completion_package_id is not None and (
+            DocumentVisibilityService.visible_to(
+                Document.objects.filter(pk=correspondence.completion_package_id), request.user
+            ).exists()
+        )
+        response = export_response(
+            request,
+            ExportJob.Kind.CORRESPONDENCE,
+            {"correspondence_id": str(correspondence.id), "include_completion_package": include_package},
+        )
+        from audit.models import ActivityLog
+        AuditService.log_correspondence_activity(
+            user=request.user,
+            action=ActivityLog.ActionType.CORRESPONDENCE_EXPORTED,
+            correspondence=correspondence,
+            request=request,
+            description="Exported correspondence package",
+            metadata={"include_completion_package": include_package},
+        )
+        return response
+
+    @action(detail=False, methods=["post"], url_path="reserve-references")
+    def reserve_references(self, request):
+        """Reserve a block of reference numbers for bulk registry intake.
+
+        Numbers come from the same counter as regular registrations and are
+        never handed out again, whether or not they end up being used.
+        """
+        serializer = ReferenceReservationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        office = serializer.validated_data.get("office") or self._get_user_primary_office(request.user)
+        if office is None:
+            raise ValidationError({"office": "Select the registry office to reserve reference numbers for."})
+        can_register = OfficeMembership.objects.filter(
+            user=request.user, office=office, is_active=True, can_register=True
+        ).exists()
+        if not (can_register or getattr(request.user, "is_superuser", False)):
+            raise PermissionDenied("You cannot register correspondence for this office.")
+        references = ReferenceNumberService.reserve(
+            office,
+            count=serializer.validated_data["count"],
+            series=serializer.validated_data.get("series"),
+        )
+        return Response(
+            {"office": str(office.id), "reference_numbers": references},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["get"], url_path="inbox-counters")
+    def inbox_counters(self, request):
+        """Badge counts for the user's offices and for items awaiting the user, read from ``InboxCounter``."""
+        office_ids = [str(office_id) for office_id in self._get_user_office_ids(request.user)]
+        empty = dict.fromkeys(InboxCounterService.BUCKETS, 0)
+        offices = InboxCounterService.counts(InboxCounter.Scope.OFFICE, office_ids)
+        approver = InboxCounterService.counts(InboxCounter.Scope.APPROVER, [request.user.pk])
+        return Response(
+            {
+                "offices": [{"office": office_id, **offices.get(office_id, empty)} for office_id in office_ids],
+                "assigned_to_user": approver.get(str(request.user.pk), empty),
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="tag-facets")
+    def tag_facets(self, request):
+        """Tag -> correspondence count over the filtered list."""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response({"results": TagFacetService.counts(queryset, limit=facet_limit(request))})
+
     @action(detail=False, methods=["get"], url_path="office-inbox")
     def office_inbox(self, request):
         user = request.user
@@ -401,39 +593,17 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
         if assigned_only:
             queryset = queryset.filter(current_approver=user)
 
-        search_term = request.query_params.get("search")
+        search_term = request.query_params.get("search", "").strip()
         if search_term:
-            queryset = queryset.filter(
-                Q(reference_number__icontains=search_term)
-                | Q(subject__icontains=search_term)
-                | Q(sender_name__icontains=search_term)
-                | Q(sender_organization__icontains=search_term)
-            )
-
-        total_count = queryset.count()
-        urgent_count = queryset.filter(priority=Correspondence.Priority.URGENT).count()
+            # Keyset pages keep their own ordering; numbered pages rank best matches first.
+            queryset = CorrespondenceSearchService.search(queryset, search_term).order_by("-search_rank", "-created_at")
 
-        today = timezone.now().date()
-        overdue_filter = (
-            Q(priority=Correspondence.Priority.URGENT, received_date__lt=today - timedelta(days=2))
-            | Q(priority=Correspondence.Priority.HIGH, received_date__lt=today - timedelta(days=5))
-            | Q(priority=Correspondence.Priority.MEDIUM, received_date__lt=today - timedelta(days=10))
-            | Q(priority=Correspondence.Priority.LOW, received_date__lt=today - timedelta(days=14))
-        ) & ~Q(status=Correspondence.Status.COMPLETED)
+        summary = CorrespondenceSummaryService.inbox(queryset, user)
 
-        overdue_count = queryset.filter(overdue_filter).count()
-        assigned_count = queryset.filter(current_approver=user).count()
-
-        paginator = OfficeInboxPagination()
+        paginator = get_inbox_paginator(request)
         page = paginator.paginate_queryset(queryset, request)
         serializer = self.get_serializer(page, many=True)
         response = paginator.get_paginated_response(serializer.data)
-        summary = {
-            "total": total_count,
-            "urgent": urgent_count,
-            "overdue": overdue_count,
-            "assigned_to_user": assigned_count,
-        }
         response.data["summary"] = summary
         return response
 
@@ -468,14 +638,9 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
                 )
             base_queryset = base_queryset.filter(archive_level=archive_level)
 
-        search_term = request.query_params.get("search")
+        search_term = request.query_params.get("search", "").strip()
         if search_term:
-            base_queryset = base_queryset.filter(
-                Q(reference_number__icontains=search_term)
-                | Q(subject__icontains=search_term)
-                | Q(sender_name__icontains=search_term)
-                | Q(sender_organization__icontains=search_term)
-            )
+            base_queryset = CorrespondenceSearchService.search(base_queryset, search_term)
 
         priority = request.query_params.get("priority")
         if priority in dict(Correspondence.Priority.choices):
@@ -516,29 +681,16 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
         else:
             queryset = base_queryset
 
-        available_years = (
-            summary_queryset.filter(received_date__isnull=False)
-            .values_list("received_date__year", flat=True)
-            .distinct()
-        )
+        summary = CorrespondenceSummaryService.archive(summary_queryset)
 
-        total_count = summary_queryset.count()
-        downward_count = summary_queryset.filter(direction=Correspondence.Direction.DOWNWARD).count()
-        upward_count = summary_queryset.filter(direction=Correspondence.Direction.UPWARD).count()
-        current_year = timezone.now().year
-        this_year_count = summary_queryset.filter(received_date__year=current_year).count()
-
-        paginator = OfficeInboxPagination()
-        page = paginator.paginate_queryset(queryset.order_by("-received_date"), request)
+        paginator = get_inbox_paginator(request)
+        ordering = ("-received_date",)
+        if search_term:
+            ordering = ("-search_rank", *ordering)
+        page = paginator.paginate_queryset(queryset.order_by(*ordering), request)
         serializer = self.get_serializer(page, many=True)
         response = paginator.get_paginated_response(serializer.data)
-        response.data["summary"] = {
-            "total": total_count,
-            "downward": downward_count,
-            "upward": upward_count,
-            "this_year": this_year_count,
-            "available_years": sorted(available_years, reverse=True),
-        }
+        response.data["summary"] = summary
         return response
 
     @action(detail=False, methods=["get"], url_path="department-records")
@@ -562,14 +714,9 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
                 }
             )
 
-        search_term = request.query_params.get("search")
+        search_term = request.query_params.get("search", "").strip()
         if search_term:
-            base_queryset = base_queryset.filter(
-                Q(reference_number__icontains=search_term)
-                | Q(subject__icontains=search_term)
-                | Q(sender_name__icontains=search_term)
-                | Q(sender_organization__icontains=search_term)
-            )
+            base_queryset = CorrespondenceSearchService.search(base_queryset, search_term)
 
         priority = request.query_params.get("priority")
         if priority in dict(Correspondence.Priority.choices):
@@ -604,33 +751,16 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
         if to_date:
             base_queryset = base_queryset.filter(received_date__lte=to_date)
 
-        user_office_ids = set(self._get_user_office_ids(user))
-        available_years = (
-            base_queryset.filter(received_date__isnull=False)
-            .values_list("received_date__year", flat=True)
-            .distinct()
-        )
-
-        total_count = base_queryset.count()
-        completed_count = base_queryset.filter(status=Correspondence.Status.COMPLETED).count()
-        archived_count = base_queryset.filter(status=Correspondence.Status.ARCHIVED).count()
-        office_owned_count = (
-            base_queryset.filter(owning_office_id__in=user_office_ids).count()
-            if user_office_ids
-            else 0
-        )
+        summary = CorrespondenceSummaryService.department(base_queryset, self._get_user_office_ids(user))
 
         paginator = OfficeInboxPagination()
-        page = paginator.paginate_queryset(base_queryset.order_by("-completed_at", "-updated_at"), request)
+        ordering = ("-completed_at", "-updated_at")
+        if search_term:
+            ordering = ("-search_rank", *ordering)
+        page = paginator.paginate_queryset(base_queryset.order_by(*ordering), request)
         serializer = self.get_serializer(page, many=True)
         response = paginator.get_paginated_response(serializer.data)
-        response.data["summary"] = {
-            "total": total_count,
-            "completed": completed_count,
-            "archived": archived_count,
-            "office_owned": office_owned_count,
-            "available_years": sorted(available_years, reverse=True),
-        }
+        response.data["summary"] = summary
         return response
 
     def _get_office_or_400(self, office_id: str):
@@ -769,7 +899,7 @@ class CorrespondenceViewSet(viewsets.ModelViewSet):
             return None
 
 class CorrespondenceAttachmentViewSet(viewsets.ModelViewSet):
-    queryset = CorrespondenceAttachment.objects.select_related("correspondence")
+    queryset = CorrespondenceAttachment.objects.select_related("correspondence", "blob")
     serializer_class = CorrespondenceAttachmentSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = None
@@ -777,6 +907,46 @@ class CorrespondenceAttachmentViewSet(viewsets.ModelViewSet):
     filterset_fields = ["correspondence"]
     ordering_fields = ["created_at"]
 
+    def get_queryset(self):
+        visible = CorrespondenceAccessService.visible_to(Correspondence.objects.all(), self.request.user)
+        return super().get_queryset().filter(correspondence__in=visible)
+
+    def perform_destroy(self, instance):
+        blob_id = instance.blob_id
+        instance.delete()
+        BlobStorageService.release(blob_id)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Authorized file delivery; pass ``?inline=true`` to view in the browser instead of downloading."""
+        attachment = self.get_object()
+
+        inline = request.query_params.get("inline") == "true"
+        response = protected_file_response(
+            request,
+            attachment.blob.storage_path if attachment.blob_id else storage_path_from_url(attachment.file_url),
+            file_name=attachment.file_name,
+            content_type=attachment.file_type,
+            etag=attachment.blob.sha256 if attachment.blob_id else f"{attachment.id}-{attachment.file_size}",
+            inline=inline,
+        )
+        if response.status_code in (200, 206) and not is_range_continuation(request):
+            from audit.models import ActivityLog
+            AuditService.log_correspondence_activity(
+                user=request.user,
+                action=ActivityLog.ActionType.CORRESPONDENCE_ATTACHMENT_DOWNLOADED,
+                correspondence=attachment.correspondence,
+                request=request,
+                description=f"{'Viewed' if inline else 'Downloaded'} attachment: {attachment.file_name}",
+                metadata={"attachment_id": str(attachment.id)},
+            )
+        return response
+
+    @action(detail=True, methods=["get"])
+    def preview(self, request, pk=None):
+        """First-page thumbnail (``?size=small|medium|large``, ``?image_format=webp|png``)."""
+        return preview_response(request, self.get_object().blob)
+
 
 class CorrespondenceDistributionViewSet(viewsets.ModelViewSet):
     queryset = CorrespondenceDistribution.objects.select_related(
@@ -823,8 +993,9 @@ class MinuteViewSet(viewsets.ModelViewSet):
         minute = serializer.save(user=self.request.user, from_office=current_office)
         correspondence = minute.correspondence
         if minute.to_office and minute.to_office_id != (current_office.id if current_office else None):
-            correspondence.current_office = minute.to_office
-            correspondence.save(update_fields=["current_office", "updated_at"])
+            with InboxCounterService.tracking(correspondence.pk):
+                correspondence.current_office = minute.to_office
+                correspondence.save(update_fields=["current_office", "updated_at"])
         
         # Create audit log
         from audit.models import ActivityLog
@@ -9,6 +9,7 @@ from .models import (
     DocumentDiscussionMessage,
     DocumentEditorSession,
     DocumentPermission,
+    DocumentUploadSession,
     DocumentVersion,
     DocumentWorkspace,
 )
@@ -78,3 +79,10 @@ class DocumentAccessLogAdmin(admin.ModelAdmin):
 class DocumentEditorSessionAdmin(admin.ModelAdmin):
     list_display = ("document", "user", "since", "is_active")
     list_filter = ("is_active",)
+
+
+@admin.register(DocumentUploadSession)
+class DocumentUploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "document", "created_by", "status", "total_size", "expires_at")
+    list_filter = ("status",)
+    search_fields = ("file_name", "document__title")
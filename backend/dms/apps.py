@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DmsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dms'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - connects the index refresh receivers
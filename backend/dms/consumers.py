@@ -0,0 +1,78 @@
+"""WebSocket consumer for document editor presence."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from accounts.serializers import UserSerializer
+
+from .models import Document
+from .services import DocumentVisibilityService, EditorPresenceService
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentPresenceConsumer(AsyncWebsocketConsumer):
+    """Streams ``editor_joined``/``editor_left`` events for one document.
+
+    Clients may also send ``{"type": "heartbeat"}`` here instead of re-posting
+    to ``/dms/editor-sessions/``.
+    """
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        self.document_id = str(self.scope["url_route"]["kwargs"]["document_id"])
+
+        if not self.user or self.user.is_anonymous or not await self.can_view_document():
+            await self.close()
+            return
+
+        self.group_name = EditorPresenceService.group_name(self.document_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send(text_data=json.dumps({
+            "type": "presence",
+            "sessions": await database_sync_to_async(EditorPresenceService.active)(self.document_id),
+        }))
+
+    async def disconnect(self, close_code):
+        # Presence lapses with the heartbeat TTL; another tab may still hold the session.
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data):
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON received from presence WebSocket")
+            return
+
+        message_type = data.get("type")
+        if message_type == "ping":
+            await self.send(text_data=json.dumps({"type": "pong"}))
+        elif message_type == "heartbeat":
+            await self.heartbeat(data.get("note"))
+
+    async def editor_joined(self, event):
+        await self.send(text_data=json.dumps({"type": "editor_joined", "session": event["session"]}))
+
+    async def editor_left(self, event):
+        await self.send(text_data=json.dumps({
+            "type": "editor_left",
+            "session": event["session"],
+            "reason": event.get("reason", "left"),
+        }))
+
+    @database_sync_to_async
+    def can_view_document(self) -> bool:
+        return DocumentVisibilityService.visible_to(Document.objects.filter(pk=self.document_id), self.user).exists()
+
+    @database_sync_to_async
+    def heartbeat(self, note):
+        session_id = EditorPresenceService.session_id(self.document_id, self.user.pk)
+        user_payload = None if EditorPresenceService.get(session_id) else UserSerializer(self.user).data
+        EditorPresenceService.heartbeat(self.document_id, self.user, note=note, user_payload=user_payload)
@@ -0,0 +1,108 @@
+"""Compact text deltas for rich-text document versions.
+
+A delta rebuilds a *target* string from a *base* string as a list of
+operations: ``[start, length]`` copies a slice of the base and a plain string
+is inserted as-is. Strings are compared on word/tag tokens after trimming the
+common prefix and suffix, so a small edit to a long memo yields a delta of a
+few hundred bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from difflib import SequenceMatcher
+
+TOKEN_PATTERN = re.compile(r"<[^>]*>|\s+|\w+|[^\w\s]", re.UNICODE)
+LINE_PATTERN = re.compile(r"\r?\n")
+
+
+def canonical_json(value) -> str:
+    """Stable text form of a JSON value, used as the delta input for ``content_json``."""
+
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode(base: str, target: str) -> list:
+    """Operations that turn ``base`` into ``target``."""
+
+    prefix = _common_prefix(base, target)
+    suffix = _common_suffix(base[prefix:], target[prefix:])
+    base_middle = base[prefix : len(base) - suffix]
+    target_middle = target[prefix : len(target) - suffix]
+
+    ops: list = []
+    if prefix:
+        ops.append([0, prefix])
+    if base_middle and target_middle:
+        base_tokens = TOKEN_PATTERN.findall(base_middle)
+        target_tokens = TOKEN_PATTERN.findall(target_middle)
+        offsets = [prefix]
+        for token in base_tokens:
+            offsets.append(offsets[-1] + len(token))
+        matcher = SequenceMatcher(None, base_tokens, target_tokens, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                _append(ops, [offsets[i1], offsets[i2] - offsets[i1]])
+            elif j2 > j1:
+                _append(ops, "".join(target_tokens[j1:j2]))
+    elif target_middle:
+        _append(ops, target_middle)
+    if suffix:
+        _append(ops, [len(base) - suffix, suffix])
+    return ops
+
+
+def apply(base: str, ops: list) -> str:
+    """Rebuild the target string from ``base`` and the operations from :func:`encode`."""
+
+    return "".join(base[op[0] : op[0] + op[1]] if isinstance(op, list) else op for op in ops)
+
+
+def line_diff(baseline: str, target: str) -> list[dict]:
+    """Line-by-line changes in the ``{"type", "value"}`` shape the compare view renders."""
+
+    old_lines = LINE_PATTERN.split(baseline or "")
+    new_lines = LINE_PATTERN.split(target or "")
+    changes = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            changes.extend({"type": "unchanged", "value": line} for line in old_lines[i1:i2])
+            continue
+        changes.extend({"type": "removed", "value": line} for line in old_lines[i1:i2])
+        changes.extend({"type": "added", "value": line} for line in new_lines[j1:j2])
+    return changes
+
+
+def _append(ops: list, op) -> None:
+    # Merge neighbouring inserts and contiguous copies to keep the delta short.
+    if ops and isinstance(op, str) and isinstance(ops[-1], str):
+        ops[-1] += op
+    elif ops and isinstance(op, list) and isinstance(ops[-1], list) and ops[-1][0] + ops[-1][1] == op[0]:
+        ops[-1][1] += op[1]
+    else:
+        ops.append(op)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    # Binary search on slice equality keeps the comparison in C for long bodies.
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str) -> int:
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle :] == b[len(b) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
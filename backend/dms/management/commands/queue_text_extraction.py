@@ -0,0 +1,29 @@
+"""Queue background text extraction for document versions."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from dms.models import DocumentVersion
+from dms.tasks import extract_version_text
+
+
+class Command(BaseCommand):
+    help = "Queue text extraction/OCR for versions that have not been processed yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--status",
+            action="append",
+            choices=[choice for choice, _ in DocumentVersion.ExtractionStatus.choices],
+            help="Extraction status to (re)queue; may be repeated (default: pending)",
+        )
+
+    def handle(self, *args, **options):
+        statuses = options.get("status") or [DocumentVersion.ExtractionStatus.PENDING]
+        version_ids = DocumentVersion.objects.filter(extraction_status__in=statuses).values_list("id", flat=True)
+        queued = 0
+        for version_id in version_ids.iterator():
+            extract_version_text.delay(str(version_id))
+            queued += 1
+        self.stdout.write(self.style.SUCCESS(f"Queued text extraction for {queued} version(s)"))
@@ -0,0 +1,28 @@
+"""Rebuild the weighted full-text search vectors for DMS documents."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from dms.models import Document
+from dms.services import DocumentSearchService
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vector for documents in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of documents to refresh per UPDATE statement",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        document_ids = list(Document.all_objects.order_by("id").values_list("id", flat=True))
+        refreshed = 0
+        for start in range(0, len(document_ids), batch_size):
+            refreshed += DocumentSearchService.refresh(document_ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed search index for {refreshed} document(s)"))
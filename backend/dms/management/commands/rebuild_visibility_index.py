@@ -0,0 +1,15 @@
+"""Rebuild the precomputed document visibility index."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from dms.services import DocumentVisibilityService
+
+
+class Command(BaseCommand):
+    help = "Recompute DocumentVisibility grants for every document."
+
+    def handle(self, *args, **options):
+        processed = DocumentVisibilityService.refresh()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt visibility grants for {processed} document(s)"))
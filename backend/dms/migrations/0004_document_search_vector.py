@@ -0,0 +1,58 @@
+# Generated by Django 5.0.14 on 2026-10-18 11:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+BACKFILL_SEARCH_VECTOR = """
+UPDATE dms_document AS d
+SET search_vector =
+    setweight(to_tsvector('english', coalesce(d.title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(d.reference_number, '')), 'B')
+    || setweight(to_tsvector('english', coalesce(d.description, '') || ' ' || coalesce(d.tags::text, '')), 'C')
+    || setweight(
+        to_tsvector(
+            'english',
+            left(
+                coalesce(
+                    (
+                        SELECT string_agg(coalesce(v.content_text, '') || ' ' || coalesce(v.ocr_text, ''), ' ')
+                        FROM dms_documentversion AS v
+                        WHERE v.document_id = d.id
+                    ),
+                    ''
+                ),
+                500000
+            )
+        ),
+        'D'
+    );
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0003_document_is_deleted"),
+        ("organization", "0004_office_officemembership"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="dms_document_search_gin"
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTOR, reverse_sql=migrations.RunSQL.noop),
+    ]
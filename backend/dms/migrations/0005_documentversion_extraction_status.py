@@ -0,0 +1,38 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0004_document_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentversion",
+            name="extracted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="extraction_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="extraction_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                    ("skipped", "Skipped"),
+                ],
+                default="pending",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0001_storedblob"),
+        ("dms", "0006_documentuploadsession"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentversion",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="document_versions",
+                to="common.storedblob",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BACKFILL_VISIBILITY = """
+INSERT INTO dms_documentvisibility (document_id, principal_type, principal_id)
+SELECT id, 'user', author_id::text FROM dms_document WHERE author_id IS NOT NULL
+UNION
+SELECT document_id, 'workspace', documentworkspace_id::text FROM dms_document_workspaces
+UNION
+SELECT p.document_id, 'user', pu.user_id::text
+FROM dms_documentpermission AS p JOIN dms_documentpermission_users AS pu ON pu.documentpermission_id = p.id
+UNION
+SELECT p.document_id, 'division', pd.division_id::text
+FROM dms_documentpermission AS p JOIN dms_documentpermission_divisions AS pd ON pd.documentpermission_id = p.id
+UNION
+SELECT p.document_id, 'department', pd.department_id::text
+FROM dms_documentpermission AS p JOIN dms_documentpermission_departments AS pd ON pd.documentpermission_id = p.id
+UNION
+SELECT p.document_id, 'grade', grade.value
+FROM dms_documentpermission AS p, jsonb_array_elements_text(
+    CASE WHEN jsonb_typeof(p.grade_levels) = 'array' THEN p.grade_levels ELSE '[]'::jsonb END
+) AS grade(value)
+WHERE grade.value <> ''
+UNION
+SELECT id, 'all', '*' FROM dms_document WHERE sensitivity IN ('public', 'internal')
+UNION
+SELECT d.id, 'grade', grade.value
+FROM dms_document AS d, unnest(ARRAY['MSS5', 'MSS4', 'MSS3', 'MSS2', 'MSS1', 'EDCS', 'MDCS']) AS grade(value)
+WHERE d.sensitivity = 'confidential'
+UNION
+SELECT d.id, 'grade', grade.value
+FROM dms_document AS d, unnest(ARRAY['MSS1', 'EDCS', 'MDCS']) AS grade(value)
+WHERE d.sensitivity = 'restricted'
+ON CONFLICT DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0007_documentversion_blob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentVisibility",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "principal_type",
+                    models.CharField(
+                        choices=[
+                            ("all", "All users"),
+                            ("user", "User"),
+                            ("workspace", "Workspace"),
+                            ("division", "Division"),
+                            ("department", "Department"),
+                            ("grade", "Grade level"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("principal_id", models.CharField(max_length=64)),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="visibility_grants",
+                        to="dms.document",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Document visibility grant",
+                "verbose_name_plural": "Document visibility grants",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="documentvisibility",
+            constraint=models.UniqueConstraint(
+                fields=("principal_type", "principal_id", "document"),
+                name="dms_visibility_principal_document_uniq",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_VISIBILITY, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0008_documentvisibility"),
+        ("organization", "0004_office_officemembership"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["-updated_at", "-id"], name="dms_document_updated_id_idx"
+            ),
+        ),
+    ]
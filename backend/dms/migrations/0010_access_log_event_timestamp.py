@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0009_keyset_pagination_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="documentaccesslog",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
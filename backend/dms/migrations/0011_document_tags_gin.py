@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:24
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0010_access_log_event_timestamp"),
+        ("organization", "0004_office_officemembership"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags"],
+                name="dms_document_tags_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
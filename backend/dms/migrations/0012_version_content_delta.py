@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dms", "0011_document_tags_gin"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentversion",
+            name="content_base",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="delta_children",
+                to="dms.documentversion",
+            ),
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="content_delta",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
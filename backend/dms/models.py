@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 
 from common.models import SoftDeleteModel, TimeStampedModel, UUIDModel
 
@@ -78,9 +81,17 @@ class Document(UUIDModel, SoftDeleteModel, TimeStampedModel):
     )
     tags = models.JSONField(default=list, blank=True)
     workspaces = models.ManyToManyField(DocumentWorkspace, blank=True, related_name="documents")
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="dms_document_search_gin"),
+            # Tag containment filters and facets (``tags @> '["x"]'``).
+            GinIndex(fields=["tags"], name="dms_document_tags_gin", opclasses=["jsonb_path_ops"]),
+            # Keyset pagination for the document list.
+            models.Index(fields=["-updated_at", "-id"], name="dms_document_updated_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -89,16 +100,47 @@ class Document(UUIDModel, SoftDeleteModel, TimeStampedModel):
 class DocumentVersion(UUIDModel, TimeStampedModel):
     """Stored revision of document content or uploads."""
 
+    class ExtractionStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+        SKIPPED = "skipped", "Skipped"
+
     document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name="versions")
     version_number = models.PositiveIntegerField()
     file_name = models.CharField(max_length=255)
     file_type = models.CharField(max_length=100)
     file_size = models.BigIntegerField(help_text="Size in bytes")
     file_url = models.CharField(max_length=2000, blank=True)
+    blob = models.ForeignKey(
+        "common.StoredBlob",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="document_versions",
+    )
     content_html = models.TextField(blank=True)
     content_json = models.JSONField(blank=True, null=True)
     content_text = models.TextField(blank=True)
+    # Older rich-text revisions are stored as a delta against the next revision
+    # (see DocumentVersionDeltaService); the content columns are then empty.
+    content_base = models.ForeignKey(
+        "self",
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="delta_children",
+    )
+    content_delta = models.JSONField(blank=True, null=True)
     ocr_text = models.TextField(blank=True)
+    extraction_status = models.CharField(
+        max_length=16,
+        choices=ExtractionStatus.choices,
+        default=ExtractionStatus.PENDING,
+    )
+    extraction_error = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
     summary = models.TextField(blank=True)
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -109,6 +151,9 @@ class DocumentVersion(UUIDModel, TimeStampedModel):
     uploaded_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
+    # Large text columns that list views defer.
+    HEAVY_FIELDS = ("content_html", "content_json", "content_text", "content_delta", "ocr_text")
+
     class Meta:
         ordering = ["-uploaded_at"]
         unique_together = ("document", "version_number")
@@ -117,6 +162,56 @@ class DocumentVersion(UUIDModel, TimeStampedModel):
         return f"{self.document.title} v{self.version_number}"
 
 
+class DocumentUploadSession(UUIDModel, TimeStampedModel):
+    """Resumable, chunked upload that becomes a ``DocumentVersion`` once finalized."""
+
+    class Status(models.TextChoices):
+        OPEN = "open", "Open"
+        COMPLETED = "completed", "Completed"
+        ABORTED = "aborted", "Aborted"
+
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name="upload_sessions")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="document_upload_sessions",
+    )
+    file_name = models.CharField(max_length=255)
+    file_type = models.CharField(max_length=100, blank=True)
+    total_size = models.BigIntegerField(help_text="Declared size in bytes")
+    chunk_size = models.PositiveIntegerField()
+    expected_sha256 = models.CharField(max_length=64, blank=True)
+    checksum_sha256 = models.CharField(max_length=64, blank=True)
+    received_chunks = models.JSONField(default=dict, blank=True, help_text="Chunk index -> byte count")
+    notes = models.TextField(blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.OPEN)
+    version = models.OneToOneField(
+        DocumentVersion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="upload_session",
+    )
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Upload of {self.file_name} ({self.status})"
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    @property
+    def received_bytes(self) -> int:
+        return sum(int(size) for size in (self.received_chunks or {}).values())
+
+
 class DocumentPermission(UUIDModel, TimeStampedModel):
     """Fine-grained access rules for a document."""
 
@@ -148,6 +243,40 @@ class DocumentPermission(UUIDModel, TimeStampedModel):
         return f"{self.document.title} ({self.access})"
 
 
+class DocumentVisibility(models.Model):
+    """Precomputed ``(principal type, principal id) -> document`` visibility grants.
+
+    Principals are resolved for the requesting user at query time, so only
+    document-side changes (author, sensitivity, workspaces, permissions) need
+    the rows rebuilt.
+    """
+
+    class PrincipalType(models.TextChoices):
+        ALL = "all", "All users"
+        USER = "user", "User"
+        WORKSPACE = "workspace", "Workspace"
+        DIVISION = "division", "Division"
+        DEPARTMENT = "department", "Department"
+        GRADE = "grade", "Grade level"
+
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name="visibility_grants")
+    principal_type = models.CharField(max_length=16, choices=PrincipalType.choices)
+    principal_id = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Document visibility grant"
+        verbose_name_plural = "Document visibility grants"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["principal_type", "principal_id", "document"],
+                name="dms_visibility_principal_document_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.principal_type}:{self.principal_id} -> {self.document_id}"
+
+
 class DocumentComment(UUIDModel, TimeStampedModel):
     """Threaded inline comments for a document or version."""
 
@@ -216,7 +345,8 @@ class DocumentAccessLog(UUIDModel):
     )
     action = models.CharField(max_length=32, choices=AccessAction.choices)
     sensitivity = models.CharField(max_length=32, choices=Document.Sensitivity.choices)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event happened, not when a buffered batch is written.
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["-timestamp"]
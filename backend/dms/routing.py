@@ -0,0 +1,9 @@
+"""WebSocket routing for the document management system."""
+
+from django.urls import path
+
+from .consumers import DocumentPresenceConsumer
+
+websocket_urlpatterns = [
+    path("ws/dms/documents/<uuid:document_id>/presence/", DocumentPresenceConsumer.as_asgi()),
+]
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 from accounts.serializers import UserSerializer
+from common.services import BlobPreviewService, BlobStorageService
 from organization.models import Department, Division
 
 from .models import (
@@ -12,11 +15,12 @@ from .models import (
     DocumentAccessLog,
     DocumentComment,
     DocumentDiscussionMessage,
-    DocumentEditorSession,
     DocumentPermission,
+    DocumentUploadSession,
     DocumentVersion,
     DocumentWorkspace,
 )
+from .services import DocumentBulkService, DocumentVersionDeltaService, DocumentVisibilityService
 
 
 class DocumentWorkspaceSerializer(serializers.ModelSerializer):
@@ -33,6 +37,15 @@ class DocumentWorkspaceSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+class DocumentVersionListSerializer(serializers.ListSerializer):
+    """Rebuilds delta-stored content for the whole page at once, sharing chain bases."""
+
+    def to_representation(self, data):
+        versions = list(data.all() if hasattr(data, "all") else data)
+        DocumentVersionDeltaService.materialize(versions)
+        return super().to_representation(versions)
+
+
 class DocumentVersionSerializer(serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     uploaded_by_id = serializers.PrimaryKeyRelatedField(
@@ -44,9 +57,55 @@ class DocumentVersionSerializer(serializers.ModelSerializer):
     # Override file_url to allow data URLs (which are longer than 200 chars)
     # The view will convert data URLs to proper file URLs before saving
     file_url = serializers.CharField(required=False, allow_blank=True, allow_null=True, max_length=None)
-    
+    download_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        file_url = attrs.get("file_url")
+        self._reused_blob = None
+        if file_url and not file_url.startswith("data:") and file_url != getattr(self.instance, "file_url", None):
+            # Downloads serve the linked blob, so a URL may only name a file the user can already open.
+            self._reused_blob = attrs["blob"] = self._visible_blob(file_url)
+        return attrs
+
+    def _visible_blob(self, file_url: str):
+        request = self.context.get("request")
+        blob = BlobStorageService.for_media_url(file_url)
+        visible = DocumentVisibilityService.visible_to(Document.objects.all(), getattr(request, "user", None))
+        if blob is None or not DocumentVersion.objects.filter(blob=blob, document__in=visible).exists():
+            raise serializers.ValidationError(
+                {"file_url": "File URL must reference a file already stored on this server."}
+            )
+        return blob
+
+    def create(self, validated_data):
+        version = super().create(validated_data)
+        if getattr(self, "_reused_blob", None) is not None:
+            BlobStorageService.retain(version.blob_id)
+        return version
+
+    def update(self, instance, validated_data):
+        previous_blob_id = instance.blob_id
+        version = super().update(instance, validated_data)
+        if getattr(self, "_reused_blob", None) is not None and version.blob_id != previous_blob_id:
+            BlobStorageService.retain(version.blob_id)
+            BlobStorageService.release(previous_blob_id)
+        return version
+
+    def get_download_url(self, obj) -> str | None:
+        if not (obj.blob_id or obj.file_url) or not obj.pk:
+            return None
+        return reverse("api_v1:document-version-download", args=[obj.pk], request=self.context.get("request"))
+
+    def get_preview_url(self, obj) -> str | None:
+        if not obj.blob_id or not obj.pk or not BlobPreviewService.is_previewable(obj.file_type):
+            return None
+        return reverse("api_v1:document-version-preview", args=[obj.pk], request=self.context.get("request"))
+
     def to_representation(self, instance):
         """Convert relative file URLs to absolute URLs when serializing."""
+        DocumentVersionDeltaService.materialize([instance])
         data = super().to_representation(instance)
         if data.get('file_url') and not data['file_url'].startswith(('http://', 'https://', 'data:')):
             # If it's a relative path, convert to absolute URL
@@ -74,6 +133,7 @@ class DocumentVersionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DocumentVersion
+        list_serializer_class = DocumentVersionListSerializer
         fields = [
             "id",
             "document",
@@ -82,10 +142,15 @@ class DocumentVersionSerializer(serializers.ModelSerializer):
             "file_type",
             "file_size",
             "file_url",
+            "download_url",
+            "preview_url",
             "content_html",
             "content_json",
             "content_text",
             "ocr_text",
+            "extraction_status",
+            "extraction_error",
+            "extracted_at",
             "summary",
             "uploaded_by",
             "uploaded_by_id",
@@ -100,12 +165,55 @@ class DocumentVersionSerializer(serializers.ModelSerializer):
             "uploaded_by",
             "uploaded_at",
             "content_text",
+            "extraction_status",
+            "extraction_error",
+            "extracted_at",
             "summary",
             "created_at",
             "updated_at",
         ]
 
 
+class DocumentUploadSessionSerializer(serializers.ModelSerializer):
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_bytes = serializers.IntegerField(read_only=True)
+    chunk_size = serializers.IntegerField(required=False, min_value=64 * 1024)
+    expected_sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, allow_blank=True)
+    total_size = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = DocumentUploadSession
+        fields = [
+            "id",
+            "document",
+            "file_name",
+            "file_type",
+            "total_size",
+            "chunk_size",
+            "total_chunks",
+            "expected_sha256",
+            "checksum_sha256",
+            "received_chunks",
+            "received_bytes",
+            "notes",
+            "status",
+            "version",
+            "expires_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "id",
+            "checksum_sha256",
+            "received_chunks",
+            "status",
+            "version",
+            "expires_at",
+            "created_at",
+            "updated_at",
+        ]
+
+
 class DocumentPermissionSerializer(serializers.ModelSerializer):
     division_ids = serializers.PrimaryKeyRelatedField(
         source="divisions",
@@ -186,6 +294,123 @@ class DocumentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "author", "versions", "permissions", "created_at", "updated_at"]
 
 
+class DocumentAuthorSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document._meta.get_field("author").remote_field.model
+        fields = ["id", "username", "first_name", "last_name", "email"]
+        read_only_fields = fields
+
+
+class DocumentVersionSummarySerializer(DocumentVersionSerializer):
+    """Version metadata without the rich-text, extracted text and OCR columns."""
+
+    uploaded_by = serializers.PrimaryKeyRelatedField(read_only=True)
+    uploaded_by_id = None
+
+    class Meta(DocumentVersionSerializer.Meta):
+        fields = [
+            "id",
+            "document",
+            "version_number",
+            "file_name",
+            "file_type",
+            "file_size",
+            "file_url",
+            "download_url",
+            "preview_url",
+            "extraction_status",
+            "summary",
+            "uploaded_by",
+            "uploaded_at",
+            "notes",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class DocumentListSerializer(serializers.ModelSerializer):
+    """Read-only list representation: metadata, the latest version summary and a version count."""
+
+    author = DocumentAuthorSummarySerializer(read_only=True)
+    workspace_ids = serializers.PrimaryKeyRelatedField(source="workspaces", many=True, read_only=True)
+    latest_version = serializers.SerializerMethodField()
+    version_count = serializers.IntegerField(read_only=True, default=0)
+
+    def get_latest_version(self, obj):
+        versions = getattr(obj, "latest_versions", None)
+        if versions is None:
+            versions = list(obj.versions.defer(*DocumentVersion.HEAVY_FIELDS).order_by("-version_number")[:1])
+        if not versions:
+            return None
+        return DocumentVersionSummarySerializer(versions[0], context=self.context).data
+
+    class Meta:
+        model = Document
+        fields = [
+            "id",
+            "title",
+            "description",
+            "document_type",
+            "reference_number",
+            "status",
+            "sensitivity",
+            "author",
+            "division",
+            "department",
+            "tags",
+            "workspace_ids",
+            "latest_version",
+            "version_count",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class DocumentBulkActionSerializer(serializers.Serializer):
+    """Validates ``POST /dms/documents/bulk/`` payloads.
+
+    Documents are selected either by ``ids`` or by a ``filter`` using the same
+    keys as the list endpoint.
+    """
+
+    FILTER_KEYS = ("document_type", "status", "sensitivity", "division", "department", "workspace", "tag", "search")
+
+    action = serializers.ChoiceField(choices=DocumentBulkService.ACTIONS)
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    filter = serializers.DictField(child=serializers.CharField(), required=False, allow_empty=False)
+    status = serializers.ChoiceField(choices=Document.DocumentStatus.choices, required=False)
+    sensitivity = serializers.ChoiceField(choices=Document.Sensitivity.choices, required=False)
+    tags = serializers.ListField(child=serializers.CharField(max_length=100), required=False, allow_empty=False)
+    workspace_ids = serializers.PrimaryKeyRelatedField(
+        queryset=DocumentWorkspace.objects.all(),
+        many=True,
+        required=False,
+        allow_empty=False,
+    )
+
+    def validate_filter(self, value):
+        unknown = sorted(set(value) - set(self.FILTER_KEYS))
+        if unknown:
+            raise serializers.ValidationError(f"Unsupported filter key(s): {', '.join(unknown)}.")
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'ids' or 'filter'.")
+        action = attrs["action"]
+        if action == DocumentBulkService.UPDATE and not (attrs.get("status") or attrs.get("sensitivity")):
+            raise serializers.ValidationError({"status": "Provide a status and/or sensitivity to update."})
+        if action in (DocumentBulkService.ADD_TAGS, DocumentBulkService.REMOVE_TAGS) and not attrs.get("tags"):
+            raise serializers.ValidationError({"tags": "This field is required for tag actions."})
+        if action in (DocumentBulkService.ADD_WORKSPACES, DocumentBulkService.REMOVE_WORKSPACES) and not attrs.get(
+            "workspace_ids"
+        ):
+            raise serializers.ValidationError({"workspace_ids": "This field is required for workspace actions."})
+        return attrs
+
+
 class DocumentCommentSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     author_id = serializers.PrimaryKeyRelatedField(
@@ -211,6 +436,27 @@ class DocumentCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "author", "created_at", "updated_at"]
 
 
+class DocumentCommentTreeQuerySerializer(serializers.Serializer):
+    version = serializers.UUIDField(required=False)
+    since = serializers.DateTimeField(required=False)
+
+
+class DocumentVersionDiffQuerySerializer(serializers.Serializer):
+    field = serializers.ChoiceField(choices=["html", "text"], default="html")
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # "from" is a keyword, so the version number fields are declared here.
+        fields["from"] = serializers.IntegerField(min_value=1)
+        fields["to"] = serializers.IntegerField(min_value=1)
+        return fields
+
+
+class DocumentExportQuerySerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    versions = serializers.ChoiceField(choices=["latest", "all"], default="latest")
+
+
 class DocumentDiscussionMessageSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     author_id = serializers.PrimaryKeyRelatedField(
@@ -233,7 +479,19 @@ class DocumentDiscussionMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "author", "created_at", "updated_at"]
 
 
+class VisibleDocumentField(serializers.PrimaryKeyRelatedField):
+    """Accepts only documents the requesting user may see."""
+
+    def get_queryset(self):
+        request = self.context.get("request")
+        user = getattr(request, "user", None)
+        if user is None:
+            return Document.objects.none()
+        return DocumentVisibilityService.visible_to(Document.objects.all(), user)
+
+
 class DocumentAccessLogSerializer(serializers.ModelSerializer):
+    document = VisibleDocumentField()
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         source="user",
@@ -257,25 +515,34 @@ class DocumentAccessLogSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "timestamp"]
 
 
-class DocumentEditorSessionSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    user_id = serializers.PrimaryKeyRelatedField(
-        source="user",
-        queryset=DocumentEditorSession._meta.get_field("user").remote_field.model.objects.all(),
-        write_only=True,
-    )
+class DocumentAccessEventSerializer(serializers.Serializer):
+    # Events are stamped on the server when they arrive; clients cannot backdate them.
+    document = VisibleDocumentField()
+    action = serializers.ChoiceField(choices=DocumentAccessLog.AccessAction.choices)
 
-    class Meta:
-        model = DocumentEditorSession
-        fields = [
-            "id",
-            "document",
-            "user",
-            "user_id",
-            "since",
-            "note",
-            "is_active",
-            "created_at",
-            "updated_at",
-        ]
-        read_only_fields = ["id", "user", "since", "created_at", "updated_at"]
+
+class DocumentAccessLogBatchSerializer(serializers.Serializer):
+    """Several access events sent together by a client."""
+
+    events = DocumentAccessEventSerializer(many=True, allow_empty=False)
+
+    def validate_events(self, value):
+        limit = settings.DMS_ACCESS_LOG_BATCH_MAX_EVENTS
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} events can be sent in one batch.")
+        return value
+
+
+class DocumentEditorSessionSerializer(serializers.Serializer):
+    """Editor presence held in Redis, in the shape of the former ``DocumentEditorSession`` rows."""
+
+    id = serializers.CharField(read_only=True)
+    document = serializers.UUIDField()
+    user = serializers.JSONField(read_only=True)
+    # Accepted for compatibility; the session always belongs to the requesting user.
+    user_id = serializers.CharField(write_only=True, required=False)
+    since = serializers.DateTimeField(read_only=True)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    is_active = serializers.BooleanField(required=False, default=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
@@ -0,0 +1,1554 @@
+"""Domain services for the document management system."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mimetypes
+import re
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import IO, Iterable
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, Q, QuerySet, Subquery, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce, Concat, Left
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.html import strip_tags
+from redis.exceptions import RedisError
+from rest_framework.exceptions import ValidationError
+
+from audit.models import ActivityLog
+from audit.services import AuditService
+from common.exports import ArchiveNames, ExportEntry, safe_name
+from common.models import ContentSignature, StoredBlob
+from common.redis_client import get_redis
+from common.services import BlobStorageService, DuplicateDetectionService, RetainedFile, RetentionService
+from common.storage import local_copy, storage_path_from_url
+from common.upload_validators import validate_file_upload, validate_upload_metadata
+
+from . import deltas
+from .models import (
+    Document,
+    DocumentAccessLog,
+    DocumentComment,
+    DocumentPermission,
+    DocumentUploadSession,
+    DocumentVersion,
+    DocumentVisibility,
+    DocumentWorkspace,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentSearchService:
+    """Maintains and queries the weighted full-text index on documents.
+
+    Weights follow the relevance users expect from the DMS browser:
+    title (A) > reference number (B) > description and tags (C) > version
+    body text and OCR output (D). ``dms.signals`` refreshes the vector after
+    document and version saves; bulk queryset updates call :meth:`refresh`.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    @staticmethod
+    def config() -> str:
+        return getattr(settings, "DMS_SEARCH_CONFIG", "english")
+
+    @staticmethod
+    def version_text_limit() -> int:
+        # PostgreSQL caps a tsvector at 1MB; keep the version body well below it.
+        return getattr(settings, "DMS_SEARCH_VERSION_TEXT_LIMIT", 500_000)
+
+    @classmethod
+    def build_vector(cls):
+        config = cls.config()
+        version_text = (
+            DocumentVersion.objects.filter(document=OuterRef("pk"))
+            .values("document")
+            .annotate(
+                body=StringAgg(
+                    Concat("content_text", Value(" "), "ocr_text", output_field=TextField()),
+                    delimiter=" ",
+                )
+            )
+            .values("body")
+        )
+        return (
+            SearchVector("title", weight="A", config=config)
+            + SearchVector("reference_number", weight="B", config=config)
+            + SearchVector("description", Cast("tags", TextField()), weight="C", config=config)
+            + SearchVector(
+                Left(Coalesce(Subquery(version_text, output_field=TextField()), Value("")), cls.version_text_limit()),
+                weight="D",
+                config=config,
+            )
+        )
+
+    @classmethod
+    def refresh(cls, document_ids: Iterable | None = None) -> int:
+        """Recompute the search vector for the given documents (or every document)."""
+
+        queryset = Document.all_objects.all()
+        if document_ids is not None:
+            document_ids = [document_id for document_id in document_ids if document_id]
+            if not document_ids:
+                return 0
+            queryset = queryset.filter(id__in=document_ids)
+        return queryset.update(search_vector=cls.build_vector())
+
+    @classmethod
+    def build_query(cls, term: str) -> SearchQuery | None:
+        """Build a prefix-matching query so search-as-you-type hits partial words."""
+
+        tokens = cls.TOKEN_PATTERN.findall(term or "")
+        if not tokens:
+            return None
+        raw = " & ".join(f"{token}:*" for token in tokens)
+        return SearchQuery(raw, search_type="raw", config=cls.config())
+
+    @classmethod
+    def search(cls, queryset: QuerySet[Document], term: str) -> QuerySet[Document]:
+        """Filter ``queryset`` to documents matching ``term``, annotated with ``search_rank``.
+
+        The parser keeps a reference such as ``NPA/DMS/2024/001`` as one lexeme,
+        so partial references ("DMS", "2024/001") are matched by substring.
+        """
+
+        query = cls.build_query(term)
+        if query is None:
+            return queryset
+        return queryset.filter(Q(search_vector=query) | Q(reference_number__icontains=term.strip())).annotate(
+            search_rank=SearchRank(F("search_vector"), query),
+        )
+
+
+class DocumentVisibilityService:
+    """Maintains the ``DocumentVisibility`` index used to scope document queries.
+
+    Each document is expanded into the principals that may see it; a user's
+    principals (id, workspaces, division, department, grade) are resolved per
+    request, so list queries become a single semi-join on the index instead of
+    an OR across permission joins followed by ``DISTINCT``.
+    """
+
+    CONFIDENTIAL_GRADES = ("MSS5", "MSS4", "MSS3", "MSS2", "MSS1", "EDCS", "MDCS")
+    RESTRICTED_GRADES = ("MSS1", "EDCS", "MDCS")
+    OPEN_SENSITIVITIES = (Document.Sensitivity.PUBLIC, Document.Sensitivity.INTERNAL)
+    BATCH_SIZE = 500
+
+    @classmethod
+    def principals_for(cls, document: Document) -> set[tuple[str, str]]:
+        """Principals granted visibility of ``document``; expects workspaces and permissions prefetched."""
+
+        principal = DocumentVisibility.PrincipalType
+        grants: set[tuple[str, str]] = set()
+        if document.author_id:
+            grants.add((principal.USER, str(document.author_id)))
+        for workspace in document.workspaces.all():
+            grants.add((principal.WORKSPACE, str(workspace.id)))
+        for permission in document.permissions.all():
+            grants.update((principal.USER, str(user.id)) for user in permission.users.all())
+            grants.update((principal.DIVISION, str(division.id)) for division in permission.divisions.all())
+            grants.update((principal.DEPARTMENT, str(department.id)) for department in permission.departments.all())
+            grants.update((principal.GRADE, str(grade)) for grade in permission.grade_levels or [] if grade)
+
+        if document.sensitivity in cls.OPEN_SENSITIVITIES:
+            grants.add((principal.ALL, "*"))
+        elif document.sensitivity == Document.Sensitivity.CONFIDENTIAL:
+            grants.update((principal.GRADE, grade) for grade in cls.CONFIDENTIAL_GRADES)
+        elif document.sensitivity == Document.Sensitivity.RESTRICTED:
+            grants.update((principal.GRADE, grade) for grade in cls.RESTRICTED_GRADES)
+        return grants
+
+    @classmethod
+    def refresh(cls, document_ids: Iterable | None = None) -> int:
+        """Bring the index rows for the given documents (or every document) up to date.
+
+        Only the difference is written: stale grants are deleted and missing ones
+        inserted. Returns the number of documents processed.
+        """
+
+        queryset = Document.all_objects.only("id", "author_id", "sensitivity").prefetch_related(
+            "workspaces",
+            "permissions__users",
+            "permissions__divisions",
+            "permissions__departments",
+        )
+        if document_ids is not None:
+            document_ids = [document_id for document_id in document_ids if document_id]
+            if not document_ids:
+                return 0
+            queryset = queryset.filter(id__in=document_ids)
+
+        processed = 0
+        ids = list(queryset.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(ids), cls.BATCH_SIZE):
+            batch = list(queryset.filter(id__in=ids[start:start + cls.BATCH_SIZE]))
+            cls._sync_batch(batch)
+            processed += len(batch)
+        return processed
+
+    @classmethod
+    @transaction.atomic
+    def _sync_batch(cls, documents: list[Document]) -> None:
+        desired = {
+            (document.id, principal_type, principal_id)
+            for document in documents
+            for principal_type, principal_id in cls.principals_for(document)
+        }
+        existing = {
+            (row["document_id"], row["principal_type"], row["principal_id"]): row["id"]
+            for row in DocumentVisibility.objects.filter(document__in=documents).values(
+                "id", "document_id", "principal_type", "principal_id"
+            )
+        }
+        stale = [row_id for key, row_id in existing.items() if key not in desired]
+        if stale:
+            DocumentVisibility.objects.filter(id__in=stale).delete()
+        DocumentVisibility.objects.bulk_create(
+            [
+                DocumentVisibility(document_id=document_id, principal_type=principal_type, principal_id=principal_id)
+                for document_id, principal_type, principal_id in desired
+                if (document_id, principal_type, principal_id) not in existing
+            ],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def principals_of(user) -> Q:
+        """Match the index rows that apply to ``user``."""
+
+        principal = DocumentVisibility.PrincipalType
+        workspace_ids = [str(workspace_id) for workspace_id in user.document_workspaces.values_list("id", flat=True)]
+        match = Q(principal_type=principal.ALL) | Q(principal_type=principal.USER, principal_id=str(user.id))
+        if workspace_ids:
+            match |= Q(principal_type=principal.WORKSPACE, principal_id__in=workspace_ids)
+        if user.division_id:
+            match |= Q(principal_type=principal.DIVISION, principal_id=str(user.division_id))
+        if user.department_id:
+            match |= Q(principal_type=principal.DEPARTMENT, principal_id=str(user.department_id))
+        if user.grade_level:
+            match |= Q(principal_type=principal.GRADE, principal_id=user.grade_level)
+        return match
+
+    @staticmethod
+    def visibility_class(user) -> str:
+        """Identify users who see exactly the same documents.
+
+        Users sharing workspaces, division, department and grade share a class
+        unless they hold personal grants (authorship or direct shares), in which
+        case the class is per user. Used to key caches of visibility-scoped results.
+        """
+
+        if not user or not user.is_authenticated or user.is_superuser:
+            return "all"
+        principal = DocumentVisibility.PrincipalType
+        parts = [
+            "w:" + ",".join(sorted(str(pk) for pk in user.document_workspaces.values_list("id", flat=True))),
+            f"v:{user.division_id or ''}",
+            f"d:{user.department_id or ''}",
+            f"g:{user.grade_level or ''}",
+        ]
+        if DocumentVisibility.objects.filter(principal_type=principal.USER, principal_id=str(user.id)).exists():
+            parts.append(f"u:{user.id}")
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def visible_to(cls, queryset: QuerySet[Document], user) -> QuerySet[Document]:
+        """Restrict ``queryset`` to documents ``user`` may see."""
+
+        if not user or not user.is_authenticated or user.is_superuser:
+            return queryset
+        grants = DocumentVisibility.objects.filter(cls.principals_of(user)).values("document_id")
+        return queryset.filter(id__in=grants)
+
+
+class DocumentBulkService:
+    """Set-based bulk edits over many documents in one transaction.
+
+    Every operation is a handful of UPDATE/INSERT statements regardless of how
+    many documents are selected, followed by one index refresh and one bulk
+    insert of audit rows.
+    """
+
+    UPDATE = "update"
+    ADD_TAGS = "add_tags"
+    REMOVE_TAGS = "remove_tags"
+    ADD_WORKSPACES = "add_workspaces"
+    REMOVE_WORKSPACES = "remove_workspaces"
+    DELETE = "delete"
+    RESTORE = "restore"
+    ACTIONS = (UPDATE, ADD_TAGS, REMOVE_TAGS, ADD_WORKSPACES, REMOVE_WORKSPACES, DELETE, RESTORE)
+
+    # Appends tags that are not already present, keeping the existing order.
+    APPEND_TAGS_SQL = """
+        (
+            SELECT coalesce(jsonb_agg(tag.value ORDER BY tag.position), '[]'::jsonb)
+            FROM (
+                SELECT value, min(position) AS position
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof("dms_document"."tags") = 'array'
+                        THEN "dms_document"."tags" ELSE '[]'::jsonb END || %s::jsonb
+                ) WITH ORDINALITY AS element(value, position)
+                GROUP BY value
+            ) AS tag
+        )
+    """
+    REMOVE_TAGS_SQL = """
+        CASE WHEN jsonb_typeof("dms_document"."tags") = 'array'
+            THEN "dms_document"."tags" - %s::text[] ELSE '[]'::jsonb END
+    """
+
+    @staticmethod
+    def max_documents() -> int:
+        return getattr(settings, "DMS_BULK_MAX_DOCUMENTS", 1000)
+
+    @classmethod
+    def scope(cls, queryset: QuerySet[Document], action: str) -> QuerySet[Document]:
+        """Restrict ``queryset`` to the documents ``action`` can apply to."""
+
+        return queryset.filter(is_deleted=action == cls.RESTORE)
+
+    @classmethod
+    @transaction.atomic
+    def apply(
+        cls,
+        queryset: QuerySet[Document],
+        *,
+        action: str,
+        user,
+        request=None,
+        status: str | None = None,
+        sensitivity: str | None = None,
+        tags: list[str] | None = None,
+        workspace_ids: list | None = None,
+    ) -> list:
+        """Apply ``action`` to every document in ``queryset``; returns the affected ids."""
+
+        limit = cls.max_documents()
+        rows = list(cls.scope(queryset, action).order_by().values_list("id", "title").distinct()[: limit + 1])
+        if len(rows) > limit:
+            raise ValidationError({"ids": f"A bulk operation is limited to {limit} documents."})
+        document_ids = [document_id for document_id, _ in rows]
+        if not document_ids:
+            return []
+
+        now = timezone.now()
+        documents = Document.all_objects.filter(id__in=document_ids)
+        metadata: dict = {"bulk_action": action, "document_count": len(document_ids)}
+
+        if action == cls.UPDATE:
+            changes = {field: value for field, value in (("status", status), ("sensitivity", sensitivity)) if value}
+            documents.update(updated_at=now, **changes)
+            metadata["changes"] = changes
+        elif action == cls.ADD_TAGS:
+            documents.update(updated_at=now, tags=RawSQL(cls.APPEND_TAGS_SQL, [json.dumps(tags)]))
+            metadata["tags"] = tags
+        elif action == cls.REMOVE_TAGS:
+            documents.update(updated_at=now, tags=RawSQL(cls.REMOVE_TAGS_SQL, [list(tags)]))
+            metadata["tags"] = tags
+        elif action in (cls.ADD_WORKSPACES, cls.REMOVE_WORKSPACES):
+            through = Document.workspaces.through
+            if action == cls.ADD_WORKSPACES:
+                through.objects.bulk_create(
+                    [
+                        through(document_id=document_id, documentworkspace_id=workspace_id)
+                        for document_id in document_ids
+                        for workspace_id in workspace_ids
+                    ],
+                    ignore_conflicts=True,
+                    batch_size=1000,
+                )
+            else:
+                through.objects.filter(document_id__in=document_ids, documentworkspace_id__in=workspace_ids).delete()
+            documents.update(updated_at=now)
+            metadata["workspace_ids"] = [str(workspace_id) for workspace_id in workspace_ids]
+        elif action in (cls.DELETE, cls.RESTORE):
+            documents.update(
+                updated_at=now,
+                is_deleted=action == cls.DELETE,
+                deleted_at=now if action == cls.DELETE else None,
+            )
+        else:
+            raise ValidationError({"action": f"Unsupported bulk action: {action}."})
+
+        DocumentSearchService.refresh(document_ids)
+        if action in (cls.UPDATE, cls.ADD_WORKSPACES, cls.REMOVE_WORKSPACES):
+            DocumentVisibilityService.refresh(document_ids)
+
+        AuditService.log_document_activities(
+            user=user,
+            action=ActivityLog.ActionType.DOCUMENT_DELETED if action == cls.DELETE else ActivityLog.ActionType.DOCUMENT_UPDATED,
+            documents=rows,
+            request=request,
+            description=f"Bulk {action.replace('_', ' ')} on {len(document_ids)} document(s)",
+            metadata=metadata,
+        )
+        return document_ids
+
+
+class DocumentFacetService:
+    """Sidebar counts for the DMS browser, computed in one ``GROUPING SETS`` query.
+
+    Every facet is a grouping set over the filtered documents left-joined to
+    their workspaces; ``COUNT(DISTINCT id)`` keeps the workspace join from
+    inflating the other facets. The empty grouping set yields the total.
+    """
+
+    # Query parameters that change paging or ordering but not the counted set.
+    NON_FILTER_PARAMS = {"page", "page_size", "ordering", "cursor", "pagination", "include_versions", "limit"}
+    CACHE_PREFIX = "dms:facets"
+
+    @classmethod
+    def cache_key(cls, visibility_class: str, params) -> str:
+        filters = sorted(
+            (key, sorted(values)) for key, values in params.lists() if key not in cls.NON_FILTER_PARAMS
+        )
+        digest = hashlib.sha1(json.dumps(filters).encode("utf-8")).hexdigest()
+        return f"{cls.CACHE_PREFIX}:{visibility_class}:{digest}"
+
+    @staticmethod
+    def counts(queryset: QuerySet[Document]) -> dict:
+        qn = connection.ops.quote_name
+        through = Document.workspaces.through
+        division_model = Document._meta.get_field("division").related_model
+        document_type, status, sensitivity = (f"d.{qn(name)}" for name in ("document_type", "status", "sensitivity"))
+        division = f"d.{qn(Document._meta.get_field('division').column)}"
+        workspace = f"dw.{qn(through._meta.get_field('documentworkspace').column)}"
+        document_ids_sql, params = queryset.order_by().values("id").query.sql_with_params()
+        sql = f"""
+            SELECT
+                CASE
+                    WHEN GROUPING({document_type}) = 0 THEN 'document_type'
+                    WHEN GROUPING({status}) = 0 THEN 'status'
+                    WHEN GROUPING({sensitivity}) = 0 THEN 'sensitivity'
+                    WHEN GROUPING({division}) = 0 THEN 'division'
+                    WHEN GROUPING({workspace}) = 0 THEN 'workspace'
+                    ELSE 'total'
+                END,
+                COALESCE({document_type}, {status}, {sensitivity}, {division}::text, {workspace}::text),
+                COALESCE(division.{qn("name")}, workspace.{qn("name")}),
+                COUNT(DISTINCT d.{qn("id")})
+            FROM {qn(Document._meta.db_table)} d
+            LEFT JOIN {qn(division_model._meta.db_table)} division ON division.{qn("id")} = {division}
+            LEFT JOIN {qn(through._meta.db_table)} dw
+                ON dw.{qn(through._meta.get_field("document").column)} = d.{qn("id")}
+            LEFT JOIN {qn(DocumentWorkspace._meta.db_table)} workspace ON workspace.{qn("id")} = {workspace}
+            WHERE d.{qn("id")} IN ({document_ids_sql})
+            GROUP BY GROUPING SETS (
+                ({document_type}),
+                ({status}),
+                ({sensitivity}),
+                ({division}, division.{qn("name")}),
+                ({workspace}, workspace.{qn("name")}),
+                ()
+            )
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        labels = {
+            "document_type": dict(Document.DocumentType.choices),
+            "status": dict(Document.DocumentStatus.choices),
+            "sensitivity": dict(Document.Sensitivity.choices),
+        }
+        facets: dict = {"total": 0, "document_type": [], "status": [], "sensitivity": [], "division": [], "workspace": []}
+        for facet, value, name, count in rows:
+            if facet == "total":
+                facets["total"] = count
+                continue
+            label = labels[facet].get(value, value) if facet in labels else (name or "")
+            facets[facet].append({"value": value, "label": label, "count": count})
+
+        for facet, entries in facets.items():
+            if facet != "total":
+                entries.sort(key=lambda entry: (-entry["count"], entry["label"] or ""))
+        return facets
+
+
+class DocumentShareService:
+    """Resolves and notifies the recipients of a document share."""
+
+    @staticmethod
+    def recipients(permission: DocumentPermission, exclude_user_id=None) -> QuerySet:
+        """Every user reached by ``permission`` (direct users plus active division/department members), in one query."""
+
+        user_model = DocumentPermission._meta.get_field("users").remote_field.model
+        audience = Q(id__in=permission.users.values("id"))
+        audience |= Q(is_active=True, division_id__in=permission.divisions.values("id"))
+        audience |= Q(is_active=True, department_id__in=permission.departments.values("id"))
+        queryset = user_model.objects.filter(audience)
+        if exclude_user_id:
+            queryset = queryset.exclude(id=exclude_user_id)
+        return queryset
+
+    @classmethod
+    def notify(cls, permission: DocumentPermission, sharer) -> int:
+        """Send the "document shared" notification to every recipient; returns the number created."""
+
+        from notifications.models import Notification
+        from notifications.services import NotificationService
+
+        document = permission.document
+        sharer_name = (sharer.get_full_name() or sharer.username) if sharer else "Someone"
+        notifications = NotificationService.create_bulk_notifications(
+            cls.recipients(permission, exclude_user_id=getattr(sharer, "id", None)).only(
+                "id", "email", "first_name", "last_name", "username"
+            ),
+            title=f"Document Shared: {document.title}",
+            message=f"{sharer_name} has shared a document with you with {permission.access} access.",
+            notification_type=Notification.NotificationType.DOCUMENT,
+            priority=Notification.Priority.NORMAL,
+            sender=sharer,
+            module="dms",
+            related_object_type="document",
+            related_object_id=str(document.id),
+            action_url=f"/dms/{document.id}",
+            action_required=False,
+        )
+        return len(notifications)
+
+
+class DocumentCommentTreeService:
+    """Threaded comments for a document, loaded in one query and nested in memory.
+
+    Authors are returned once in a side table keyed by id instead of being
+    embedded in every comment. With ``since`` only comments changed after that
+    time are nested (replies to unchanged comments become roots carrying their
+    ``parent``), and ``ids`` lists every current comment so clients can drop
+    deleted ones.
+    """
+
+    AUTHOR_FIELDS = ("id", "username", "first_name", "last_name", "email")
+
+    @classmethod
+    def build(cls, document: Document, *, version_id=None, since=None) -> dict:
+        server_time = timezone.now()
+        queryset = DocumentComment.objects.filter(document=document)
+        if version_id:
+            queryset = queryset.filter(version_id=version_id)
+        rows = list(
+            queryset.order_by("created_at", "id").values(
+                "id",
+                "parent_id",
+                "version_id",
+                "content",
+                "resolved",
+                "created_at",
+                "updated_at",
+                *(f"author__{field}" for field in cls.AUTHOR_FIELDS),
+            )
+        )
+
+        changed = [row for row in rows if since is None or row["updated_at"] > since]
+        authors: dict[str, dict] = {}
+        nodes: dict = {}
+        for row in changed:
+            author_id = row["author__id"]
+            if author_id is not None and str(author_id) not in authors:
+                authors[str(author_id)] = {field: row[f"author__{field}"] for field in cls.AUTHOR_FIELDS}
+            nodes[row["id"]] = {
+                "id": str(row["id"]),
+                "parent": str(row["parent_id"]) if row["parent_id"] else None,
+                "version": str(row["version_id"]) if row["version_id"] else None,
+                "author": author_id,
+                "content": row["content"],
+                "resolved": row["resolved"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "replies": [],
+            }
+
+        roots = []
+        for row in changed:
+            parent = nodes.get(row["parent_id"])
+            (parent["replies"] if parent else roots).append(nodes[row["id"]])
+
+        tree = {
+            "document": str(document.id),
+            "version": str(version_id) if version_id else None,
+            "count": len(rows),
+            "server_time": server_time,
+            "authors": authors,
+            "comments": roots,
+        }
+        if since is not None:
+            tree["since"] = since
+            tree["ids"] = [str(row["id"]) for row in rows]
+        return tree
+
+
+class DocumentVersionDeltaService:
+    """Reverse-delta storage for rich-text (editor) versions.
+
+    The newest version always keeps full ``content_html``/``content_json``/
+    ``content_text``. When a new rich-text version is saved, the previous one
+    is rewritten as a delta against it (``content_base``/``content_delta``),
+    unless its number is a multiple of ``DMS_VERSION_SNAPSHOT_INTERVAL``, which
+    keeps a full snapshot and bounds every chain. ``materialize`` rebuilds the
+    content of delta versions in memory on read. ``content_text`` is never
+    delta-encoded, so the search index keeps covering older versions.
+    """
+
+    CONTENT_FIELDS = ("content_html", "content_json", "content_text")
+    DELTA_FIELDS = ("content_html", "content_json")
+    # Keep the full copy when the delta would not save at least this share.
+    MIN_SAVING = 0.2
+
+    @staticmethod
+    def snapshot_interval() -> int:
+        return max(getattr(settings, "DMS_VERSION_SNAPSHOT_INTERVAL", 10), 1)
+
+    @staticmethod
+    def is_rich_text(version: DocumentVersion) -> bool:
+        return not version.blob_id and not version.file_url
+
+    @classmethod
+    def compact_previous(cls, version: DocumentVersion) -> DocumentVersion | None:
+        """Store the version before ``version`` as a delta against it; returns it when compacted."""
+
+        if not cls.is_rich_text(version) or version.content_delta is not None:
+            return None
+        with transaction.atomic():
+            previous = (
+                DocumentVersion.objects.select_for_update()
+                .filter(document_id=version.document_id, version_number__lt=version.version_number)
+                .order_by("-version_number")
+                .first()
+            )
+            if (
+                previous is None
+                or previous.content_delta is not None
+                or not cls.is_rich_text(previous)
+                or previous.version_number % cls.snapshot_interval() == 0
+            ):
+                return None
+
+            base, target = cls._strings(version), cls._strings(previous)
+            delta = {field: deltas.encode(base[field], target[field]) for field in cls.DELTA_FIELDS}
+            full_size = sum(len(target[field]) for field in cls.DELTA_FIELDS)
+            if len(json.dumps(delta, ensure_ascii=False)) > full_size * (1 - cls.MIN_SAVING):
+                return None
+
+            previous.content_base = version
+            previous.content_delta = delta
+            previous.content_html = ""
+            previous.content_json = None
+            previous.save(update_fields=["content_base", "content_delta", *cls.DELTA_FIELDS, "updated_at"])
+        return previous
+
+    @classmethod
+    def materialize(cls, versions: Iterable[DocumentVersion]) -> None:
+        """Fill the content fields of delta versions in place (not saved).
+
+        Bases found among ``versions`` are reused; the rest of each chain is
+        loaded with a single recursive query.
+        """
+
+        versions = [
+            version
+            for version in versions
+            if not set(cls.CONTENT_FIELDS + ("content_delta",)) & version.get_deferred_fields()
+        ]
+        pending = [
+            version
+            for version in versions
+            if version.content_delta is not None and not getattr(version, "_content_materialized", False)
+        ]
+        if not pending:
+            return
+
+        rows = {
+            version.pk: {"base": version.content_base_id, "delta": version.content_delta, **cls._strings(version)}
+            for version in versions
+        }
+        missing = {row["base"] for row in rows.values() if row["delta"] is not None and row["base"] not in rows}
+        if missing:
+            rows.update(cls._load_chains(missing))
+
+        resolved: dict = {}
+        for version in pending:
+            content = cls._resolve(version.pk, rows, resolved)
+            version.content_html = content["content_html"]
+            version.content_json = json.loads(content["content_json"])
+            version._content_materialized = True
+
+    @classmethod
+    def expand(cls, version: DocumentVersion) -> DocumentVersion:
+        """Turn a delta version back into a full one (and make sure nothing is based on it).
+
+        Used before a version's content is edited or the version is deleted.
+        """
+
+        with transaction.atomic():
+            for child in version.delta_children.all():
+                cls.expand(child)
+            if version.content_delta is not None:
+                cls.materialize([version])
+                version.content_base = None
+                version.content_delta = None
+                version.save(update_fields=["content_base", "content_delta", *cls.CONTENT_FIELDS, "updated_at"])
+        return version
+
+    @classmethod
+    def diff(cls, baseline: DocumentVersion, target: DocumentVersion, field: str = "content_html") -> dict:
+        cls.materialize([baseline, target])
+        changes = deltas.line_diff(getattr(baseline, field) or "", getattr(target, field) or "")
+        return {
+            "from": baseline.version_number,
+            "to": target.version_number,
+            "field": field,
+            "added": sum(1 for change in changes if change["type"] == "added"),
+            "removed": sum(1 for change in changes if change["type"] == "removed"),
+            "changes": changes,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _strings(version: DocumentVersion) -> dict[str, str]:
+        return {
+            "content_html": version.content_html or "",
+            "content_json": deltas.canonical_json(version.content_json),
+        }
+
+    @classmethod
+    def _resolve(cls, pk, rows: dict, resolved: dict) -> dict[str, str]:
+        path = []
+        while pk not in resolved:
+            row = rows[pk]
+            if row["delta"] is None:
+                resolved[pk] = {field: row[field] for field in cls.DELTA_FIELDS}
+                break
+            path.append(pk)
+            pk = row["base"]
+        for child in reversed(path):
+            row = rows[child]
+            base = resolved[row["base"]]
+            resolved[child] = {field: deltas.apply(base[field], row["delta"][field]) for field in cls.DELTA_FIELDS}
+        return resolved[path[0] if path else pk]
+
+    @staticmethod
+    def _load_chains(version_ids: set) -> dict:
+        table = DocumentVersion._meta.db_table
+        sql = f"""
+            WITH RECURSIVE chain AS (
+                SELECT id, content_base_id, content_delta, content_html, content_json
+                FROM {table} WHERE id = ANY(%s)
+                UNION ALL
+                SELECT v.id, v.content_base_id, v.content_delta, v.content_html, v.content_json
+                FROM {table} v JOIN chain c ON v.id = c.content_base_id
+            )
+            SELECT id, content_base_id, content_delta::text, content_html, content_json::text FROM chain
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [list(version_ids)])
+            fetched = cursor.fetchall()
+        rows = {}
+        for pk, base_id, delta, html, content_json in fetched:
+            rows[pk] = {
+                "base": base_id,
+                "delta": json.loads(delta) if delta is not None else None,
+                "content_html": html or "",
+                "content_json": deltas.canonical_json(json.loads(content_json) if content_json is not None else None),
+            }
+        return rows
+
+
+class DocumentDuplicateService:
+    """Probable duplicates of a document version among the documents a user can see.
+
+    Versions sharing the same stored blob are exact duplicates; otherwise the
+    MinHash index (``DuplicateDetectionService``) supplies near-duplicates.
+    Versions are indexed from their rich-text body at save time and again
+    once text extraction or OCR has run.
+    """
+
+    SOURCE = ContentSignature.Source.DOCUMENT_VERSION
+
+    @staticmethod
+    def version_text(version: DocumentVersion) -> str:
+        text = version.content_text or strip_tags(version.content_html or "")
+        return f"{text}\n{version.ocr_text}" if version.ocr_text else text
+
+    @classmethod
+    def index(cls, version: DocumentVersion) -> ContentSignature | None:
+        return DuplicateDetectionService.index(cls.SOURCE, version.pk, version.document_id, cls.version_text(version))
+
+    @classmethod
+    def remove(cls, version: DocumentVersion) -> None:
+        DuplicateDetectionService.remove(cls.SOURCE, version.pk)
+
+    @classmethod
+    def probable_duplicates(cls, version: DocumentVersion, user, *, limit: int = 10) -> list[dict]:
+        matches: dict = {}
+        if version.blob_id:
+            exact = (
+                DocumentVersion.objects.filter(blob_id=version.blob_id)
+                .exclude(document_id=version.document_id)
+                .values_list("id", "document_id")[:limit]
+            )
+            for version_id, document_id in exact:
+                matches.setdefault(document_id, {"version": version_id, "similarity": 1.0, "match": "exact"})
+
+        signature = DuplicateDetectionService.signature_for(cls.SOURCE, version.pk)
+        for match in DuplicateDetectionService.find(
+            signature, source=cls.SOURCE, exclude_group=version.document_id, limit=limit
+        ):
+            matches.setdefault(
+                match["group_id"],
+                {"version": match["object_id"], "similarity": match["similarity"], "match": "near"},
+            )
+        if not matches:
+            return []
+
+        visible = DocumentVisibilityService.visible_to(Document.objects.filter(id__in=matches), user)
+        rows = DocumentVersion.objects.filter(
+            id__in=[match["version"] for match in matches.values()],
+            document__in=visible,
+        ).values("id", "version_number", "document_id", "document__title", "document__reference_number")
+        results = [
+            {
+                "document": str(row["document_id"]),
+                "title": row["document__title"],
+                "reference_number": row["document__reference_number"],
+                "version": str(row["id"]),
+                "version_number": row["version_number"],
+                "similarity": matches[row["document_id"]]["similarity"],
+                "match": matches[row["document_id"]]["match"],
+            }
+            for row in rows
+        ]
+        return sorted(results, key=lambda result: result["similarity"], reverse=True)[:limit]
+
+    @classmethod
+    def rebuild(cls, *, batch_size: int = 500) -> int:
+        indexed = 0
+        versions = DocumentVersion.objects.filter(document__is_deleted=False).only(
+            "id", "document_id", "content_html", "content_text", "ocr_text"
+        )
+        for version in versions.iterator(chunk_size=batch_size):
+            if cls.index(version) is not None:
+                indexed += 1
+        return indexed
+
+
+class DocumentExportService:
+    """ZIP export builder for a set of (already authorized) documents.
+
+    Each document gets a ``documents/<title>-<id>/`` folder holding its latest
+    version, or every version with ``versions="all"``. Rich-text versions
+    without a stored file are exported as their HTML. Used by
+    :func:`common.views.export_response` and ``ExportJobService``.
+    """
+
+    @classmethod
+    def archive(cls, params: dict) -> tuple[str, list[ExportEntry], dict]:
+        document_ids = params.get("document_ids") or []
+        all_versions = params.get("versions") == "all"
+        # The retention purge archives documents that are already soft-deleted.
+        manager = Document.all_objects if params.get("include_deleted") else Document.objects
+        documents = list(
+            manager.filter(pk__in=document_ids)
+            .order_by("title", "id")
+            .values("id", "title", "reference_number", "document_type", "status", "sensitivity", "tags")
+        )
+        versions = (
+            DocumentVersion.objects.filter(document_id__in=[doc["id"] for doc in documents])
+            .select_related("blob")
+            .order_by("document_id", "-version_number")
+        )
+        if not all_versions:
+            versions = versions.distinct("document_id")
+        versions = list(versions)
+        DocumentVersionDeltaService.materialize(versions)
+        by_document: dict = {}
+        for version in versions:
+            by_document.setdefault(version.document_id, []).append(version)
+
+        names = ArchiveNames()
+        entries: list[ExportEntry] = []
+        manifest_documents = []
+        for document in documents:
+            folder = names(f"documents/{safe_name(document['title'], 'document')}-{str(document['id'])[:8]}")
+            exported = []
+            for version in by_document.get(document["id"], []):
+                entry = cls.version_entry(version, folder, names)
+                if entry is None:
+                    continue
+                entries.append(entry)
+                exported.append({"version_number": version.version_number, "path": entry.archive_name})
+            manifest_documents.append({**document, "id": str(document["id"]), "versions": exported})
+
+        file_name = f"documents-{timezone.localtime():%Y%m%d-%H%M%S}.zip"
+        return file_name, entries, {"kind": "documents", "documents": manifest_documents}
+
+    @staticmethod
+    def version_entry(version: DocumentVersion, folder: str, names: ArchiveNames) -> ExportEntry | None:
+        prefix = f"{folder}/v{version.version_number}"
+        if version.blob_id:
+            name = names(f"{prefix}-{safe_name(version.file_name)}")
+            return ExportEntry(name, storage_path=version.blob.storage_path, size=version.blob.size)
+        storage_path = storage_path_from_url(version.file_url)
+        if storage_path:
+            name = names(f"{prefix}-{safe_name(version.file_name)}")
+            return ExportEntry(name, storage_path=storage_path, size=version.file_size)
+        if version.content_html:
+            stem = Path(safe_name(version.file_name, "document")).stem
+            return ExportEntry(names(f"{prefix}-{stem}.html"), data=version.content_html.encode("utf-8"))
+        return None
+
+
+class DocumentRetentionService:
+    """Purger for soft-deleted documents, driven by ``common.services.RetentionService``.
+
+    Deleting a document cascades to its versions, comments, permissions,
+    visibility grants and access logs; version files are handed back to blob
+    storage and the versions' duplicate signatures are dropped.
+    """
+
+    LABEL = "documents"
+    model = Document
+
+    @staticmethod
+    def files(document_ids) -> list[RetainedFile]:
+        files = []
+        versions = (
+            DocumentVersion.objects.filter(document_id__in=document_ids)
+            .select_related("blob")
+            .only("blob__storage_path", "blob__size", "file_url", "file_size")
+        )
+        for version in versions:
+            if version.blob_id:
+                files.append(RetainedFile(version.blob.storage_path, version.blob.size, version.blob_id))
+            elif storage_path := storage_path_from_url(version.file_url):
+                files.append(RetainedFile(storage_path, version.file_size or 0))
+        return files
+
+    @staticmethod
+    def archive(document_ids) -> tuple[list[ExportEntry], list[dict]]:
+        _, entries, manifest = DocumentExportService.archive(
+            {"document_ids": list(document_ids), "versions": "all", "include_deleted": True}
+        )
+        return entries, manifest["documents"]
+
+    @staticmethod
+    def purge(document_ids) -> None:
+        DuplicateDetectionService.remove_groups(ContentSignature.Source.DOCUMENT_VERSION, document_ids)
+        Document.all_objects.filter(pk__in=document_ids).hard_delete()
+
+    @staticmethod
+    def paths_in_use(storage_paths: Iterable[str]) -> set[str]:
+        return RetentionService.referenced_paths(DocumentVersion.objects.all(), storage_paths)
+
+
+class DocumentAccessLogService:
+    """Buffered writes for document view/download events.
+
+    Events are appended to a Redis list and written with ``bulk_create`` by
+    ``flush`` — triggered once ``DMS_ACCESS_LOG_FLUSH_SIZE`` events are pending
+    and every ``DMS_ACCESS_LOG_FLUSH_SECONDS`` by Celery beat. Readers call
+    ``flush`` first so the compliance screen sees every recorded event. Without
+    Redis the events are written immediately.
+    """
+
+    BUFFER_KEY = "dms:access-log:buffer"
+
+    @staticmethod
+    def _client():
+        return get_redis() if settings.DMS_ACCESS_LOG_BUFFERED else None
+
+    @staticmethod
+    def event(document: Document, user, action: str, timestamp=None) -> dict:
+        return {
+            "document": str(document.pk),
+            "user": str(user.pk) if user is not None and user.is_authenticated else None,
+            "action": action,
+            "sensitivity": document.sensitivity,
+            "timestamp": (timestamp or timezone.now()).isoformat(),
+        }
+
+    @classmethod
+    def record(cls, events: list[dict]) -> int:
+        """Queue ``events`` (see ``event``) for writing; returns the number accepted."""
+
+        if not events:
+            return 0
+        client = cls._client()
+        if client is not None:
+            try:
+                pending = client.rpush(cls.BUFFER_KEY, *(json.dumps(event) for event in events))
+            except RedisError:
+                logger.warning("Access log buffer unavailable; writing %s events directly", len(events), exc_info=True)
+            else:
+                threshold = settings.DMS_ACCESS_LOG_FLUSH_SIZE
+                if pending - len(events) < threshold <= pending:
+                    from .tasks import queue_access_log_flush
+
+                    queue_access_log_flush()
+                return len(events)
+        cls.write(events)
+        return len(events)
+
+    @staticmethod
+    def write(events: list[dict]) -> list[DocumentAccessLog]:
+        """Insert ``events`` in one statement, dropping those whose document no longer exists."""
+
+        document_ids = {event["document"] for event in events}
+        user_ids = {event["user"] for event in events if event.get("user")}
+        existing_documents = {
+            str(pk) for pk in Document.all_objects.filter(pk__in=document_ids).values_list("pk", flat=True)
+        }
+        user_model = DocumentAccessLog._meta.get_field("user").remote_field.model
+        existing_users = {str(pk) for pk in user_model.objects.filter(pk__in=user_ids).values_list("pk", flat=True)}
+
+        rows = [
+            DocumentAccessLog(
+                document_id=event["document"],
+                user_id=event["user"] if event.get("user") in existing_users else None,
+                action=event["action"],
+                sensitivity=event["sensitivity"],
+                timestamp=parse_datetime(event["timestamp"]) or timezone.now(),
+            )
+            for event in events
+            if event["document"] in existing_documents
+        ]
+        return DocumentAccessLog.objects.bulk_create(rows)
+
+    @classmethod
+    def flush(cls, batch_size: int | None = None) -> int:
+        """Write every buffered event; returns the number of rows inserted."""
+
+        client = cls._client()
+        if client is None:
+            return 0
+        batch_size = batch_size or settings.DMS_ACCESS_LOG_FLUSH_SIZE
+        written = 0
+        while True:
+            try:
+                raw = client.lpop(cls.BUFFER_KEY, batch_size)
+            except RedisError:
+                logger.warning("Unable to read the access log buffer", exc_info=True)
+                return written
+            if not raw:
+                return written
+            try:
+                written += len(cls.write([json.loads(item) for item in raw]))
+            except Exception:
+                # Put the batch back at the head so nothing is lost.
+                client.lpush(cls.BUFFER_KEY, *reversed(raw))
+                raise
+            if len(raw) < batch_size:
+                return written
+
+
+class EditorPresenceService:
+    """Who is viewing or editing a document, kept in Redis rather than Postgres.
+
+    Each document has a sorted set of user ids scored by when their presence
+    expires (last heartbeat + ``DMS_EDITOR_PRESENCE_TTL_SECONDS``) and a hash
+    of session payloads; a per-user set answers "where am I present". Expired
+    members are pruned on read and by the ``dms.prune_editor_presence`` task,
+    and joins/leaves are pushed to the ``document_presence_<id>`` channel group.
+    """
+
+    PREFIX = "dms:presence"
+    DOCUMENTS_KEY = f"{PREFIX}:documents"
+
+    @classmethod
+    def _document_key(cls, document_id) -> str:
+        return f"{cls.PREFIX}:doc:{document_id}"
+
+    @classmethod
+    def _sessions_key(cls, document_id) -> str:
+        return f"{cls.PREFIX}:doc:{document_id}:sessions"
+
+    @classmethod
+    def _user_key(cls, user_id) -> str:
+        return f"{cls.PREFIX}:user:{user_id}"
+
+    @classmethod
+    def _session_key(cls, session_id) -> str:
+        return f"{cls.PREFIX}:session:{session_id}"
+
+    @staticmethod
+    def group_name(document_id) -> str:
+        return f"document_presence_{document_id}"
+
+    @staticmethod
+    def ttl() -> int:
+        return settings.DMS_EDITOR_PRESENCE_TTL_SECONDS
+
+    @staticmethod
+    def session_id(document_id, user_id) -> str:
+        """Stable per (document, user), like the old ``unique_together`` row."""
+
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"dms-presence:{document_id}:{user_id}"))
+
+    @classmethod
+    def heartbeat(cls, document_id, user, *, note: str | None = None, user_payload=None) -> tuple[dict, bool]:
+        """Join or refresh ``user``'s presence on a document; returns ``(session, joined)``."""
+
+        client = get_redis()
+        document_id, user_id = str(document_id), str(user.pk)
+        now = timezone.now()
+        raw = client.hget(cls._sessions_key(document_id), user_id)
+        session = json.loads(raw) if raw else None
+        joined = session is None or float(client.zscore(cls._document_key(document_id), user_id) or 0) <= now.timestamp()
+        if joined:
+            session = {
+                "id": cls.session_id(document_id, user_id),
+                "document": document_id,
+                "user": user_payload if user_payload is not None else {"id": user.pk, "username": user.username},
+                "since": now.isoformat(),
+                "note": "",
+                "is_active": True,
+                "created_at": now.isoformat(),
+            }
+        if note is not None:
+            session["note"] = note
+        session["updated_at"] = now.isoformat()
+
+        ttl = cls.ttl()
+        expires_at = now.timestamp() + ttl
+        pipe = client.pipeline()
+        pipe.zadd(cls._document_key(document_id), {user_id: expires_at})
+        pipe.hset(cls._sessions_key(document_id), user_id, json.dumps(session))
+        pipe.zadd(cls._user_key(user_id), {document_id: expires_at})
+        pipe.set(cls._session_key(session["id"]), f"{document_id}:{user_id}", ex=ttl)
+        pipe.zadd(cls.DOCUMENTS_KEY, {document_id: expires_at})
+        for key in (cls._document_key(document_id), cls._sessions_key(document_id), cls._user_key(user_id)):
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+        if joined:
+            cls._publish(document_id, "editor.joined", session)
+        return session, joined
+
+    @classmethod
+    def leave(cls, document_id, user_id, *, reason: str = "left") -> dict | None:
+        """Remove a presence entry; returns the removed session, if any."""
+
+        client = get_redis()
+        document_id, user_id = str(document_id), str(user_id)
+        raw = client.hget(cls._sessions_key(document_id), user_id)
+        pipe = client.pipeline()
+        pipe.zrem(cls._document_key(document_id), user_id)
+        pipe.hdel(cls._sessions_key(document_id), user_id)
+        pipe.zrem(cls._user_key(user_id), document_id)
+        pipe.delete(cls._session_key(cls.session_id(document_id, user_id)))
+        removed = pipe.execute()[0]
+        if not raw or not removed:
+            return None
+        session = json.loads(raw)
+        session["is_active"] = False
+        cls._publish(document_id, "editor.left", session, reason=reason)
+        return session
+
+    @classmethod
+    def prune(cls, document_id) -> int:
+        """Drop (and announce) members whose heartbeat has lapsed."""
+
+        client = get_redis()
+        expired = client.zrangebyscore(cls._document_key(document_id), "-inf", timezone.now().timestamp())
+        for user_id in expired:
+            cls.leave(document_id, user_id, reason="expired")
+        return len(expired)
+
+    @classmethod
+    def prune_all(cls) -> int:
+        """Prune every document with presence and forget documents nobody is on."""
+
+        client = get_redis()
+        pruned = sum(cls.prune(document_id) for document_id in client.zrange(cls.DOCUMENTS_KEY, 0, -1))
+        client.zremrangebyscore(cls.DOCUMENTS_KEY, "-inf", timezone.now().timestamp())
+        return pruned
+
+    @classmethod
+    def active(cls, document_id) -> list[dict]:
+        """Current sessions on a document, oldest first."""
+
+        client = get_redis()
+        cls.prune(document_id)
+        user_ids = client.zrangebyscore(cls._document_key(document_id), timezone.now().timestamp(), "+inf")
+        if not user_ids:
+            return []
+        sessions = [json.loads(raw) for raw in client.hmget(cls._sessions_key(document_id), user_ids) if raw]
+        return sorted(sessions, key=lambda session: session["since"])
+
+    @classmethod
+    def for_user(cls, user_id) -> list[dict]:
+        """Every document ``user_id`` is currently present on."""
+
+        client = get_redis()
+        user_id = str(user_id)
+        document_ids = client.zrangebyscore(cls._user_key(user_id), timezone.now().timestamp(), "+inf")
+        sessions = []
+        for document_id in document_ids:
+            raw = client.hget(cls._sessions_key(document_id), user_id)
+            if raw:
+                sessions.append(json.loads(raw))
+        return sorted(sessions, key=lambda session: session["since"])
+
+    @classmethod
+    def get(cls, session_id) -> dict | None:
+        client = get_redis()
+        location = client.get(cls._session_key(session_id))
+        if not location:
+            return None
+        document_id, user_id = location.split(":", 1)
+        raw = client.hget(cls._sessions_key(document_id), user_id)
+        return json.loads(raw) if raw else None
+
+    @classmethod
+    def _publish(cls, document_id, event_type: str, session: dict, **extra) -> None:
+        from channels.layers import get_channel_layer
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(
+                cls.group_name(document_id),
+                {"type": event_type, "session": session, **extra},
+            )
+        except Exception:  # noqa: BLE001 - presence must not fail because the channel layer is down
+            logger.warning("Unable to publish %s for document %s", event_type, document_id, exc_info=True)
+
+
+class DocumentTextExtractionService:
+    """Fills ``content_text``/``ocr_text`` for uploaded versions.
+
+    The native text layer is tried first; scanned PDFs and images fall back to
+    Tesseract OCR, one page at a time. Runs from the ``dms.extract_version_text``
+    Celery task so uploads never wait on OCR.
+    """
+
+    IMAGE_TYPES = {"image/png", "image/jpeg"}
+    PLAIN_TEXT_TYPES = {"text/plain", "text/csv"}
+    DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    @classmethod
+    def extract(cls, version: DocumentVersion) -> DocumentVersion:
+        """Extract text for ``version`` and persist the outcome on the row."""
+
+        DocumentVersion.objects.filter(pk=version.pk).update(
+            extraction_status=DocumentVersion.ExtractionStatus.PROCESSING,
+        )
+        try:
+            content_text, ocr_text = cls._extract_text(version)
+        except Exception as exc:  # noqa: BLE001 - status must record any failure
+            logger.exception("Text extraction failed for document version %s", version.pk)
+            version.extraction_status = DocumentVersion.ExtractionStatus.FAILED
+            version.extraction_error = str(exc)[:2000]
+        else:
+            if content_text is None and ocr_text is None:
+                version.extraction_status = DocumentVersion.ExtractionStatus.SKIPPED
+            else:
+                version.content_text = content_text or version.content_text
+                version.ocr_text = ocr_text or version.ocr_text
+                version.extraction_status = DocumentVersion.ExtractionStatus.COMPLETED
+            version.extraction_error = ""
+
+        version.extracted_at = timezone.now()
+        version.save(
+            update_fields=[
+                "content_text",
+                "ocr_text",
+                "extraction_status",
+                "extraction_error",
+                "extracted_at",
+                "updated_at",
+            ]
+        )
+        if version.extraction_status == DocumentVersion.ExtractionStatus.COMPLETED:
+            DocumentDuplicateService.index(version)
+        return version
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _extract_text(cls, version: DocumentVersion) -> tuple[str | None, str | None]:
+        storage_path = storage_path_from_url(version.file_url)
+        if not storage_path or not default_storage.exists(storage_path):
+            # Editor versions already carry the text the author wrote; keep it.
+            if version.content_html and not version.content_text:
+                return strip_tags(version.content_html).strip(), None
+            return None, None
+
+        mime_type = (version.file_type or mimetypes.guess_type(version.file_name)[0] or "").lower()
+        extension = Path(version.file_name or storage_path).suffix.lower()
+
+        with local_copy(storage_path) as local_path:
+            if mime_type == "application/pdf" or extension == ".pdf":
+                return cls._extract_pdf(local_path)
+            if mime_type == cls.DOCX_TYPE or extension == ".docx":
+                return cls._extract_docx(local_path), None
+            if mime_type in cls.IMAGE_TYPES or extension in {".png", ".jpg", ".jpeg"}:
+                return None, cls._ocr_image(local_path)
+            if mime_type in cls.PLAIN_TEXT_TYPES or extension in {".txt", ".csv"}:
+                with open(local_path, "rb") as handle:
+                    return handle.read().decode("utf-8", errors="replace"), None
+        return None, None
+
+    @classmethod
+    def _extract_pdf(cls, path: str) -> tuple[str | None, str | None]:
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(path)
+        page_count = len(reader.pages)
+        page_texts = [(page.extract_text() or "").strip() for page in reader.pages]
+        native_text = "\n\n".join(text for text in page_texts if text)
+
+        min_chars = getattr(settings, "DMS_TEXT_LAYER_MIN_CHARS_PER_PAGE", 25)
+        if page_count and len(native_text) >= min_chars * page_count:
+            return native_text, None
+
+        ocr_text = cls._ocr_pdf(path, page_count)
+        return native_text or None, ocr_text
+
+    @staticmethod
+    def _ocr_pdf(path: str, page_count: int) -> str:
+        from pdf2image import convert_from_path
+        import pytesseract
+
+        max_pages = getattr(settings, "DMS_OCR_MAX_PAGES", 200)
+        workers = max(getattr(settings, "DMS_OCR_WORKERS", 4), 1)
+        language = getattr(settings, "DMS_OCR_LANGUAGE", "eng")
+
+        def ocr_page(page_number: int) -> str:
+            # Render one page at a time so a large scan never sits fully in memory.
+            images = convert_from_path(path, dpi=300, first_page=page_number, last_page=page_number)
+            return "\n".join(pytesseract.image_to_string(image, lang=language) for image in images).strip()
+
+        pages = range(1, min(page_count, max_pages) + 1)
+        # Rasterising and Tesseract both run as child processes, so threads give
+        # real page-level parallelism inside a (daemonic) Celery worker process.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            texts = list(executor.map(ocr_page, pages))
+        return "\n\n".join(text for text in texts if text)
+
+    @staticmethod
+    def _ocr_image(path: str) -> str:
+        from PIL import Image
+        import pytesseract
+
+        language = getattr(settings, "DMS_OCR_LANGUAGE", "eng")
+        with Image.open(path) as image:
+            return pytesseract.image_to_string(image, lang=language).strip()
+
+    @staticmethod
+    def _extract_docx(path: str) -> str:
+        import docx
+
+        document = docx.Document(path)
+        return "\n".join(paragraph.text for paragraph in document.paragraphs if paragraph.text).strip()
+
+
+class ChunkedUploadService:
+    """Streams resumable uploads to storage chunk by chunk.
+
+    Each chunk is spooled to disk and saved as its own part file, so a worker
+    never holds more than one chunk in memory. ``finalize`` concatenates the
+    parts once, hashing as it copies, and validates the assembled file on disk.
+    """
+
+    COPY_BUFFER_SIZE = 64 * 1024
+
+    @staticmethod
+    def default_chunk_size() -> int:
+        return getattr(settings, "DMS_UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024)
+
+    @staticmethod
+    def _part_path(session: DocumentUploadSession, index: int) -> str:
+        return f"dms_uploads/{session.id}/{index:06d}.part"
+
+    @classmethod
+    def start(
+        cls,
+        *,
+        document: Document,
+        user,
+        file_name: str,
+        file_type: str,
+        total_size: int,
+        chunk_size: int | None = None,
+        expected_sha256: str = "",
+        notes: str = "",
+    ) -> DocumentUploadSession:
+        validate_upload_metadata(file_name=file_name, mime_type=file_type, file_size=total_size)
+        max_chunk_size = cls.default_chunk_size()
+        chunk_size = min(chunk_size or max_chunk_size, max_chunk_size)
+        ttl_hours = getattr(settings, "DMS_UPLOAD_SESSION_TTL_HOURS", 24)
+        return DocumentUploadSession.objects.create(
+            document=document,
+            created_by=user,
+            file_name=file_name,
+            file_type=file_type or "",
+            total_size=total_size,
+            chunk_size=chunk_size,
+            expected_sha256=(expected_sha256 or "").lower(),
+            notes=notes or "",
+            expires_at=timezone.now() + timedelta(hours=ttl_hours),
+        )
+
+    @classmethod
+    def expected_chunk_length(cls, session: DocumentUploadSession, index: int) -> int:
+        if index < session.total_chunks - 1:
+            return session.chunk_size
+        return session.total_size - session.chunk_size * (session.total_chunks - 1)
+
+    @classmethod
+    def store_chunk(cls, session: DocumentUploadSession, index: int, stream: IO[bytes]) -> DocumentUploadSession:
+        """Persist chunk ``index`` from ``stream``; re-sending a chunk overwrites it."""
+
+        cls._ensure_open(session)
+        if index < 0 or index >= session.total_chunks:
+            raise ValidationError({"index": f"Chunk index must be between 0 and {session.total_chunks - 1}."})
+
+        expected = cls.expected_chunk_length(session, index)
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+            received = 0
+            while True:
+                block = stream.read(cls.COPY_BUFFER_SIZE)
+                if not block:
+                    break
+                received += len(block)
+                if received > expected:
+                    raise ValidationError({"chunk": f"Chunk {index} exceeds the expected {expected} bytes."})
+                spool.write(block)
+            if received != expected:
+                raise ValidationError({"chunk": f"Chunk {index} must be {expected} bytes, received {received}."})
+
+            spool.seek(0)
+            part_path = cls._part_path(session, index)
+            if default_storage.exists(part_path):
+                default_storage.delete(part_path)
+            default_storage.save(part_path, File(spool, name=Path(part_path).name))
+
+        with transaction.atomic():
+            locked = DocumentUploadSession.objects.select_for_update().get(pk=session.pk)
+            chunks = dict(locked.received_chunks or {})
+            chunks[str(index)] = received
+            locked.received_chunks = chunks
+            locked.save(update_fields=["received_chunks", "updated_at"])
+        return locked
+
+    @classmethod
+    def assemble(cls, session: DocumentUploadSession) -> StoredBlob:
+        """Concatenate the parts and store the result in the content-addressed blob store.
+
+        Returns the referenced ``StoredBlob``; parts are removed afterwards.
+        """
+
+        cls._ensure_open(session)
+        missing = [index for index in range(session.total_chunks) if str(index) not in (session.received_chunks or {})]
+        if missing:
+            raise ValidationError({"chunks": f"Missing chunk(s): {', '.join(str(index) for index in missing[:20])}."})
+        if session.received_bytes != session.total_size:
+            raise ValidationError({"chunks": "Received bytes do not match the declared file size."})
+
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(prefix="ecm-upload-", suffix=Path(session.file_name).suffix) as assembled:
+            for index in range(session.total_chunks):
+                with default_storage.open(cls._part_path(session, index), "rb") as part:
+                    while True:
+                        block = part.read(cls.COPY_BUFFER_SIZE)
+                        if not block:
+                            break
+                        digest.update(block)
+                        size += len(block)
+                        assembled.write(block)
+            assembled.flush()
+
+            checksum = digest.hexdigest()
+            if session.expected_sha256 and session.expected_sha256 != checksum:
+                raise ValidationError({"sha256": "Checksum mismatch; the upload is corrupt and must be retried."})
+
+            validate_file_upload(
+                file_name=session.file_name,
+                mime_type=session.file_type,
+                file_path=assembled.name,
+                file_size=size,
+                field_name="file",
+            )
+
+            assembled.seek(0)
+            blob = BlobStorageService.store_file(
+                assembled,
+                file_name=session.file_name,
+                content_type=session.file_type,
+                sha256=checksum,
+                size=size,
+            )
+
+        cls._delete_parts(session)
+        return blob
+
+    @classmethod
+    def complete(cls, session: DocumentUploadSession, version: DocumentVersion, checksum: str) -> None:
+        session.version = version
+        session.checksum_sha256 = checksum
+        session.status = DocumentUploadSession.Status.COMPLETED
+        session.save(update_fields=["version", "checksum_sha256", "status", "updated_at"])
+
+    @classmethod
+    def abort(cls, session: DocumentUploadSession) -> None:
+        cls._delete_parts(session)
+        if session.status == DocumentUploadSession.Status.OPEN:
+            session.status = DocumentUploadSession.Status.ABORTED
+            session.save(update_fields=["status", "updated_at"])
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        expired = DocumentUploadSession.objects.filter(
+            status=DocumentUploadSession.Status.OPEN,
+            expires_at__lt=timezone.now(),
+        )
+        count = 0
+        for session in expired.iterator():
+            cls.abort(session)
+            count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _ensure_open(session: DocumentUploadSession) -> None:
+        if session.status != DocumentUploadSession.Status.OPEN:
+            raise ValidationError({"detail": f"Upload session is {session.status}."})
+        if session.expires_at <= timezone.now():
+            raise ValidationError({"detail": "Upload session has expired."})
+
+    @classmethod
+    def _delete_parts(cls, session: DocumentUploadSession) -> None:
+        for index in range(session.total_chunks):
+            part_path = cls._part_path(session, index)
+            try:
+                if default_storage.exists(part_path):
+                    default_storage.delete(part_path)
+            except OSError:
+                logger.warning("Unable to delete upload part %s", part_path, exc_info=True)
@@ -0,0 +1,109 @@
+"""Keep the document indexes in step with ORM writes from any path (API, admin, shell)."""
+
+from __future__ import annotations
+
+import threading
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Document, DocumentPermission, DocumentVersion
+from .services import DocumentSearchService, DocumentVisibilityService
+
+# Fields of Document that feed each index.
+SEARCH_FIELDS = {"title", "reference_number", "description", "tags"}
+VISIBILITY_FIELDS = {"author", "author_id", "sensitivity"}
+# Fields of DocumentVersion whose text is part of the document's search vector.
+VERSION_TEXT_FIELDS = {"content_text", "ocr_text"}
+# Permission M2Ms naming the users, divisions and departments a grant covers.
+PRINCIPAL_FIELDS = ("users", "divisions", "departments")
+
+INDEXES = {"search": DocumentSearchService, "visibility": DocumentVisibilityService}
+
+_pending = threading.local()
+
+
+def queue_index_refresh(document_ids, *, search: bool = False, visibility: bool = False) -> None:
+    """Refresh the chosen indexes for ``document_ids`` once the transaction commits.
+
+    Documents queued by several writes in one transaction are refreshed once.
+    """
+
+    for name, wanted in (("search", search), ("visibility", visibility)):
+        if not wanted:
+            continue
+        pending = getattr(_pending, name, None)
+        if pending is None:
+            pending = set()
+            setattr(_pending, name, pending)
+        pending.update(document_id for document_id in document_ids if document_id)
+    # Every write registers the flush; the first one to run drains the sets and the
+    # rest find them empty. Ids left behind by a rolled-back transaction are refreshed
+    # with the next batch, which is harmless.
+    transaction.on_commit(_flush)
+
+
+def _flush() -> None:
+    for name, service in INDEXES.items():
+        document_ids = getattr(_pending, name, None)
+        if document_ids:
+            setattr(_pending, name, set())
+            service.refresh(document_ids)
+
+
+def _affects(update_fields, fields: set) -> bool:
+    return update_fields is None or bool(fields & set(update_fields))
+
+
+@receiver(post_save, sender=Document)
+def document_saved(sender, instance: Document, created: bool, update_fields=None, **kwargs):
+    queue_index_refresh(
+        [instance.pk],
+        search=created or _affects(update_fields, SEARCH_FIELDS),
+        visibility=created or _affects(update_fields, VISIBILITY_FIELDS),
+    )
+
+
+@receiver(post_save, sender=DocumentVersion)
+@receiver(post_delete, sender=DocumentVersion)
+def version_changed(sender, instance: DocumentVersion, update_fields=None, **kwargs):
+    if _affects(update_fields, VERSION_TEXT_FIELDS):
+        queue_index_refresh([instance.document_id], search=True)
+
+
+@receiver(post_save, sender=DocumentPermission)
+@receiver(post_delete, sender=DocumentPermission)
+def permission_changed(sender, instance: DocumentPermission, **kwargs):
+    queue_index_refresh([instance.document_id], visibility=True)
+
+
+@receiver(m2m_changed, sender=Document.workspaces.through)
+def workspaces_changed(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            queue_index_refresh([instance.pk], visibility=True)
+    elif action in ("post_add", "post_remove"):
+        queue_index_refresh(pk_set, visibility=True)
+    elif action == "pre_clear":
+        queue_index_refresh(list(instance.documents.values_list("pk", flat=True)), visibility=True)
+
+
+@receiver(m2m_changed, sender=DocumentPermission.users.through)
+@receiver(m2m_changed, sender=DocumentPermission.divisions.through)
+@receiver(m2m_changed, sender=DocumentPermission.departments.through)
+def permission_principals_changed(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            queue_index_refresh([instance.document_id], visibility=True)
+        return
+    if action in ("post_add", "post_remove"):
+        permissions = DocumentPermission.objects.filter(pk__in=pk_set)
+    elif action == "pre_clear":
+        # ``instance`` is the user, division or department losing all of its grants.
+        field = next(name for name in PRINCIPAL_FIELDS if getattr(DocumentPermission, name).through is sender)
+        permissions = DocumentPermission.objects.filter(**{field: instance})
+    else:
+        return
+    queue_index_refresh(list(permissions.values_list("document_id", flat=True)), visibility=True)
+
@@ -0,0 +1,124 @@
+"""Celery tasks for the document management system."""
+
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+
+from .models import DocumentPermission, DocumentVersion
+from .services import (
+    ChunkedUploadService,
+    DocumentAccessLogService,
+    DocumentShareService,
+    DocumentTextExtractionService,
+    DocumentVersionDeltaService,
+    EditorPresenceService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="dms.extract_version_text", ignore_result=True)
+def extract_version_text(version_id: str) -> None:
+    """Extract searchable text (native layer or OCR) for a stored document version."""
+
+    version = DocumentVersion.objects.filter(pk=version_id).first()
+    if version is None:
+        logger.info("Skipping text extraction for missing document version %s", version_id)
+        return
+    DocumentTextExtractionService.extract(version)
+
+
+@shared_task(name="dms.compact_previous_version", ignore_result=True)
+def compact_previous_version(version_id: str) -> None:
+    """Re-store the version preceding ``version_id`` as a delta against it."""
+
+    version = DocumentVersion.objects.filter(pk=version_id).first()
+    if version is None:
+        logger.info("Skipping delta compaction for missing document version %s", version_id)
+        return
+    DocumentVersionDeltaService.compact_previous(version)
+
+
+@shared_task(name="dms.purge_expired_uploads", ignore_result=True)
+def purge_expired_uploads() -> int:
+    """Abort chunked upload sessions that were never finalized and drop their parts."""
+
+    return ChunkedUploadService.purge_expired()
+
+
+@shared_task(name="dms.notify_document_shared", ignore_result=True)
+def notify_document_shared(permission_id: str, sharer_id: str | None = None) -> int:
+    """Fan out "document shared" notifications for a newly created permission."""
+
+    permission = DocumentPermission.objects.select_related("document").filter(pk=permission_id).first()
+    if permission is None:
+        logger.info("Skipping share notifications for missing document permission %s", permission_id)
+        return 0
+    sharer = DocumentPermission._meta.get_field("users").remote_field.model.objects.filter(pk=sharer_id).first()
+    return DocumentShareService.notify(permission, sharer)
+
+
+@shared_task(name="dms.flush_access_logs", ignore_result=True)
+def flush_access_logs() -> int:
+    """Write buffered document access events to the database."""
+
+    return DocumentAccessLogService.flush()
+
+
+@shared_task(name="dms.prune_editor_presence", ignore_result=True)
+def prune_editor_presence() -> int:
+    """Announce and drop editor presence whose heartbeats have lapsed."""
+
+    return EditorPresenceService.prune_all()
+
+
+def queue_version_text_extraction(version_id) -> None:
+    """Schedule text extraction once the current transaction commits.
+
+    Broker outages are logged rather than raised so the upload request still succeeds;
+    the version stays ``pending`` and can be re-queued later.
+    """
+
+    def _enqueue():
+        try:
+            extract_version_text.delay(str(version_id))
+        except Exception:  # noqa: BLE001 - never fail an upload because the broker is down
+            logger.warning("Unable to queue text extraction for document version %s", version_id, exc_info=True)
+
+    transaction.on_commit(_enqueue)
+
+
+def queue_version_compaction(version_id) -> None:
+    """Schedule delta compaction of the previous version once the new one is committed."""
+
+    def _enqueue():
+        try:
+            compact_previous_version.delay(str(version_id))
+        except Exception:  # noqa: BLE001 - the previous version simply stays a full copy
+            logger.warning("Unable to queue delta compaction for document version %s", version_id, exc_info=True)
+
+    transaction.on_commit(_enqueue)
+
+
+def queue_share_notifications(permission_id, sharer_id) -> None:
+    """Schedule share notifications once the permission is committed."""
+
+    def _enqueue():
+        try:
+            notify_document_shared.delay(str(permission_id), str(sharer_id) if sharer_id else None)
+        except Exception:  # noqa: BLE001 - sharing must not fail because the broker is down
+            logger.warning("Unable to queue share notifications for document permission %s", permission_id, exc_info=True)
+
+    transaction.on_commit(_enqueue)
+
+
+def queue_access_log_flush() -> None:
+    """Flush the access log buffer early once it reaches the batch size."""
+
+    try:
+        flush_access_logs.delay()
+    except Exception:  # noqa: BLE001 - the periodic flush still picks the events up
+        logger.warning("Unable to queue an access log flush", exc_info=True)
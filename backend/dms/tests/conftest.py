@@ -0,0 +1,99 @@
+"""Shared fixtures for DMS tests."""
+
+from __future__ import annotations
+
+import pytest
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the DMS services."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+
+    # Lists
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+        return len(self.data[key])
+
+    def lpush(self, key, *values):
+        self.data[key] = list(reversed(values)) + self.data.get(key, [])
+        return len(self.data[key])
+
+    def lpop(self, key, count):
+        items = self.data.get(key, [])
+        popped, self.data[key] = items[:count], items[count:]
+        return popped or None
+
+    # Hashes
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def hdel(self, key, field):
+        return int(self.data.get(key, {}).pop(field, None) is not None)
+
+    # Sorted sets
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def zscore(self, key, member):
+        return self.data.get(key, {}).get(member)
+
+    def zrem(self, key, member):
+        return int(self.data.get(key, {}).pop(member, None) is not None)
+
+    def zrange(self, key, start, end):
+        return sorted(self.data.get(key, {}), key=self.data.get(key, {}).get)
+
+    def zrangebyscore(self, key, low, high):
+        low, high = float(low), float(high)
+        return [member for member in self.zrange(key, 0, -1) if low <= self.data[key][member] <= high]
+
+    def zremrangebyscore(self, key, low, high):
+        for member in self.zrangebyscore(key, low, high):
+            self.zrem(key, member)
+
+    # Strings and keys
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr("dms.services.get_redis", lambda: client)
+    return client
@@ -0,0 +1,101 @@
+"""Tests for buffered document access logging."""
+
+from __future__ import annotations
+
+import pytest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms import services
+from dms.models import Document, DocumentAccessLog
+from dms.services import DocumentVisibilityService
+
+
+@pytest.fixture()
+def buffer(settings, monkeypatch, fake_redis):
+    settings.DMS_ACCESS_LOG_BUFFERED = True
+    settings.DMS_ACCESS_LOG_FLUSH_SIZE = 3
+    queued = []
+    monkeypatch.setattr("dms.tasks.queue_access_log_flush", lambda: queued.append(True))
+    return fake_redis, queued
+
+
+@pytest.fixture()
+def client_and_document(db):
+    user = User.objects.create(username="reader")
+    document = Document.objects.create(title="Tariff schedule", document_type=Document.DocumentType.POLICY, author=user)
+    DocumentVisibilityService.refresh([document.id])
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, document
+
+
+def test_batch_is_buffered_then_flushed_in_bulk(buffer, client_and_document, django_assert_max_num_queries):
+    fake, queued = buffer
+    client, document = client_and_document
+    events = [{"document": str(document.id), "action": "view"} for _ in range(4)]
+
+    response = client.post("/api/v1/dms/access-logs/batch/", {"events": events}, format="json")
+
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 4}
+    assert not DocumentAccessLog.objects.exists()
+    assert len(fake.data[services.DocumentAccessLogService.BUFFER_KEY]) == 4
+    assert queued == [True]
+
+    with django_assert_max_num_queries(6):
+        assert services.DocumentAccessLogService.flush() == 4
+    assert DocumentAccessLog.objects.filter(document=document, sensitivity=document.sensitivity).count() == 4
+
+
+def test_listing_flushes_pending_events(buffer, client_and_document):
+    client, document = client_and_document
+    before = timezone.now()
+    client.post(
+        "/api/v1/dms/access-logs/batch/",
+        {"events": [{"document": str(document.id), "action": "download", "timestamp": "2024-01-02T03:04:05Z"}]},
+        format="json",
+    )
+
+    response = client.get(f"/api/v1/dms/access-logs/?document={document.id}")
+
+    results = response.json()["results"] if isinstance(response.json(), dict) else response.json()
+    assert [row["action"] for row in results] == ["download"]
+    # Client timestamps are ignored; the server stamps events on arrival.
+    assert parse_datetime(results[0]["timestamp"]) >= before
+
+
+def test_events_for_documents_the_user_cannot_see_are_rejected(buffer, client_and_document):
+    client, _ = client_and_document
+    hidden = Document.objects.create(
+        title="Board paper",
+        document_type=Document.DocumentType.REPORT,
+        sensitivity=Document.Sensitivity.RESTRICTED,
+        author=User.objects.create(username="secretary"),
+    )
+    DocumentVisibilityService.refresh([hidden.id])
+
+    response = client.post(
+        "/api/v1/dms/access-logs/batch/",
+        {"events": [{"document": str(hidden.id), "action": "view"}]},
+        format="json",
+    )
+
+    assert response.status_code == 400
+    assert not DocumentAccessLog.objects.exists()
+
+
+def test_events_are_written_directly_without_buffer(settings, client_and_document):
+    settings.DMS_ACCESS_LOG_BUFFERED = False
+    client, document = client_and_document
+
+    response = client.post(
+        "/api/v1/dms/access-logs/batch/",
+        {"events": [{"document": str(document.id), "action": "view"}]},
+        format="json",
+    )
+
+    assert response.status_code == 202
+    assert DocumentAccessLog.objects.filter(document=document).count() == 1
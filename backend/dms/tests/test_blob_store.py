@@ -0,0 +1,73 @@
+"""Tests for the content-addressed blob store behind document versions."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+
+import pytest
+from django.core.files.storage import default_storage
+
+from accounts.models import User
+from common.models import StoredBlob
+from common.services import BlobStorageService
+from dms.models import Document, DocumentVersion
+
+
+@pytest.fixture()
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_identical_content_is_stored_once(media_root):
+    payload = b"scanned letter"
+
+    first = BlobStorageService.store_bytes(payload, file_name="letter.pdf", content_type="application/pdf")
+    second = BlobStorageService.store_bytes(payload, file_name="copy of letter.pdf")
+
+    assert first.pk == second.pk
+    assert second.ref_count == 2
+    assert first.sha256 == hashlib.sha256(payload).hexdigest()
+    assert first.storage_path.endswith(f"{first.sha256}.pdf")
+    assert StoredBlob.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_collect_garbage_keeps_referenced_blobs(media_root):
+    user = User.objects.create(username="archivist")
+    document = Document.objects.create(title="Memo", document_type=Document.DocumentType.REPORT, author=user)
+    kept = BlobStorageService.store_bytes(b"kept", file_name="kept.txt")
+    orphan = BlobStorageService.store_bytes(b"orphan", file_name="orphan.txt")
+    DocumentVersion.objects.create(document=document, version_number=1, file_name="kept.txt", file_size=4, blob=kept)
+    # A drifted counter must not cause a referenced blob to be collected.
+    BlobStorageService.release(kept.pk)
+
+    removed = BlobStorageService.collect_garbage(grace_hours=0)
+
+    assert [blob.pk for blob in removed] == [orphan.pk]
+    assert not default_storage.exists(orphan.storage_path)
+    assert default_storage.exists(kept.storage_path)
+    assert BlobStorageService.recount() == 1
+    kept.refresh_from_db()
+    assert kept.ref_count == 1
+
+
+@pytest.mark.django_db
+def test_rejected_version_upload_releases_its_blob(media_root):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(User.objects.create(username="clerk"))
+    payload = base64.b64encode(b"plain text memo").decode()
+
+    response = client.post(
+        "/api/v1/dms/versions/",
+        {"file_url": f"data:text/plain;base64,{payload}", "file_name": "memo.txt"},
+        format="json",
+    )
+
+    assert response.status_code == 400
+    assert "document" in response.data["details"]
+    assert StoredBlob.objects.get().ref_count == 0
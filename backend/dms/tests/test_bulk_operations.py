@@ -0,0 +1,76 @@
+"""Tests for the bulk document operations endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from audit.models import ActivityLog
+from dms.models import Document, DocumentWorkspace
+from dms.services import DocumentVisibilityService
+
+
+@pytest.fixture()
+def owner_and_documents(db):
+    owner = User.objects.create(username="registry")
+    documents = [
+        Document.objects.create(
+            title=f"Letter {index}",
+            document_type=Document.DocumentType.LETTER,
+            author=owner,
+            tags=["inbound"],
+        )
+        for index in range(4)
+    ]
+    DocumentVisibilityService.refresh()
+    client = APIClient()
+    client.force_authenticate(owner)
+    return client, documents
+
+
+def _bulk(client, payload):
+    return client.post("/api/v1/dms/documents/bulk/", payload, format="json")
+
+
+def test_bulk_update_and_tags_are_set_based(owner_and_documents, django_assert_max_num_queries):
+    client, documents = owner_and_documents
+    ids = [str(document.id) for document in documents[:3]]
+
+    with django_assert_max_num_queries(20):
+        response = _bulk(client, {"action": "update", "ids": ids, "status": "archived", "sensitivity": "confidential"})
+    assert response.status_code == 200, response.content
+    assert response.json()["count"] == 3
+
+    response = _bulk(client, {"action": "add_tags", "filter": {"status": "archived"}, "tags": ["2024", "inbound"]})
+    assert response.json()["count"] == 3
+    _bulk(client, {"action": "remove_tags", "ids": ids[:1], "tags": ["inbound"]})
+
+    refreshed = {str(document.id): document for document in Document.all_objects.all()}
+    assert refreshed[ids[0]].tags == ["2024"]
+    assert refreshed[ids[1]].tags == ["inbound", "2024"]
+    assert refreshed[ids[1]].sensitivity == Document.Sensitivity.CONFIDENTIAL
+    assert refreshed[str(documents[3].id)].status == Document.DocumentStatus.DRAFT
+    assert ActivityLog.objects.filter(object_id=ids[1], metadata__bulk_action="update").count() == 1
+
+
+def test_bulk_workspaces_delete_and_restore(owner_and_documents):
+    client, documents = owner_and_documents
+    workspace = DocumentWorkspace.objects.create(slug="legal", name="Legal")
+    ids = [str(document.id) for document in documents]
+
+    assert _bulk(client, {"action": "add_workspaces", "ids": ids, "workspace_ids": [str(workspace.id)]}).json()["count"] == 4
+    assert workspace.documents.count() == 4
+
+    assert _bulk(client, {"action": "delete", "ids": ids[:2]}).json()["count"] == 2
+    assert Document.objects.count() == 2
+    assert _bulk(client, {"action": "restore", "ids": ids}).json()["count"] == 2
+    assert Document.objects.count() == 4
+
+
+def test_bulk_requires_a_selection(owner_and_documents):
+    client, _ = owner_and_documents
+
+    response = _bulk(client, {"action": "delete"})
+
+    assert response.status_code == 400
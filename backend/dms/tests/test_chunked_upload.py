@@ -0,0 +1,97 @@
+"""Tests for the resumable chunked upload API."""
+
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+from django.core.files.storage import default_storage
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentUploadSession
+
+
+@pytest.fixture()
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture()
+def client_and_document(db):
+    user = User.objects.create(username="uploader")
+    document = Document.objects.create(title="Scanned survey", document_type=Document.DocumentType.REPORT, author=user)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, document
+
+
+def _start(client, document, payload: bytes, chunk_size: int, **extra):
+    response = client.post(
+        "/api/v1/dms/uploads/",
+        {
+            "document": str(document.id),
+            "file_name": "survey.txt",
+            "file_type": "text/plain",
+            "total_size": len(payload),
+            "chunk_size": chunk_size,
+            **extra,
+        },
+        format="json",
+    )
+    assert response.status_code == 201, response.content
+    return response.json()
+
+
+def _put_chunk(client, session_id, index, data: bytes):
+    return client.put(
+        f"/api/v1/dms/uploads/{session_id}/chunks/{index}/",
+        data=data,
+        content_type="application/octet-stream",
+    )
+
+
+def test_chunked_upload_assembles_version(media_root, client_and_document):
+    client, document = client_and_document
+    chunk_size = 64 * 1024
+    payload = b"x" * chunk_size + b"tail bytes"
+    session = _start(client, document, payload, chunk_size, expected_sha256=hashlib.sha256(payload).hexdigest())
+    assert session["total_chunks"] == 2
+
+    # Chunks may arrive out of order and be retried.
+    assert _put_chunk(client, session["id"], 1, payload[chunk_size:]).status_code == 200
+    assert _put_chunk(client, session["id"], 0, payload[:chunk_size]).status_code == 200
+    assert _put_chunk(client, session["id"], 0, payload[:chunk_size]).json()["received_bytes"] == len(payload)
+
+    response = client.post(f"/api/v1/dms/uploads/{session['id']}/finalize/")
+    assert response.status_code == 201, response.content
+    assert response.json()["file_size"] == len(payload)
+    assert response.json()["version_number"] == 1
+
+    stored = DocumentUploadSession.objects.get(pk=session["id"])
+    assert stored.status == DocumentUploadSession.Status.COMPLETED
+    assert stored.checksum_sha256 == hashlib.sha256(payload).hexdigest()
+    assert not default_storage.exists(f"dms_uploads/{stored.id}/000000.part")
+
+
+def test_chunk_with_wrong_length_is_rejected(media_root, client_and_document):
+    client, document = client_and_document
+    session = _start(client, document, b"y" * 70_000, 64 * 1024)
+
+    response = _put_chunk(client, session["id"], 0, b"short")
+
+    assert response.status_code == 400
+
+
+def test_finalize_requires_every_chunk(media_root, client_and_document):
+    client, document = client_and_document
+    chunk_size = 64 * 1024
+    payload = b"z" * (chunk_size + 1)
+    session = _start(client, document, payload, chunk_size)
+    _put_chunk(client, session["id"], 0, payload[:chunk_size])
+
+    response = client.post(f"/api/v1/dms/uploads/{session['id']}/finalize/")
+
+    assert response.status_code == 400
+    assert not document.versions.exists()
@@ -0,0 +1,55 @@
+"""Tests for the threaded comment tree endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentComment
+from dms.services import DocumentVisibilityService
+
+
+@pytest.fixture()
+def thread(db):
+    author = User.objects.create(username="harbourmaster")
+    reviewer = User.objects.create(username="reviewer")
+    document = Document.objects.create(title="Dredging plan", document_type=Document.DocumentType.REPORT, author=author)
+    DocumentVisibilityService.refresh([document.id])
+    root = DocumentComment.objects.create(document=document, author=author, content="Check the depths")
+    reply = DocumentComment.objects.create(document=document, author=reviewer, parent=root, content="Updated")
+    nested = DocumentComment.objects.create(document=document, author=author, parent=reply, content="Thanks")
+    other = DocumentComment.objects.create(document=document, author=reviewer, content="Approved")
+    client = APIClient()
+    client.force_authenticate(author)
+    return client, document, root, reply, nested, other
+
+
+def test_comment_tree_nests_replies_with_author_side_table(thread, django_assert_max_num_queries):
+    client, document, root, reply, nested, other = thread
+
+    with django_assert_max_num_queries(3):
+        response = client.get(f"/api/v1/dms/documents/{document.id}/comment-tree/")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 4
+    assert [comment["id"] for comment in data["comments"]] == [str(root.id), str(other.id)]
+    assert data["comments"][0]["replies"][0]["replies"][0]["id"] == str(nested.id)
+    assert {author["username"] for author in data["authors"].values()} == {"harbourmaster", "reviewer"}
+
+
+def test_comment_tree_since_returns_changes_and_current_ids(thread):
+    client, document, root, reply, nested, other = thread
+    checkpoint = timezone.now()
+    nested.content = "Thanks, resolved"
+    nested.save()
+    other.delete()
+
+    data = client.get(
+        f"/api/v1/dms/documents/{document.id}/comment-tree/", {"since": checkpoint.isoformat()}
+    ).json()
+
+    assert [(comment["id"], comment["parent"]) for comment in data["comments"]] == [(str(nested.id), str(reply.id))]
+    assert set(data["ids"]) == {str(root.id), str(reply.id), str(nested.id)}
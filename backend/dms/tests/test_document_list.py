@@ -0,0 +1,62 @@
+"""Tests for the lightweight document list representation."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentVisibilityService
+
+
+@pytest.fixture()
+def client_and_user(db):
+    user = User.objects.create(username="records-officer")
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, user
+
+
+def _document_with_versions(user, title: str, versions: int) -> Document:
+    document = Document.objects.create(title=title, document_type=Document.DocumentType.REPORT, author=user)
+    for number in range(1, versions + 1):
+        DocumentVersion.objects.create(
+            document=document,
+            version_number=number,
+            file_name=f"{title}-v{number}.txt",
+            file_type="text/plain",
+            file_size=10,
+            content_html="<p>large body</p>",
+            content_text="large body",
+        )
+    DocumentVisibilityService.refresh([document.id])
+    return document
+
+
+def test_list_returns_latest_version_summary(client_and_user, django_assert_max_num_queries):
+    client, user = client_and_user
+    for index in range(5):
+        _document_with_versions(user, f"Memo {index}", versions=3)
+
+    with django_assert_max_num_queries(8):
+        response = client.get("/api/v1/dms/documents/")
+
+    assert response.status_code == 200
+    row = response.json()["results"][0]
+    assert "versions" not in row and "permissions" not in row
+    assert row["version_count"] == 3
+    assert row["latest_version"]["version_number"] == 3
+    assert "content_html" not in row["latest_version"]
+    assert row["author"]["username"] == "records-officer"
+
+
+def test_full_versions_are_opt_in(client_and_user):
+    client, user = client_and_user
+    document = _document_with_versions(user, "Circular", versions=2)
+
+    listed = client.get("/api/v1/dms/documents/", {"include_versions": "true"}).json()["results"][0]
+    detail = client.get(f"/api/v1/dms/documents/{document.id}/").json()
+
+    assert len(listed["versions"]) == 2
+    assert detail["versions"][0]["content_html"] == "<p>large body</p>"
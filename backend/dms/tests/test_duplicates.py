@@ -0,0 +1,97 @@
+"""Tests for exact and near-duplicate detection on new document versions."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from common.models import ContentSignature
+from common.services import BlobStorageService
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentDuplicateService, DocumentVisibilityService
+
+LETTER = " ".join(
+    f"Paragraph {index}: the authority acknowledges receipt of your request for berth allocation at terminal {index}."
+    for index in range(30)
+)
+
+
+@pytest.fixture()
+def author(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return User.objects.create(username="registry")
+
+
+def _document(author, title, sensitivity=Document.Sensitivity.INTERNAL):
+    document = Document.objects.create(
+        title=title,
+        document_type=Document.DocumentType.LETTER,
+        sensitivity=sensitivity,
+        author=author,
+    )
+    DocumentVisibilityService.refresh([document.id])
+    return document
+
+
+def _version(document, **fields):
+    version = DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name=fields.pop("file_name", "letter"),
+        file_type=fields.pop("file_type", "text/html"),
+        file_size=0,
+        uploaded_by=document.author,
+        **fields,
+    )
+    DocumentDuplicateService.index(version)
+    return version
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_create_reports_near_duplicates(author):
+    original = _document(author, "Berth request")
+    _version(original, content_html=f"<p>{LETTER}</p>")
+    unrelated = _document(author, "Canteen menu")
+    _version(unrelated, content_html="<p>" + " ".join(f"dish {i} served daily" for i in range(60)) + "</p>")
+    rescan = _document(author, "Berth request (copy)")
+
+    response = _client(author).post(
+        "/api/v1/dms/versions/",
+        {
+            "document": str(rescan.id),
+            "file_name": "letter",
+            "file_type": "text/html",
+            "file_size": 0,
+            "content_html": f"<p>{LETTER.replace('Paragraph 3:', 'Para 3:')}</p>",
+        },
+        format="json",
+    )
+
+    assert response.status_code == 201
+    duplicates = response.data["probable_duplicates"]
+    assert [(item["document"], item["match"]) for item in duplicates] == [(str(original.id), "near")]
+    assert 0.8 <= duplicates[0]["similarity"] < 1
+    assert ContentSignature.objects.filter(object_id=response.data["id"]).exists()
+
+
+def test_shared_blob_is_exact_duplicate_and_hidden_documents_are_skipped(author):
+    blob = BlobStorageService.store_bytes(b"%PDF-1.4 scanned letter", file_name="scan.pdf", content_type="application/pdf")
+    visible = _document(author, "Scan")
+    _version(visible, file_name="scan.pdf", file_type="application/pdf", blob=blob)
+    outsider = User.objects.create(username="outsider")
+    hidden = _document(outsider, "Private scan", sensitivity=Document.Sensitivity.CONFIDENTIAL)
+    _version(hidden, file_name="scan.pdf", file_type="application/pdf", blob=blob)
+    upload = _version(_document(author, "Scan again"), file_name="scan.pdf", file_type="application/pdf", blob=blob)
+
+    response = _client(author).get(f"/api/v1/dms/versions/{upload.id}/duplicates/")
+
+    assert response.status_code == 200
+    assert [(item["document"], item["match"], item["similarity"]) for item in response.data["results"]] == [
+        (str(visible.id), "exact", 1.0)
+    ]
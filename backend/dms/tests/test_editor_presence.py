@@ -0,0 +1,86 @@
+"""Tests for Redis-backed editor presence."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document
+from dms.services import DocumentVisibilityService, EditorPresenceService
+
+
+@pytest.fixture()
+def in_memory_channels(settings):
+    settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+@pytest.fixture()
+def document(db):
+    author = User.objects.create(username="drafter")
+    document = Document.objects.create(title="Berth allocation", document_type=Document.DocumentType.MEMO, author=author)
+    DocumentVisibilityService.refresh([document.id])
+    return document
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_join_heartbeat_and_leave_keep_the_session_contract(fake_redis, in_memory_channels, document, django_assert_num_queries):
+    client = _client(document.author)
+    layer = get_channel_layer()
+    async_to_sync(layer.group_add)(EditorPresenceService.group_name(document.id), "listener")
+
+    joined = client.post("/api/v1/dms/editor-sessions/", {"document": str(document.id), "note": "Viewing"}, format="json")
+    assert joined.status_code == 201
+    session = joined.json()
+    assert session["user"]["username"] == "drafter"
+    assert session["is_active"] is True
+    assert async_to_sync(layer.receive)("listener")["type"] == "editor.joined"
+
+    # Heartbeats are answered from Redis alone.
+    with django_assert_num_queries(0):
+        again = client.post("/api/v1/dms/editor-sessions/", {"document": str(document.id)}, format="json")
+    assert again.status_code == 200
+    assert again.json()["id"] == session["id"]
+    assert again.json()["note"] == "Viewing"
+
+    listed = client.get(f"/api/v1/dms/editor-sessions/?document={document.id}&is_active=true").json()
+    assert [item["id"] for item in listed["results"]] == [session["id"]]
+
+    ended = client.patch(f"/api/v1/dms/editor-sessions/{session['id']}/", {"is_active": False}, format="json")
+    assert ended.status_code == 200
+    assert ended.json()["is_active"] is False
+    assert async_to_sync(layer.receive)("listener")["type"] == "editor.left"
+    assert client.get(f"/api/v1/dms/editor-sessions/?document={document.id}").json()["results"] == []
+
+
+def test_lapsed_heartbeats_expire(fake_redis, in_memory_channels, document):
+    client = _client(document.author)
+    client.post("/api/v1/dms/editor-sessions/", {"document": str(document.id)}, format="json")
+
+    key = EditorPresenceService._document_key(document.id)
+    fake_redis.zadd(key, {str(document.author.pk): (timezone.now() - timedelta(seconds=1)).timestamp()})
+
+    assert EditorPresenceService.active(document.id) == []
+    assert EditorPresenceService.for_user(document.author.pk) == []
+
+
+def test_cannot_join_invisible_document(fake_redis, in_memory_channels, document):
+    document.sensitivity = Document.Sensitivity.RESTRICTED
+    document.save()
+    DocumentVisibilityService.refresh([document.id])
+    outsider = User.objects.create(username="outsider")
+
+    response = _client(outsider).post("/api/v1/dms/editor-sessions/", {"document": str(document.id)}, format="json")
+
+    assert response.status_code == 404
+    assert EditorPresenceService.active(document.id) == []
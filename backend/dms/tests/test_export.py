@@ -0,0 +1,90 @@
+"""Tests for streamed and background ZIP exports."""
+
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from common.models import ExportJob
+from common.services import BlobStorageService, ExportJobService
+from dms.models import Document, DocumentAccessLog, DocumentVersion
+from dms.services import DocumentVisibilityService
+
+PAYLOAD = b"%PDF-1.4 " + b"x" * 4096
+
+
+@pytest.fixture()
+def author(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+    settings.DMS_ACCESS_LOG_BUFFERED = False
+    return User.objects.create(username="author")
+
+
+def _document(author, title, **version_fields):
+    document = Document.objects.create(title=title, document_type=Document.DocumentType.REPORT, author=author)
+    version_fields.setdefault("file_name", "report.pdf")
+    DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_type="application/pdf",
+        file_size=version_fields.get("blob").size if version_fields.get("blob") else 0,
+        uploaded_by=author,
+        **version_fields,
+    )
+    DocumentVisibilityService.refresh([document.id])
+    return document
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_export_streams_zip_with_manifest(author):
+    blob = BlobStorageService.store_bytes(PAYLOAD, file_name="report.pdf", content_type="application/pdf")
+    stored = _document(author, "Quarterly report", blob=blob)
+    drafted = _document(author, "Board memo", file_name="memo", content_html="<p>Draft</p>")
+
+    response = _client(author).get("/api/v1/dms/documents/export/")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+    names = archive.namelist()
+    assert names[-1] == "manifest.json"
+    assert archive.read(f"documents/Quarterly report-{str(stored.id)[:8]}/v1-report.pdf") == PAYLOAD
+    assert archive.read(f"documents/Board memo-{str(drafted.id)[:8]}/v1-memo.html") == b"<p>Draft</p>"
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert {doc["title"] for doc in manifest["documents"]} == {"Quarterly report", "Board memo"}
+    assert len(manifest["files"]) == 2 and manifest["missing"] == []
+    assert DocumentAccessLog.objects.filter(action="download").count() == 2
+
+
+def test_large_export_is_queued_as_job(author, settings, monkeypatch):
+    settings.EXPORT_STREAM_MAX_BYTES = 10
+    blob = BlobStorageService.store_bytes(PAYLOAD, file_name="report.pdf", content_type="application/pdf")
+    document = _document(author, "Quarterly report", blob=blob)
+    monkeypatch.setattr("common.tasks.queue_export_job", lambda job_id: None)
+
+    response = _client(author).get(f"/api/v1/dms/documents/export/?ids={document.id}")
+
+    assert response.status_code == 202
+    job = ExportJob.objects.get(pk=response.data["id"])
+    assert job.params["document_ids"] == [str(document.id)]
+
+    ExportJobService.run(job)
+    job.refresh_from_db()
+    assert job.status == ExportJob.Status.COMPLETED and job.expires_at is not None
+
+    download = _client(author).get(f"/api/v1/common/exports/{job.id}/download/")
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(download.streaming_content)))
+    assert PAYLOAD in [archive.read(name) for name in archive.namelist()]
+    assert _client(User.objects.create(username="other")).get(f"/api/v1/common/exports/{job.id}/").status_code == 404
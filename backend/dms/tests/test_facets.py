@@ -0,0 +1,67 @@
+"""Tests for the DMS browser facet counts."""
+
+from __future__ import annotations
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentWorkspace
+from dms.services import DocumentVisibilityService
+from organization.models import Directorate, Division
+
+
+@pytest.fixture()
+def browser(db):
+    cache.clear()
+    directorate = Directorate.objects.create(name="Operations", code="OPS")
+    division = Division.objects.create(name="Marine", code="MAR", directorate=directorate)
+    user = User.objects.create(username="browser")
+    workspace = DocumentWorkspace.objects.create(slug="berths", name="Berths")
+
+    def make(**fields):
+        fields.setdefault("author", user)
+        fields.setdefault("document_type", Document.DocumentType.MEMO)
+        return Document.objects.create(title="Doc", **fields)
+
+    first = make(division=division)
+    first.workspaces.add(workspace, DocumentWorkspace.objects.create(slug="tugs", name="Tugs"))
+    make(document_type=Document.DocumentType.REPORT, status=Document.DocumentStatus.PUBLISHED, division=division)
+    make(status=Document.DocumentStatus.PUBLISHED)
+    make(sensitivity=Document.Sensitivity.RESTRICTED, author=User.objects.create(username="other"))
+    DocumentVisibilityService.refresh()
+    client = APIClient()
+    client.force_authenticate(user)
+    return client, division, workspace
+
+
+def _counts(entries):
+    return {entry["value"]: entry["count"] for entry in entries}
+
+
+def test_facets_count_every_dimension_in_one_query(browser, django_assert_max_num_queries):
+    client, division, workspace = browser
+
+    with django_assert_max_num_queries(4):
+        data = client.get("/api/v1/dms/documents/facets/").json()
+
+    assert data["total"] == 3
+    assert _counts(data["document_type"]) == {"memo": 2, "report": 1}
+    assert _counts(data["status"]) == {"draft": 1, "published": 2}
+    assert _counts(data["sensitivity"]) == {"internal": 3}
+    assert _counts(data["division"]) == {str(division.id): 2, None: 1}
+    assert _counts(data["workspace"])[str(workspace.id)] == 1
+    assert _counts(data["workspace"])[None] == 2
+
+
+def test_facets_apply_filters_and_cache_per_filter_set(browser, django_assert_max_num_queries):
+    client, division, workspace = browser
+
+    published = client.get("/api/v1/dms/documents/facets/", {"status": "published"}).json()
+    assert published["total"] == 2
+    assert _counts(published["document_type"]) == {"memo": 1, "report": 1}
+
+    with django_assert_max_num_queries(2):
+        cached = client.get("/api/v1/dms/documents/facets/", {"status": "published", "page": 3}).json()
+    assert cached == published
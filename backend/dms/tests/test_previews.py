@@ -0,0 +1,79 @@
+"""Tests for cached first-page previews."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+from PIL import Image
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from common.models import StoredBlob
+from common.services import BlobPreviewService, BlobStorageService
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentVisibilityService
+
+
+def _png(width=1200, height=800) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "navy").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture()
+def version(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+    author = User.objects.create(username="author")
+    document = Document.objects.create(title="Site photo", document_type=Document.DocumentType.OTHER, author=author)
+    blob = BlobStorageService.store_bytes(_png(), file_name="site.png", content_type="image/png")
+    version = DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name="site.png",
+        file_type="image/png",
+        file_size=blob.size,
+        blob=blob,
+        uploaded_by=author,
+    )
+    DocumentVisibilityService.refresh([document.id])
+    return version
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_preview_is_pending_until_rendered_then_cached(version):
+    client = _client(version.uploaded_by)
+    url = f"/api/v1/dms/versions/{version.id}/preview/?size=small"
+    assert version.blob.preview_status == StoredBlob.PreviewStatus.PENDING
+
+    assert client.get(url).status_code == 202
+
+    assert BlobPreviewService.render(version.blob) == StoredBlob.PreviewStatus.READY
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/webp"
+    assert "immutable" in response["Cache-Control"]
+    with Image.open(io.BytesIO(b"".join(response.streaming_content))) as image:
+        assert max(image.size) == 160
+
+    etag = response["ETag"]
+    assert etag == f'"{version.blob.sha256}-small.webp"'
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert client.get(f"{url}&image_format=png")["Content-Type"] == "image/png"
+    assert client.get(f"/api/v1/dms/versions/{version.id}/preview/?size=huge").status_code == 400
+
+
+def test_preview_unavailable_for_unsupported_files(version):
+    blob = BlobStorageService.store_bytes(b"plain text", file_name="notes.txt", content_type="text/plain")
+    DocumentVersion.objects.filter(pk=version.pk).update(blob=blob, file_type="text/plain")
+
+    response = _client(version.uploaded_by).get(f"/api/v1/dms/versions/{version.id}/preview/")
+
+    assert response.status_code == 404
+    assert StoredBlob.objects.get(pk=blob.pk).preview_status == StoredBlob.PreviewStatus.UNSUPPORTED
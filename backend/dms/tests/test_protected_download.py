@@ -0,0 +1,119 @@
+"""Tests for authorized version downloads."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from common.services import BlobStorageService
+from dms.models import Document, DocumentAccessLog, DocumentVersion
+from dms.services import DocumentVisibilityService
+
+PAYLOAD = b"0123456789" * 100
+
+
+@pytest.fixture()
+def version(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+    settings.DMS_ACCESS_LOG_BUFFERED = False
+    author = User.objects.create(username="author")
+    document = Document.objects.create(
+        title="Board minutes",
+        document_type=Document.DocumentType.REPORT,
+        sensitivity=Document.Sensitivity.RESTRICTED,
+        author=author,
+    )
+    blob = BlobStorageService.store_bytes(PAYLOAD, file_name="minutes.pdf", content_type="application/pdf")
+    version = DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name="minutes.pdf",
+        file_type="application/pdf",
+        file_size=blob.size,
+        blob=blob,
+        uploaded_by=author,
+    )
+    DocumentVisibilityService.refresh([document.id])
+    return version
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def _url(version):
+    return f"/api/v1/dms/versions/{version.id}/download/"
+
+
+def test_download_streams_file_and_logs_access(version):
+    response = _client(version.uploaded_by).get(_url(version))
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == PAYLOAD
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["ETag"] == f'"{version.blob.sha256}"'
+    assert "attachment" in response["Content-Disposition"]
+    assert DocumentAccessLog.objects.filter(document=version.document, action="download").count() == 1
+
+
+def test_range_and_conditional_requests(version):
+    client = _client(version.uploaded_by)
+
+    partial = client.get(_url(version), HTTP_RANGE="bytes=100-199")
+    assert partial.status_code == 206
+    assert partial["Content-Range"] == f"bytes 100-199/{len(PAYLOAD)}"
+    assert b"".join(partial.streaming_content) == PAYLOAD[100:200]
+
+    assert client.get(_url(version), HTTP_RANGE=f"bytes={len(PAYLOAD)}-").status_code == 416
+    assert client.get(_url(version), HTTP_IF_NONE_MATCH=f'"{version.blob.sha256}"').status_code == 304
+    # Only the request starting at byte 0 counts as an access.
+    assert DocumentAccessLog.objects.filter(document=version.document).count() == 0
+
+
+def test_accel_redirect_hands_off_to_nginx(version, settings):
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media"
+
+    response = _client(version.uploaded_by).get(f"{_url(version)}?inline=true")
+
+    assert response.status_code == 200
+    assert response["X-Accel-Redirect"] == f"/protected-media/{version.blob.storage_path}"
+    assert response["Content-Disposition"].startswith("inline")
+    assert DocumentAccessLog.objects.get(document=version.document).action == "view"
+
+
+def test_download_requires_visibility(version):
+    outsider = User.objects.create(username="outsider")
+
+    response = _client(outsider).get(_url(version))
+
+    assert response.status_code in (403, 404)
+    assert not DocumentAccessLog.objects.exists()
+
+
+def test_version_file_url_must_name_a_file_the_user_can_open(version):
+    outsider = User.objects.create(username="outsider")
+    own = Document.objects.create(title="My memo", document_type=Document.DocumentType.MEMO, author=outsider)
+    DocumentVisibilityService.refresh([own.id])
+    stolen_url = f"http://testserver/media/{version.blob.storage_path}"
+    payload = {
+        "document": str(own.id),
+        "file_name": "copy.pdf",
+        "file_type": "application/pdf",
+        "file_size": version.file_size,
+        "file_url": stolen_url,
+    }
+
+    rejected = _client(outsider).post("/api/v1/dms/versions/", payload, format="json")
+    assert rejected.status_code == 400
+    assert "file_url" in rejected.data["details"]
+
+    payload["document"] = str(version.document_id)
+    reused = _client(version.uploaded_by).post("/api/v1/dms/versions/", payload, format="json")
+    assert reused.status_code == 201
+    assert DocumentVersion.objects.get(pk=reused.data["id"]).blob_id == version.blob_id
+    version.blob.refresh_from_db()
+    assert version.blob.ref_count == 2
@@ -0,0 +1,136 @@
+"""Tests for the batched purge of soft-deleted documents."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from datetime import timedelta
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+
+from accounts.models import User
+from common.models import ContentSignature, StoredBlob
+from common.services import BlobStorageService, RetentionService
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentDuplicateService
+
+LETTER = " ".join(f"Clause {index} of the berth lease renewal for terminal {index}." for index in range(20))
+
+
+@pytest.fixture()
+def author(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return User.objects.create(username="registry")
+
+
+def _document(author, title, payload: bytes, *, deleted_days_ago=None):
+    document = Document.objects.create(title=title, document_type=Document.DocumentType.LETTER, author=author)
+    blob = BlobStorageService.store_bytes(payload, file_name=f"{title}.pdf", content_type="application/pdf")
+    version = DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name=f"{title}.pdf",
+        file_type="application/pdf",
+        file_size=blob.size,
+        blob=blob,
+        content_text=LETTER,
+        uploaded_by=author,
+    )
+    DocumentDuplicateService.index(version)
+    if deleted_days_ago is not None:
+        document.delete()
+        Document.all_objects.filter(pk=document.pk).update(
+            deleted_at=timezone.now() - timedelta(days=deleted_days_ago)
+        )
+    return document, blob
+
+
+def test_soft_delete_and_restore_track_deleted_at(author):
+    document, _ = _document(author, "lease", b"lease")
+
+    Document.objects.filter(pk=document.pk).delete()
+    assert Document.all_objects.get(pk=document.pk).deleted_at is not None
+
+    Document.all_objects.filter(pk=document.pk).restore()
+    assert Document.objects.get(pk=document.pk).deleted_at is None
+
+
+def test_dry_run_reports_without_deleting(author):
+    expired, blob = _document(author, "old", b"old lease", deleted_days_ago=120)
+    _document(author, "recent", b"recent lease", deleted_days_ago=5)
+
+    report = RetentionService.run(labels=["documents"], days=90, dry_run=True)[0]
+
+    assert (report.records, report.files, report.bytes) == (1, 1, blob.size)
+    assert Document.all_objects.filter(pk=expired.pk).exists()
+    assert default_storage.exists(blob.storage_path)
+
+
+def test_purge_deletes_expired_rows_and_unshared_files(author):
+    expired, own_blob = _document(author, "old", b"old lease", deleted_days_ago=120)
+    recent, _ = _document(author, "recent", b"recent lease", deleted_days_ago=5)
+    live, shared_blob = _document(author, "live", b"shared scan")
+    DocumentVersion.objects.create(
+        document=expired,
+        version_number=2,
+        file_name="scan.pdf",
+        file_type="application/pdf",
+        file_size=shared_blob.size,
+        blob=BlobStorageService.store_bytes(b"shared scan", file_name="scan.pdf"),
+        uploaded_by=author,
+    )
+
+    report = RetentionService.run(labels=["documents"], days=90, archive=False, batch_size=1)[0]
+
+    assert (report.records, report.batches, report.files) == (1, 1, 2)
+    assert not Document.all_objects.filter(pk=expired.pk).exists()
+    assert not DocumentVersion.objects.filter(document_id=expired.pk).exists()
+    assert not ContentSignature.objects.filter(group_id=expired.pk).exists()
+    assert not StoredBlob.objects.filter(pk=own_blob.pk).exists()
+    assert not default_storage.exists(own_blob.storage_path)
+    # The live document still references the shared scan.
+    assert StoredBlob.objects.get(pk=shared_blob.pk).ref_count == 1
+    assert default_storage.exists(shared_blob.storage_path)
+    assert Document.all_objects.filter(pk__in=[recent.pk, live.pk]).count() == 2
+
+
+def test_archive_mode_writes_batch_zip(author, capsys):
+    expired, _ = _document(author, "old", b"old lease", deleted_days_ago=120)
+
+    call_command("purge_deleted_records", "--only", "documents", "--archive")
+
+    assert "archived to retention/documents/" in capsys.readouterr().out
+    folder = f"retention/documents/{timezone.now():%Y/%m}"
+    (name,) = default_storage.listdir(folder)[1]
+    with zipfile.ZipFile(default_storage.open(f"{folder}/{name}")) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["records"][0]["id"] == str(expired.pk)
+        assert archive.read(manifest["records"][0]["versions"][0]["path"]) == b"old lease"
+    assert not Document.all_objects.filter(pk=expired.pk).exists()
+
+
+def test_batch_restored_while_archiving_is_re_archived_without_it(author, monkeypatch):
+    kept, kept_blob = _document(author, "kept", b"kept lease", deleted_days_ago=120)
+    purged, _ = _document(author, "purged", b"purged lease", deleted_days_ago=120)
+    write_archive = RetentionService._write_archive
+    written = []
+
+    def restore_during_first_archive(purger, ids):
+        path = write_archive(purger, ids)
+        if not written:
+            Document.all_objects.filter(pk=kept.pk).restore()
+        written.append(path)
+        return path
+
+    monkeypatch.setattr(RetentionService, "_write_archive", restore_during_first_archive)
+
+    (report,) = RetentionService.run(labels=["documents"], archive=True)
+
+    assert report.records == 1 and report.archives == written[1:]
+    assert not default_storage.exists(written[0])
+    assert Document.objects.filter(pk=kept.pk).exists()
+    assert default_storage.exists(kept_blob.storage_path)
+    assert not Document.all_objects.filter(pk=purged.pk).exists()
@@ -0,0 +1,90 @@
+"""Tests for the DMS full-text search index."""
+
+from __future__ import annotations
+
+import pytest
+
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentSearchService
+
+
+def _create_document(title: str, **extra) -> Document:
+    return Document.objects.create(
+        title=title,
+        document_type=Document.DocumentType.MEMO,
+        **extra,
+    )
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_above_body_matches():
+    title_match = _create_document("Harbour dredging plan")
+    body_match = _create_document("Quarterly report")
+    DocumentVersion.objects.create(
+        document=body_match,
+        version_number=1,
+        file_name="report.pdf",
+        file_type="application/pdf",
+        file_size=10,
+        content_text="Appendix covering harbour dredging schedules.",
+    )
+    _create_document("Unrelated memo")
+    DocumentSearchService.refresh()
+
+    results = list(
+        DocumentSearchService.search(Document.objects.all(), "dredging").order_by("-search_rank")
+    )
+
+    assert results == [title_match, body_match]
+
+
+@pytest.mark.django_db
+def test_search_matches_word_prefixes_and_ocr_text():
+    document = _create_document("Scanned letter")
+    DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name="scan.png",
+        file_type="image/png",
+        file_size=10,
+        ocr_text="Berthing allocation for vessel MV Lagos Star",
+    )
+    DocumentSearchService.refresh([document.id])
+
+    assert list(DocumentSearchService.search(Document.objects.all(), "berth")) == [document]
+    assert not DocumentSearchService.search(Document.objects.all(), "tanker").exists()
+
+
+def test_build_query_ignores_punctuation_only_terms():
+    assert DocumentSearchService.build_query("&|!") is None
+
+
+@pytest.mark.django_db
+def test_search_matches_partial_reference_numbers():
+    document = _create_document("Tariff circular", reference_number="NPA/DMS/2024/001")
+    _create_document("Other circular", reference_number="NPA/HR/2023/044")
+    DocumentSearchService.refresh()
+
+    for term in ("DMS", "2024/001", "npa/dms"):
+        assert list(DocumentSearchService.search(Document.objects.all(), term)) == [document]
+
+
+@pytest.mark.django_db
+def test_orm_edits_refresh_the_search_vector(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        document = _create_document("Quarterly report")
+    with django_capture_on_commit_callbacks(execute=True):
+        document.title = "Dredging schedule"
+        document.save()
+        DocumentVersion.objects.create(
+            document=document,
+            version_number=1,
+            file_name="scan.png",
+            file_type="image/png",
+            file_size=10,
+            ocr_text="Berthing allocation",
+        )
+
+    assert list(DocumentSearchService.search(Document.objects.all(), "dredging")) == [document]
+    assert list(DocumentSearchService.search(Document.objects.all(), "berthing")) == [document]
+    assert not DocumentSearchService.search(Document.objects.all(), "quarterly").exists()
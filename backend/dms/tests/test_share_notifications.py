@@ -0,0 +1,61 @@
+"""Tests for background fan-out of document share notifications."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentPermission
+from dms.tasks import notify_document_shared
+from notifications.models import Notification, NotificationPreferences
+from organization.models import Directorate, Division
+
+
+@pytest.fixture()
+def in_memory_channels(settings):
+    settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+@pytest.fixture()
+def shared_document(db):
+    directorate = Directorate.objects.create(name="Marine", code="MAR")
+    division = Division.objects.create(name="Pilotage", code="PIL", directorate=directorate)
+    sharer = User.objects.create(username="sharer", division=division)
+    members = [User.objects.create(username=f"pilot-{index}", division=division) for index in range(12)]
+    User.objects.create(username="retired-pilot", division=division, is_active=False)
+    NotificationPreferences.objects.create(user=members[0], module_dms=False)
+    document = Document.objects.create(title="Tide tables", document_type=Document.DocumentType.REPORT, author=sharer)
+    return sharer, division, members, document
+
+
+def test_share_creates_permission_and_defers_notifications(shared_document, django_capture_on_commit_callbacks):
+    sharer, division, _, document = shared_document
+    client = APIClient()
+    client.force_authenticate(sharer)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = client.post(
+            "/api/v1/dms/permissions/",
+            {"document": str(document.id), "access": "read", "division_ids": [str(division.id)]},
+            format="json",
+        )
+
+    assert response.status_code == 201, response.content
+    # One notification task; the other callbacks refresh the visibility index.
+    assert len([callback for callback in callbacks if callback.__module__ == "dms.tasks"]) == 1
+    assert not Notification.objects.exists()
+
+
+def test_fan_out_uses_a_fixed_number_of_queries(shared_document, in_memory_channels, django_assert_max_num_queries):
+    sharer, division, members, document = shared_document
+    permission = DocumentPermission.objects.create(document=document, access=DocumentPermission.AccessLevel.READ)
+    permission.divisions.add(division)
+
+    with django_assert_max_num_queries(10):
+        created = notify_document_shared(str(permission.id), str(sharer.id))
+
+    # The sharer, the inactive member and the member who muted DMS alerts are skipped.
+    assert created == len(members) - 1
+    assert not Notification.objects.filter(recipient=sharer).exists()
+    assert NotificationPreferences.objects.filter(user__in=members).count() == len(members)
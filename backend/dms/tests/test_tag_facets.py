@@ -0,0 +1,46 @@
+"""Tests for tag containment filters and tag facets."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document
+from dms.services import DocumentVisibilityService
+
+
+@pytest.fixture()
+def tagged(db):
+    user = User.objects.create(username="records")
+    outsider = User.objects.create(username="outsider")
+
+    def make(title, tags, **extra):
+        extra.setdefault("author", user)
+        return Document.objects.create(title=title, document_type=Document.DocumentType.REPORT, tags=tags, **extra)
+
+    make("Q1 tariffs", ["finance", "tariff"])
+    make("Q2 tariffs", ["finance", "tariff"], status=Document.DocumentStatus.PUBLISHED)
+    make("Audit", ["finance"])
+    make("Untagged", [])
+    make("Private", ["finance", "secret"], sensitivity=Document.Sensitivity.RESTRICTED, author=outsider)
+    DocumentVisibilityService.refresh()
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_tag_filter_requires_every_tag(tagged):
+    response = tagged.get("/api/v1/dms/documents/", {"tag": ["finance", "tariff"]})
+
+    assert sorted(row["title"] for row in response.json()["results"]) == ["Q1 tariffs", "Q2 tariffs"]
+
+
+def test_tag_facets_count_visible_filtered_documents(tagged, django_assert_max_num_queries):
+    with django_assert_max_num_queries(2):
+        response = tagged.get("/api/v1/dms/documents/tag-facets/")
+
+    assert response.json()["results"] == [{"tag": "finance", "count": 3}, {"tag": "tariff", "count": 2}]
+
+    published = tagged.get("/api/v1/dms/documents/tag-facets/", {"status": "published"}).json()["results"]
+    assert published == [{"tag": "finance", "count": 1}, {"tag": "tariff", "count": 1}]
@@ -0,0 +1,106 @@
+"""Tests for background text extraction of document versions."""
+
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from reportlab.lib.pagesizes import LETTER
+from reportlab.pdfgen import canvas
+
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentTextExtractionService
+
+
+@pytest.fixture()
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _pdf_bytes(text: str) -> bytes:
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=LETTER)
+    pdf.drawString(40, 700, text)
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _create_version(file_name: str, file_type: str, payload: bytes) -> DocumentVersion:
+    document = Document.objects.create(title="Extraction", document_type=Document.DocumentType.REPORT)
+    saved_path = default_storage.save(f"dms_versions/{document.id}/{file_name}", ContentFile(payload))
+    return DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name=file_name,
+        file_type=file_type,
+        file_size=len(payload),
+        file_url=f"http://testserver/media/{saved_path}",
+    )
+
+
+@pytest.mark.django_db
+def test_extract_uses_native_pdf_text_layer(media_root):
+    version = _create_version(
+        "berth.pdf",
+        "application/pdf",
+        _pdf_bytes("Berth allocation schedule for the Apapa terminal quay"),
+    )
+
+    DocumentTextExtractionService.extract(version)
+    version.refresh_from_db()
+
+    assert version.extraction_status == DocumentVersion.ExtractionStatus.COMPLETED
+    assert "Apapa terminal" in version.content_text
+    assert version.ocr_text == ""
+    assert version.extracted_at is not None
+
+
+@pytest.mark.django_db
+def test_extract_records_failure_status(media_root):
+    version = _create_version("broken.pdf", "application/pdf", b"not really a pdf")
+
+    DocumentTextExtractionService.extract(version)
+    version.refresh_from_db()
+
+    assert version.extraction_status == DocumentVersion.ExtractionStatus.FAILED
+    assert version.extraction_error
+
+
+@pytest.mark.django_db
+def test_extract_skips_versions_without_stored_file(media_root):
+    document = Document.objects.create(title="Memo", document_type=Document.DocumentType.MEMO)
+    version = DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name="memo.html",
+        file_type="text/html",
+        file_size=0,
+    )
+
+    DocumentTextExtractionService.extract(version)
+    version.refresh_from_db()
+
+    assert version.extraction_status == DocumentVersion.ExtractionStatus.SKIPPED
+
+
+@pytest.mark.django_db
+def test_extract_keeps_editor_text_of_rich_text_versions(media_root):
+    document = Document.objects.create(title="Memo", document_type=Document.DocumentType.MEMO)
+    version = DocumentVersion.objects.create(
+        document=document,
+        version_number=1,
+        file_name="memo.html",
+        file_type="text/html",
+        file_size=0,
+        content_html="<table><tr><td>Berth</td><td>4</td></tr></table>",
+        content_text="Berth 4",
+    )
+
+    DocumentTextExtractionService.extract(version)
+    version.refresh_from_db()
+
+    assert version.content_text == "Berth 4"
+    assert version.extraction_status == DocumentVersion.ExtractionStatus.SKIPPED
@@ -0,0 +1,91 @@
+"""Tests for delta-stored rich-text versions and the version diff endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentVersion
+from dms.services import DocumentVersionDeltaService, DocumentVisibilityService
+
+PARAGRAPHS = [f"<p>Clause {index}: the contractor shall deliver the goods on schedule.</p>" for index in range(40)]
+
+
+def _html(number: int) -> str:
+    paragraphs = list(PARAGRAPHS)
+    paragraphs[number] = f"<p>Clause {number}: amended in revision {number}.</p>"
+    return "\n".join(paragraphs)
+
+
+@pytest.fixture()
+def document(db, settings):
+    settings.DMS_VERSION_SNAPSHOT_INTERVAL = 3
+    author = User.objects.create(username="author")
+    document = Document.objects.create(title="Supply memo", document_type=Document.DocumentType.MEMO, author=author)
+    for number in range(1, 6):
+        version = DocumentVersion.objects.create(
+            document=document,
+            version_number=number,
+            file_name="memo",
+            file_type="text/html",
+            file_size=0,
+            content_html=_html(number),
+            content_json={"type": "doc", "revision": number},
+            content_text=f"revision {number}",
+            uploaded_by=author,
+        )
+        DocumentVersionDeltaService.compact_previous(version)
+    DocumentVisibilityService.refresh([document.id])
+    return document
+
+
+def _client(document):
+    client = APIClient()
+    client.force_authenticate(document.author)
+    return client
+
+
+def test_previous_versions_become_deltas_except_snapshots(document):
+    stored = {version.version_number: version for version in document.versions.all()}
+
+    assert sorted(number for number, version in stored.items() if version.content_delta is None) == [3, 5]
+    assert stored[1].content_base_id == stored[2].id and stored[1].content_html == ""
+    assert stored[4].content_base_id == stored[5].id
+    # Plain text stays in full so the search index still covers older versions.
+    assert stored[1].content_text == "revision 1"
+
+
+def test_versions_are_rebuilt_on_read(document):
+    client = _client(document)
+    first = document.versions.get(version_number=1)
+
+    response = client.get(f"/api/v1/dms/versions/{first.id}/")
+    assert response.data["content_html"] == _html(1)
+    assert response.data["content_json"] == {"type": "doc", "revision": 1}
+    assert response.data["content_text"] == "revision 1"
+
+    listed = client.get(f"/api/v1/dms/versions/?document={document.id}")
+    rows = listed.data["results"] if isinstance(listed.data, dict) else listed.data
+    assert {row["version_number"]: row["content_html"] for row in rows} == {n: _html(n) for n in range(1, 6)}
+
+
+def test_diff_between_version_numbers(document):
+    response = _client(document).get(f"/api/v1/dms/documents/{document.id}/diff/?from=1&to=4")
+
+    assert response.status_code == 200
+    assert (response.data["added"], response.data["removed"]) == (2, 2)
+    changed = [change for change in response.data["changes"] if change["type"] != "unchanged"]
+    assert {"type": "removed", "value": "<p>Clause 1: amended in revision 1.</p>"} in changed
+    assert {"type": "added", "value": "<p>Clause 4: amended in revision 4.</p>"} in changed
+    assert _client(document).get(f"/api/v1/dms/documents/{document.id}/diff/?from=1&to=9").status_code == 404
+
+
+def test_deleting_a_base_version_expands_its_dependents(document):
+    client = _client(document)
+    second = document.versions.get(version_number=2)
+
+    assert client.delete(f"/api/v1/dms/versions/{second.id}/").status_code == 204
+
+    first = document.versions.get(version_number=1)
+    assert first.content_delta is None and first.content_html == _html(1)
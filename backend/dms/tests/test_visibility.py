@@ -0,0 +1,98 @@
+"""Tests for the precomputed document visibility index."""
+
+from __future__ import annotations
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dms.models import Document, DocumentPermission, DocumentVisibility
+from dms.services import DocumentVisibilityService
+from organization.models import Directorate, Division
+
+
+@pytest.fixture()
+def division(db):
+    directorate = Directorate.objects.create(name="Finance", code="FIN")
+    return Division.objects.create(name="Treasury", code="TRS", directorate=directorate)
+
+
+def _listed_ids(user) -> set[str]:
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get("/api/v1/dms/documents/")
+    assert response.status_code == 200
+    return {row["id"] for row in response.json()["results"]}
+
+
+def test_sensitivity_grants_follow_grade(division):
+    author = User.objects.create(username="author")
+    junior = User.objects.create(username="junior", grade_level="JSS3")
+    senior = User.objects.create(username="senior", grade_level="MSS2")
+    memo = Document.objects.create(
+        title="Board memo",
+        document_type=Document.DocumentType.MEMO,
+        author=author,
+        sensitivity=Document.Sensitivity.CONFIDENTIAL,
+    )
+    DocumentVisibilityService.refresh([memo.id])
+
+    assert str(memo.id) in _listed_ids(author)
+    assert str(memo.id) in _listed_ids(senior)
+    assert str(memo.id) not in _listed_ids(junior)
+
+
+def test_permission_changes_update_grants_incrementally(division, django_capture_on_commit_callbacks):
+    author = User.objects.create(username="author")
+    reader = User.objects.create(username="reader", division=division)
+    report = Document.objects.create(
+        title="Audit report",
+        document_type=Document.DocumentType.REPORT,
+        author=author,
+        sensitivity=Document.Sensitivity.RESTRICTED,
+    )
+    DocumentVisibilityService.refresh([report.id])
+    assert str(report.id) not in _listed_ids(reader)
+
+    client = APIClient()
+    client.force_authenticate(author)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/api/v1/dms/permissions/",
+            {"document": str(report.id), "access": "read", "division_ids": [str(division.id)]},
+            format="json",
+        )
+    assert response.status_code == 201, response.content
+    assert str(report.id) in _listed_ids(reader)
+
+    permission = DocumentPermission.objects.get(document=report)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert client.delete(f"/api/v1/dms/permissions/{permission.id}/").status_code == 204
+    assert str(report.id) not in _listed_ids(reader)
+    assert not DocumentVisibility.objects.filter(
+        document=report, principal_type=DocumentVisibility.PrincipalType.DIVISION
+    ).exists()
+
+
+def test_orm_writes_outside_the_api_refresh_grants(division, django_capture_on_commit_callbacks):
+    author = User.objects.create(username="author")
+    reader = User.objects.create(username="reader", division=division)
+    with django_capture_on_commit_callbacks(execute=True):
+        report = Document.objects.create(
+            title="Audit report",
+            document_type=Document.DocumentType.REPORT,
+            author=author,
+            sensitivity=Document.Sensitivity.RESTRICTED,
+        )
+        permission = DocumentPermission.objects.create(document=report, access=DocumentPermission.AccessLevel.READ)
+        permission.divisions.add(division)
+    assert str(report.id) in _listed_ids(reader)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        division.document_permissions.clear()
+    assert str(report.id) not in _listed_ids(reader)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        report.sensitivity = Document.Sensitivity.INTERNAL
+        report.save(update_fields=["sensitivity"])
+    assert str(report.id) in _listed_ids(reader)
@@ -8,6 +8,7 @@ from .views import (
     DocumentDiscussionMessageViewSet,
     DocumentEditorSessionViewSet,
     DocumentPermissionViewSet,
+    DocumentUploadSessionViewSet,
     DocumentVersionViewSet,
     DocumentViewSet,
     DocumentWorkspaceViewSet,
@@ -18,6 +19,7 @@ router = DefaultRouter()
 router.register(r"workspaces", DocumentWorkspaceViewSet, basename="document-workspace")
 router.register(r"documents", DocumentViewSet, basename="document")
 router.register(r"versions", DocumentVersionViewSet, basename="document-version")
+router.register(r"uploads", DocumentUploadSessionViewSet, basename="document-upload")
 router.register(r"permissions", DocumentPermissionViewSet, basename="document-permission")
 router.register(r"comments", DocumentCommentViewSet, basename="document-comment")
 router.register(r"discussions", DocumentDiscussionMessageViewSet, basename="document-discussion")
@@ -3,22 +3,33 @@
 from __future__ import annotations
 
 import base64
-import os
+import io
 
 from django.conf import settings
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
-from django.db.models import Max, Q
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.shortcuts import get_object_or_404
 from django.utils.text import slugify
 from common.upload_validators import validate_file_upload
+from common.views import export_response, preview_response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from accounts.serializers import UserSerializer
 from audit.services import AuditService
+from common.downloads import is_range_continuation, protected_file_response
+from common.filters import TagFilter, facet_limit
+from common.pagination import KeysetPagination, KeysetPaginationMixin
+from common.models import ExportJob
+from common.services import BlobStorageService, TagFacetService
+from common.storage import storage_path_from_url
 from notifications.models import Notification
 from notifications.services import NotificationService
 
@@ -27,21 +38,74 @@ from .models import (
     DocumentAccessLog,
     DocumentComment,
     DocumentDiscussionMessage,
-    DocumentEditorSession,
     DocumentPermission,
+    DocumentUploadSession,
     DocumentVersion,
     DocumentWorkspace,
 )
 from .serializers import (
+    DocumentAccessLogBatchSerializer,
     DocumentAccessLogSerializer,
+    DocumentBulkActionSerializer,
     DocumentCommentSerializer,
+    DocumentCommentTreeQuerySerializer,
+    DocumentVersionDiffQuerySerializer,
+    DocumentExportQuerySerializer,
     DocumentDiscussionMessageSerializer,
     DocumentEditorSessionSerializer,
+    DocumentListSerializer,
     DocumentPermissionSerializer,
     DocumentSerializer,
+    DocumentUploadSessionSerializer,
     DocumentVersionSerializer,
     DocumentWorkspaceSerializer,
 )
+from .services import (
+    ChunkedUploadService,
+    DocumentAccessLogService,
+    DocumentBulkService,
+    DocumentCommentTreeService,
+    DocumentDuplicateService,
+    DocumentFacetService,
+    DocumentSearchService,
+    DocumentShareService,
+    DocumentVersionDeltaService,
+    DocumentVisibilityService,
+    EditorPresenceService,
+)
+from .tasks import queue_share_notifications, queue_version_compaction, queue_version_text_extraction
+
+
+def build_media_url(request, saved_path: str) -> str:
+    """Return an absolute URL for a path saved in ``default_storage``."""
+    try:
+        return request.build_absolute_uri(settings.MEDIA_URL + saved_path)
+    except Exception:
+        # Fallback if build_absolute_uri fails
+        request_scheme = getattr(request, 'scheme', 'http')
+        request_host = request.get_host() if hasattr(request, 'get_host') else 'localhost:8000'
+        return f"{request_scheme}://{request_host}{settings.MEDIA_URL}{saved_path}"
+
+
+def save_new_version(serializer, user, **extra) -> DocumentVersion:
+    """Save a validated version serializer as the document's next version and queue extraction."""
+    document = serializer.validated_data["document"]
+    next_version = (
+        document.versions.aggregate(max_version=Max("version_number"))
+        .get("max_version")
+        or 0
+    ) + 1
+    version = serializer.save(
+        uploaded_by=user,
+        version_number=next_version,
+        **extra,
+    )
+    queue_version_text_extraction(version.id)
+    if DocumentVersionDeltaService.is_rich_text(version):
+        # Uploaded files are indexed for duplicates once their text is extracted.
+        DocumentDuplicateService.index(version)
+        queue_version_compaction(version.id)
+    return version
 
 
 class DocumentWorkspaceViewSet(viewsets.ModelViewSet):
@@ -70,7 +134,11 @@ class DocumentPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentCursorPagination(KeysetPagination):
+    ordering = ("-updated_at", "-id")
+
+
+class DocumentViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     queryset = Document.objects.none()
     base_queryset = Document.all_objects.select_related("author", "division", "department").prefetch_related(
         "workspaces",
@@ -80,7 +148,9 @@ class DocumentViewSet(viewsets.ModelViewSet):
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = DocumentPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    keyset_pagination_class = DocumentCursorPagination
+    # Text search goes through the weighted ``search_vector`` index instead of SearchFilter.
+    filter_backends = [DjangoFilterBackend, TagFilter, filters.OrderingFilter]
     filterset_fields = [
         "document_type",
         "status",
@@ -88,37 +158,62 @@ class DocumentViewSet(viewsets.ModelViewSet):
         "division",
         "department",
     ]
-    search_fields = ["title", "reference_number", "description", "tags"]
     ordering_fields = ["updated_at", "created_at", "title"]
     ordering = ["-updated_at"]
 
     def filter_queryset(self, queryset):
-        """Override to add full-text search in document versions."""
-        # Get search query before calling super() which applies SearchFilter
-        search_query = self.request.query_params.get("search", "").strip()
-        
-        # Call super to apply standard filters (SearchFilter, DjangoFilterBackend, etc.)
+        """Apply standard filters, then ranked full-text search over the document index."""
         queryset = super().filter_queryset(queryset)
-        
-        # If there's a search query, also search in document version content
+
+        search_query = self.request.query_params.get("search", "").strip()
         if search_query:
-            from django.db.models import Q
-            
-            # Add full-text search in document versions (content_text, ocr_text)
-            # This extends the base search_fields (title, reference, description, tags)
-            version_filter = Q(
-                versions__content_text__icontains=search_query
-            ) | Q(
-                versions__ocr_text__icontains=search_query
-            )
-            
-            # Combine with existing search results using OR
-            queryset = queryset.filter(version_filter).distinct()
-        
+            queryset = DocumentSearchService.search(queryset, search_query)
+            if not self.request.query_params.get("ordering"):
+                queryset = queryset.order_by("-search_rank", "-updated_at")
+
         return queryset
 
+    def use_list_representation(self) -> bool:
+        """List responses are lightweight unless ``include_versions=true`` is requested."""
+        request = getattr(self, "request", None)
+        if self.action != "list" or request is None:
+            return False
+        return request.query_params.get("include_versions") != "true"
+
+    def get_serializer_class(self):
+        if self.use_list_representation():
+            return DocumentListSerializer
+        return super().get_serializer_class()
+
+    def get_list_queryset(self):
+        """Metadata-only queryset: heavy version columns are never loaded for list rows."""
+        latest_versions = (
+            DocumentVersion.objects.defer(*DocumentVersion.HEAVY_FIELDS)
+            .order_by("document_id", "-version_number")
+            .distinct("document_id")
+        )
+        version_count = (
+            DocumentVersion.objects.filter(document=OuterRef("pk"))
+            .order_by()
+            .values("document")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return (
+            Document.all_objects.select_related("author")
+            .defer("search_vector")
+            .prefetch_related(
+                "workspaces",
+                Prefetch("versions", queryset=latest_versions, to_attr="latest_versions"),
+            )
+            .annotate(version_count=Coalesce(Subquery(version_count), 0))
+        )
+
     def get_queryset(self):
-        qs = self.base_queryset.prefetch_related("versions")  # Prefetch versions for full-text search
+        if self.use_list_representation():
+            qs = self.get_list_queryset()
+        else:
+            qs = self.base_queryset.defer("search_vector")
         request = getattr(self, "request", None)
         if request:
             only_deleted = request.query_params.get("only_deleted") == "true"
@@ -132,36 +227,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
         else:
             qs = qs.filter(is_deleted=False)
 
-        user = getattr(self.request, "user", None)
-        if not user or not user.is_authenticated or user.is_superuser:
-            return qs.distinct()
-
-        visibility_filter = Q(author=user) | Q(workspaces__members=user) | Q(permissions__users=user)
-
-        if user.division_id:
-            visibility_filter |= Q(permissions__divisions=user.division_id)
-        if user.department_id:
-            visibility_filter |= Q(permissions__departments=user.department_id)
-        if user.grade_level:
-            visibility_filter |= Q(permissions__grade_levels__contains=[user.grade_level])
-
-        visibility_filter |= Q(sensitivity__in=[Document.Sensitivity.PUBLIC, Document.Sensitivity.INTERNAL])
-
-        high_confidential_grades = {"MSS5", "MSS4", "MSS3", "MSS2", "MSS1", "EDCS", "MDCS"}
-        high_restricted_grades = {"MSS1", "EDCS", "MDCS"}
-
-        if user.grade_level in high_confidential_grades:
-            visibility_filter |= Q(sensitivity=Document.Sensitivity.CONFIDENTIAL)
-        if user.grade_level in high_restricted_grades:
-            visibility_filter |= Q(sensitivity=Document.Sensitivity.RESTRICTED)
-
-        # Published documents with public/internal sensitivity are generally accessible
-        visibility_filter |= Q(
-            status=Document.DocumentStatus.PUBLISHED,
-            sensitivity__in=[Document.Sensitivity.PUBLIC, Document.Sensitivity.INTERNAL],
-        )
-
-        return qs.filter(visibility_filter).distinct()
+        # Visibility comes from the precomputed DocumentVisibility index (see DocumentVisibilityService).
+        return DocumentVisibilityService.visible_to(qs, getattr(self.request, "user", None))
 
     def perform_create(self, serializer):
         author = serializer.validated_data.get("author") or self.request.user
@@ -202,9 +269,165 @@ class DocumentViewSet(viewsets.ModelViewSet):
         )
         instance.delete()
 
+    BULK_FILTER_LOOKUPS = {
+        "document_type": "document_type",
+        "status": "status",
+        "sensitivity": "sensitivity",
+        "division": "division_id",
+        "department": "department_id",
+        "workspace": "workspaces",
+    }
+
+    def filter_bulk_queryset(self, queryset, criteria: dict):
+        """Translate a bulk ``filter`` expression into queryset filters."""
+        try:
+            for key, value in criteria.items():
+                if key == "search":
+                    queryset = DocumentSearchService.search(queryset, value)
+                elif key == "tag":
+                    queryset = queryset.filter(tags__contains=[value])
+                else:
+                    queryset = queryset.filter(**{self.BULK_FILTER_LOOKUPS[key]: value})
+        except DjangoValidationError as exc:
+            raise ValidationError({"filter": exc.messages}) from exc
+        return queryset
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Apply one status/sensitivity, tag, workspace, delete or restore change to many documents."""
+        serializer = DocumentBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        queryset = DocumentVisibilityService.visible_to(Document.all_objects.all(), request.user)
+        if "ids" in data:
+            queryset = queryset.filter(id__in=data["ids"])
+        else:
+            queryset = self.filter_bulk_queryset(queryset, data["filter"])
+
+        document_ids = DocumentBulkService.apply(
+            queryset,
+            action=data["action"],
+            user=request.user,
+            request=request,
+            status=data.get("status"),
+            sensitivity=data.get("sensitivity"),
+            tags=data.get("tags"),
+            workspace_ids=[workspace.id for workspace in data.get("workspace_ids", [])],
+        )
+        return Response(
+            {
+                "action": data["action"],
+                "count": len(document_ids),
+                "ids": [str(document_id) for document_id in document_ids],
+            }
+        )
+
+    def get_scoped_queryset(self):
+        """Non-deleted documents visible to the caller, narrowed by the list filters and search."""
+        queryset = DocumentVisibilityService.visible_to(Document.objects.all(), self.request.user)
+        return self.filter_queryset(queryset)
+
+    @action(detail=False, methods=["get"], url_path="tag-facets")
+    def tag_facets(self, request):
+        """Tag -> document count over the caller's visible (and filtered) documents."""
+        return Response({"results": TagFacetService.counts(self.get_scoped_queryset(), limit=facet_limit(request))})
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """Counts by type, status, sensitivity, division and workspace for the current filters.
+
+        Results are cached for ``DMS_FACET_CACHE_SECONDS`` per visibility class and filter set.
+        """
+        cache_key = DocumentFacetService.cache_key(
+            DocumentVisibilityService.visibility_class(request.user),
+            request.query_params,
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = DocumentFacetService.counts(self.get_scoped_queryset())
+            cache.set(cache_key, data, settings.DMS_FACET_CACHE_SECONDS)
+        return Response(data)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """ZIP of the visible (and filtered) documents, or ``?ids=`` among them, with a manifest.
+
+        ``?versions=all`` includes every version instead of only the latest. Large
+        exports are built in the background and answered with ``202 Accepted``.
+        """
+        params = DocumentExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        queryset = self.get_scoped_queryset()
+        if params.validated_data.get("ids"):
+            queryset = queryset.filter(pk__in=params.validated_data["ids"])
+        documents = list(queryset.only("id", "sensitivity")[: settings.EXPORT_MAX_DOCUMENTS + 1])
+        if not documents:
+            raise ValidationError({"detail": "No documents to export."})
+        if len(documents) > settings.EXPORT_MAX_DOCUMENTS:
+            raise ValidationError({"detail": f"Exports are limited to {settings.EXPORT_MAX_DOCUMENTS} documents."})
+
+        response = export_response(
+            request,
+            ExportJob.Kind.DOCUMENTS,
+            {"document_ids": [str(document.id) for document in documents], "versions": params.validated_data["versions"]},
+        )
+        DocumentAccessLogService.record(
+            [
+                DocumentAccessLogService.event(document, request.user, DocumentAccessLog.AccessAction.DOWNLOAD)
+                for document in documents
+            ]
+        )
+        return response
+
+    @action(detail=True, methods=["get"])
+    def diff(self, request, pk=None):
+        """Line diff between ``?from=`` and ``?to=`` version numbers (``?field=html|text``)."""
+        document = get_object_or_404(
+            DocumentVisibilityService.visible_to(Document.objects.only("id"), request.user),
+            pk=pk,
+        )
+        params = DocumentVersionDiffQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        numbers = (params.validated_data["from"], params.validated_data["to"])
+        versions = {
+            version.version_number: version
+            for version in document.versions.filter(version_number__in=numbers).only(
+                "id", "version_number", "content_base", "content_delta", *DocumentVersionDeltaService.CONTENT_FIELDS
+            )
+        }
+        missing = [number for number in numbers if number not in versions]
+        if missing:
+            raise NotFound(f"Version {missing[0]} not found.")
+        return Response(
+            DocumentVersionDeltaService.diff(
+                versions[numbers[0]],
+                versions[numbers[1]],
+                field=f"content_{params.validated_data['field']}",
+            )
+        )
+
+    @action(detail=True, methods=["get"], url_path="comment-tree")
+    def comment_tree(self, request, pk=None):
+        """All comments on the document as a nested tree; ``?version=`` narrows it, ``?since=`` returns changes only."""
+        # Only the id is needed; skip the prefetches of the detail queryset.
+        document = get_object_or_404(
+            DocumentVisibilityService.visible_to(Document.objects.only("id"), request.user),
+            pk=pk,
+        )
+        params = DocumentCommentTreeQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(
+            DocumentCommentTreeService.build(
+                document,
+                version_id=params.validated_data.get("version"),
+                since=params.validated_data.get("since"),
+            )
+        )
+
 
 class DocumentVersionViewSet(viewsets.ModelViewSet):
-    queryset = DocumentVersion.objects.select_related("document", "uploaded_by")
+    queryset = DocumentVersion.objects.select_related("document", "uploaded_by", "blob")
     serializer_class = DocumentVersionSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -215,6 +438,7 @@ class DocumentVersionViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         # Create a mutable copy of request data
         data = dict(request.data)
+        blob = None
         
         # Extract file data from request if it's a data URL
         file_url = data.get('file_url', '')
@@ -245,30 +469,16 @@ class DocumentVersionViewSet(viewsets.ModelViewSet):
                 if not data.get('file_name'):
                     data['file_name'] = safe_name
 
-                # Ensure media directory exists
-                media_root = settings.MEDIA_ROOT
-                document_id = document_identifier or 'pending'
-                dms_dir = os.path.join(media_root, 'dms_versions', document_id)
-                os.makedirs(dms_dir, exist_ok=True)
-                
-                # Generate file path
-                safe_filename = (data['file_name'] or safe_name).replace(' ', '_').replace('/', '_')
-                file_path = os.path.join('dms_versions', document_id, safe_filename)
-                
-                # Save file to storage
-                saved_path = default_storage.save(file_path, ContentFile(file_data, name=safe_filename))
-                
-                # Build full URL for the file
-                try:
-                    file_url = request.build_absolute_uri(settings.MEDIA_URL + saved_path)
-                except Exception:
-                    # Fallback if build_absolute_uri fails
-                    request_scheme = getattr(request, 'scheme', 'http')
-                    request_host = request.get_host() if hasattr(request, 'get_host') else 'localhost:8000'
-                    file_url = f"{request_scheme}://{request_host}{settings.MEDIA_URL}{saved_path}"
-                
-                # Update data with the new file URL (now a short path, not a long data URL)
-                data['file_url'] = file_url
+                # Store the bytes once per unique content and reuse identical uploads
+                blob = BlobStorageService.store_bytes(
+                    file_data,
+                    file_name=data['file_name'] or safe_name,
+                    content_type=data.get('file_type') or mime_type,
+                )
+                file_url = build_media_url(request, blob.storage_path)
+
+                # The server-issued URL is saved alongside the blob, not validated as client input
+                data.pop('file_url')
             except Exception as e:
                 # If decoding fails, log and raise an error
                 import logging
@@ -279,22 +489,144 @@ class DocumentVersionViewSet(viewsets.ModelViewSet):
         
         # Create serializer with modified data
         serializer = self.get_serializer(data=data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        try:
+            serializer.is_valid(raise_exception=True)
+            extra = {"blob": blob, "file_url": file_url} if blob is not None else {}
+            version = save_new_version(serializer, request.user, **extra)
+        except Exception:
+            # The upload already took a blob reference; give it back so it can be collected.
+            if blob is not None:
+                BlobStorageService.release(blob.pk)
+            raise
         headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        payload = {
+            **serializer.data,
+            "probable_duplicates": DocumentDuplicateService.probable_duplicates(version, request.user),
+        }
+        return Response(payload, status=status.HTTP_201_CREATED, headers=headers)
     
     def perform_create(self, serializer):
-        document = serializer.validated_data["document"]
-        next_version = (
-            document.versions.aggregate(max_version=Max("version_number"))
-            .get("max_version")
-            or 0
-        ) + 1
-        serializer.save(
-            uploaded_by=self.request.user,
-            version_number=next_version,
+        save_new_version(serializer, self.request.user)
+
+    def perform_update(self, serializer):
+        if set(DocumentVersionDeltaService.CONTENT_FIELDS) & set(serializer.validated_data):
+            # Older deltas were encoded against the current content.
+            DocumentVersionDeltaService.expand(serializer.instance)
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        DocumentVersionDeltaService.expand(instance)
+        DocumentDuplicateService.remove(instance)
+        blob_id = instance.blob_id
+        instance.delete()
+        BlobStorageService.release(blob_id)
+
+    def get_visible_object(self):
+        version = self.get_object()
+        visible = DocumentVisibilityService.visible_to(
+            Document.objects.filter(id=version.document_id),
+            self.request.user,
+        )
+        if not visible.exists():
+            raise PermissionDenied("You do not have access to this document.")
+        return version
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Authorized file delivery; pass ``?inline=true`` to view in the browser instead of downloading."""
+        version = self.get_visible_object()
+
+        inline = request.query_params.get("inline") == "true"
+        response = protected_file_response(
+            request,
+            version.blob.storage_path if version.blob_id else storage_path_from_url(version.file_url),
+            file_name=version.file_name,
+            content_type=version.file_type,
+            etag=version.blob.sha256 if version.blob_id else f"{version.id}-{version.file_size}",
+            inline=inline,
         )
+        if response.status_code in (200, 206) and not is_range_continuation(request):
+            DocumentAccessLogService.record(
+                [
+                    DocumentAccessLogService.event(
+                        version.document,
+                        request.user,
+                        DocumentAccessLog.AccessAction.VIEW if inline else DocumentAccessLog.AccessAction.DOWNLOAD,
+                    )
+                ]
+            )
+        return response
+
+    @action(detail=True, methods=["get"])
+    def preview(self, request, pk=None):
+        """First-page thumbnail (``?size=small|medium|large``, ``?image_format=webp|png``)."""
+        version = self.get_visible_object()
+        return preview_response(request, version.blob)
+
+    @action(detail=True, methods=["get"])
+    def duplicates(self, request, pk=None):
+        """Visible documents that hold the same file or near-identical text."""
+        version = self.get_visible_object()
+        return Response({"results": DocumentDuplicateService.probable_duplicates(version, request.user)})
+
+
+class DocumentUploadSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Resumable chunked uploads: create a session, PUT each chunk, then finalize."""
+
+    serializer_class = DocumentUploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return DocumentUploadSession.objects.filter(created_by=self.request.user).select_related("document")
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        serializer.instance = ChunkedUploadService.start(
+            document=data["document"],
+            user=self.request.user,
+            file_name=data["file_name"],
+            file_type=data.get("file_type", ""),
+            total_size=data["total_size"],
+            chunk_size=data.get("chunk_size"),
+            expected_sha256=data.get("expected_sha256", ""),
+            notes=data.get("notes", ""),
+        )
+
+    @action(detail=True, methods=["put"], url_path=r"chunks/(?P<index>\d+)")
+    def upload_chunk(self, request, pk=None, index=None):
+        """Store one chunk from the raw request body (``application/octet-stream``)."""
+        stream = request.stream or io.BytesIO()
+        session = ChunkedUploadService.store_chunk(self.get_object(), int(index), stream)
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, pk=None):
+        session = self.get_object()
+        blob = ChunkedUploadService.assemble(session)
+        version_serializer = DocumentVersionSerializer(
+            data={
+                "document": session.document_id,
+                "file_name": session.file_name,
+                "file_type": session.file_type or "application/octet-stream",
+                "file_size": blob.size,
+                "notes": session.notes,
+            },
+            context=self.get_serializer_context(),
+        )
+        version_serializer.is_valid(raise_exception=True)
+        version = save_new_version(
+            version_serializer, request.user, blob=blob, file_url=build_media_url(request, blob.storage_path)
+        )
+        ChunkedUploadService.complete(session, version, blob.sha256)
+        return Response(version_serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        ChunkedUploadService.abort(instance)
 
 
 class DocumentPermissionViewSet(viewsets.ModelViewSet):
@@ -305,61 +637,23 @@ class DocumentPermissionViewSet(viewsets.ModelViewSet):
     filterset_fields = ["document", "access"]
 
     def create(self, request, *args, **kwargs):
-        """Create document permission and send notifications."""
+        """Create document permission and queue share notifications."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
         # Get document
         document = serializer.validated_data.get("document")
         access = serializer.validated_data.get("access", "read")
-        user_ids = serializer.validated_data.get("user_ids", [])
-        division_ids = serializer.validated_data.get("division_ids", [])
-        department_ids = serializer.validated_data.get("department_ids", [])
+        user_ids = serializer.validated_data.get("users", [])
+        division_ids = serializer.validated_data.get("divisions", [])
+        department_ids = serializer.validated_data.get("departments", [])
         
         # Create permission
         permission = serializer.save()
         
-        # Get all users who should be notified
-        from accounts.models import User
-        from organization.models import Division, Department
-        
-        notified_users = set()
-        
-        # Add direct users
-        if user_ids:
-            users = User.objects.filter(id__in=user_ids)
-            notified_users.update(users)
-        
-        # Add users from divisions
-        if division_ids:
-            divisions = Division.objects.filter(id__in=division_ids)
-            for division in divisions:
-                users = User.objects.filter(division=division, is_active=True)
-                notified_users.update(users)
-        
-        # Add users from departments
-        if department_ids:
-            departments = Department.objects.filter(id__in=department_ids)
-            for department in departments:
-                users = User.objects.filter(department=department, is_active=True)
-                notified_users.update(users)
-        
-        # Send notifications to all affected users
-        for user in notified_users:
-            if user.id != request.user.id:  # Don't notify the person sharing
-                NotificationService.create_notification(
-                    recipient=user,
-                    title=f"Document Shared: {document.title}",
-                    message=f"{request.user.get_full_name() or request.user.username} has shared a document with you with {access} access.",
-                    notification_type=Notification.NotificationType.DOCUMENT,
-                    priority=Notification.Priority.NORMAL,
-                    sender=request.user,
-                    module="dms",
-                    related_object_type="document",
-                    related_object_id=str(document.id),
-                    action_url=f"/dms/{document.id}",
-                    action_required=False,
-                )
+        # Recipients are resolved and notified in the background
+        recipient_count = DocumentShareService.recipients(permission, exclude_user_id=request.user.id).count()
+        queue_share_notifications(permission.id, request.user.id)
         
         # Create audit log
         from audit.models import ActivityLog
@@ -368,7 +662,7 @@ class DocumentPermissionViewSet(viewsets.ModelViewSet):
             action=ActivityLog.ActionType.DOCUMENT_SHARED,
             document=document,
             request=request,
-            description=f"Shared document with {len(notified_users)} user(s) with {access} access",
+            description=f"Shared document with {recipient_count} user(s) with {access} access",
             metadata={
                 "permission_id": str(permission.id),
                 "user_count": len(user_ids) if user_ids else 0,
@@ -443,155 +737,120 @@ class DocumentAccessLogViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, v
     ordering_fields = ["timestamp"]
     ordering = ["-timestamp"]
 
+    def list(self, request, *args, **kwargs):
+        # Write anything still buffered so the compliance view is complete.
+        DocumentAccessLogService.flush()
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Record several view/download events at once; they are written asynchronously."""
 
-class DocumentEditorSessionViewSet(viewsets.ModelViewSet):
-    queryset = DocumentEditorSession.objects.select_related("document", "user")
-    serializer_class = DocumentEditorSessionSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["document", "user", "is_active"]
-
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
+        serializer = DocumentAccessLogBatchSerializer(data=request.data, context=self.get_serializer_context())
         serializer.is_valid(raise_exception=True)
-        document = serializer.validated_data["document"]
-        note = serializer.validated_data.get("note")
-        existing = DocumentEditorSession.objects.filter(document=document, user=request.user).first()
-        if existing:
-            existing.is_active = True
-            if note is not None:
-                existing.note = note
-            existing.save(update_fields=["is_active", "note", "updated_at"])
-            output = self.get_serializer(existing)
-            return Response(output.data, status=status.HTTP_200_OK)
-
-        instance = DocumentEditorSession.objects.create(
-            document=document,
-            user=request.user,
-            note=note or "",
-            is_active=True,
+        accepted = DocumentAccessLogService.record(
+            [
+                DocumentAccessLogService.event(event["document"], request.user, event["action"])
+                for event in serializer.validated_data["events"]
+            ]
         )
-        output = self.get_serializer(instance)
-        headers = self.get_success_headers(output.data)
-        return Response(output.data, status=status.HTTP_201_CREATED, headers=headers)
+        return Response({"accepted": accepted}, status=status.HTTP_202_ACCEPTED)
 
-    def perform_update(self, serializer):
-        # Ensure ownership before adjustments
-        instance = serializer.instance
-        if instance.user != self.request.user and not self.request.user.is_staff:
-            raise PermissionDenied("You can only modify your own editor sessions unless admin.")
-        serializer.save()
 
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+class DocumentEditorSessionViewSet(viewsets.GenericViewSet):
+    """Editor presence backed by ``EditorPresenceService``; nothing here reads or writes Postgres
+    except the one visibility check when a user first joins a document.
 
+    ``POST`` doubles as the heartbeat: clients re-post while the document is open
+    and the session lapses ``DMS_EDITOR_PRESENCE_TTL_SECONDS`` after the last one.
+    """
 
-class DocumentAccessLogViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
-    queryset = DocumentAccessLog.objects.select_related("document", "user")
-    serializer_class = DocumentAccessLogSerializer
+    serializer_class = DocumentEditorSessionSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ["document", "action", "sensitivity"]
-    ordering_fields = ["timestamp"]
-    ordering = ["-timestamp"]
-
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+    lookup_value_regex = "[0-9a-f-]+"
+
+    def get_object(self):
+        session = EditorPresenceService.get(self.kwargs["pk"])
+        if session is None:
+            raise NotFound("Editor session not found.")
+        return session
+
+    def list(self, request, *args, **kwargs):
+        document_id = request.query_params.get("document")
+        user_id = request.query_params.get("user")
+        if document_id:
+            sessions = EditorPresenceService.active(document_id)
+            if user_id:
+                sessions = [session for session in sessions if str(session["user"]["id"]) == user_id]
+        elif user_id:
+            sessions = EditorPresenceService.for_user(user_id)
+        else:
+            raise ValidationError({"document": "Filter editor sessions by document or user."})
+        # Lapsed sessions no longer exist, so only active ones can match.
+        if request.query_params.get("is_active", "true").lower() == "false":
+            sessions = []
 
+        page = self.paginate_queryset(sessions)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(sessions, many=True).data)
 
-class DocumentEditorSessionViewSet(viewsets.ModelViewSet):
-    queryset = DocumentEditorSession.objects.select_related("document", "user")
-    serializer_class = DocumentEditorSessionSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["document", "user", "is_active"]
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_serializer(self.get_object()).data)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        document = serializer.validated_data["document"]
+        document_id = serializer.validated_data["document"]
         note = serializer.validated_data.get("note")
-        existing = DocumentEditorSession.objects.filter(document=document, user=request.user).first()
-        if existing:
-            existing.is_active = True
-            if note is not None:
-                existing.note = note
-            existing.save(update_fields=["is_active", "note", "updated_at"])
-            output = self.get_serializer(existing)
-            return Response(output.data, status=status.HTTP_200_OK)
-
-        instance = DocumentEditorSession.objects.create(
-            document=document,
-            user=request.user,
-            note=note or "",
-            is_active=True,
+
+        user_payload = None
+        if EditorPresenceService.get(EditorPresenceService.session_id(document_id, request.user.pk)) is None:
+            visible = DocumentVisibilityService.visible_to(Document.objects.filter(pk=document_id), request.user)
+            if not visible.exists():
+                raise NotFound("Document not found.")
+            user_payload = UserSerializer(request.user).data
+
+        session, joined = EditorPresenceService.heartbeat(
+            document_id,
+            request.user,
+            note=note,
+            user_payload=user_payload,
+        )
+        return Response(
+            self.get_serializer(session).data,
+            status=status.HTTP_201_CREATED if joined else status.HTTP_200_OK,
         )
-        output = self.get_serializer(instance)
-        headers = self.get_success_headers(output.data)
-        return Response(output.data, status=status.HTTP_201_CREATED, headers=headers)
 
-    def perform_update(self, serializer):
-        # Ensure ownership before adjustments
-        instance = serializer.instance
-        if instance.user != self.request.user and not self.request.user.is_staff:
+    def update(self, request, *args, **kwargs):
+        session = self.get_object()
+        if str(session["user"]["id"]) != str(request.user.pk) and not request.user.is_staff:
             raise PermissionDenied("You can only modify your own editor sessions unless admin.")
-        serializer.save()
-
-
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
-
-
-class DocumentAccessLogViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
-    queryset = DocumentAccessLog.objects.select_related("document", "user")
-    serializer_class = DocumentAccessLogSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ["document", "action", "sensitivity"]
-    ordering_fields = ["timestamp"]
-    ordering = ["-timestamp"]
-
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer = self.get_serializer(session, data=request.data, partial=kwargs.pop("partial", False))
+        serializer.is_valid(raise_exception=True)
 
+        if not serializer.validated_data.get("is_active", True):
+            session = EditorPresenceService.leave(session["document"], session["user"]["id"]) or session
+            session["is_active"] = False
+        elif str(session["user"]["id"]) == str(request.user.pk):
+            session, _ = EditorPresenceService.heartbeat(
+                session["document"],
+                request.user,
+                note=serializer.validated_data.get("note"),
+                user_payload=session["user"],
+            )
+        return Response(self.get_serializer(session).data)
 
-class DocumentEditorSessionViewSet(viewsets.ModelViewSet):
-    queryset = DocumentEditorSession.objects.select_related("document", "user")
-    serializer_class = DocumentEditorSessionSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["document", "user", "is_active"]
+    def partial_update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return self.update(request, *args, **kwargs)
 
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        document = serializer.validated_data["document"]
-        note = serializer.validated_data.get("note")
-        existing = DocumentEditorSession.objects.filter(document=document, user=request.user).first()
-        if existing:
-            existing.is_active = True
-            if note is not None:
-                existing.note = note
-            existing.save(update_fields=["is_active", "note", "updated_at"])
-            output = self.get_serializer(existing)
-            return Response(output.data, status=status.HTTP_200_OK)
-
-        instance = DocumentEditorSession.objects.create(
-            document=document,
-            user=request.user,
-            note=note or "",
-            is_active=True,
-        )
-        output = self.get_serializer(instance)
-        headers = self.get_success_headers(output.data)
-        return Response(output.data, status=status.HTTP_201_CREATED, headers=headers)
-
-    def perform_update(self, serializer):
-        # Ensure ownership before adjustments
-        instance = serializer.instance
-        if instance.user != self.request.user and not self.request.user.is_staff:
+    def destroy(self, request, *args, **kwargs):
+        session = self.get_object()
+        if str(session["user"]["id"]) != str(request.user.pk) and not request.user.is_staff:
             raise PermissionDenied("You can only modify your own editor sessions unless admin.")
-        serializer.save()
+        EditorPresenceService.leave(session["document"], session["user"]["id"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
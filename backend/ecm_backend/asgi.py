@@ -19,6 +19,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecm_backend.settings')
 django_asgi_app = get_asgi_application()
 
 # Import WebSocket routing and custom JWT middleware
+from dms.routing import websocket_urlpatterns as dms_websocket_urlpatterns
 from notifications.routing import websocket_urlpatterns
 from notifications.middleware import JWTAuthMiddlewareStack
 
@@ -28,6 +29,6 @@ from notifications.middleware import JWTAuthMiddlewareStack
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": JWTAuthMiddlewareStack(
-        URLRouter(websocket_urlpatterns)
+        URLRouter(websocket_urlpatterns + dms_websocket_urlpatterns)
     ),
 })
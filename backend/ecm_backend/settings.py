@@ -182,12 +182,77 @@ STATICFILES_DIRS: list[str] = []
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# nginx ``internal`` location aliasing MEDIA_ROOT; when set, authorized downloads are
+# handed to nginx via X-Accel-Redirect instead of being streamed by Django.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "")
 
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
 MAX_UPLOAD_SIZE_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
 CLAMAV_SCAN_ENABLED = os.getenv("CLAMAV_SCAN_ENABLED", "false").lower() == "true"
 CLAMAV_BINARY_PATH = os.getenv("CLAMAV_BINARY_PATH", "clamscan")
 
+# ---------------------------------------------------------------------------
+# Document Management
+# ---------------------------------------------------------------------------
+
+DMS_SEARCH_CONFIG = os.getenv("DMS_SEARCH_CONFIG", "english")
+DMS_SEARCH_VERSION_TEXT_LIMIT = int(os.getenv("DMS_SEARCH_VERSION_TEXT_LIMIT", "500000"))
+DMS_TEXT_LAYER_MIN_CHARS_PER_PAGE = int(os.getenv("DMS_TEXT_LAYER_MIN_CHARS_PER_PAGE", "25"))
+DMS_OCR_LANGUAGE = os.getenv("DMS_OCR_LANGUAGE", "eng")
+DMS_OCR_MAX_PAGES = int(os.getenv("DMS_OCR_MAX_PAGES", "200"))
+DMS_OCR_WORKERS = int(os.getenv("DMS_OCR_WORKERS", "4"))
+DMS_UPLOAD_CHUNK_SIZE = int(os.getenv("DMS_UPLOAD_CHUNK_SIZE_MB", "5")) * 1024 * 1024
+DMS_UPLOAD_SESSION_TTL_HOURS = int(os.getenv("DMS_UPLOAD_SESSION_TTL_HOURS", "24"))
+DMS_BULK_MAX_DOCUMENTS = int(os.getenv("DMS_BULK_MAX_DOCUMENTS", "1000"))
+# Access log events are buffered in Redis and written in batches; when disabled
+# (or Redis is unreachable) they are written straight to the database.
+DMS_ACCESS_LOG_BUFFERED = os.getenv("DMS_ACCESS_LOG_BUFFERED", "True").lower() == "true"
+DMS_ACCESS_LOG_FLUSH_SIZE = int(os.getenv("DMS_ACCESS_LOG_FLUSH_SIZE", "500"))
+DMS_ACCESS_LOG_FLUSH_SECONDS = int(os.getenv("DMS_ACCESS_LOG_FLUSH_SECONDS", "10"))
+DMS_ACCESS_LOG_BATCH_MAX_EVENTS = int(os.getenv("DMS_ACCESS_LOG_BATCH_MAX_EVENTS", "200"))
+DMS_EDITOR_PRESENCE_TTL_SECONDS = int(os.getenv("DMS_EDITOR_PRESENCE_TTL_SECONDS", "90"))
+DMS_FACET_CACHE_SECONDS = int(os.getenv("DMS_FACET_CACHE_SECONDS", "60"))
+# Every Nth rich-text version keeps its full content; the others are deltas.
+DMS_VERSION_SNAPSHOT_INTERVAL = int(os.getenv("DMS_VERSION_SNAPSHOT_INTERVAL", "10"))
+
+# ZIP exports up to EXPORT_STREAM_MAX_BYTES are streamed straight to the client;
+# larger ones are built by a Celery job and kept for EXPORT_RETENTION_HOURS.
+EXPORT_STREAM_MAX_BYTES = int(os.getenv("EXPORT_STREAM_MAX_MB", "200")) * 1024 * 1024
+EXPORT_RETENTION_HOURS = int(os.getenv("EXPORT_RETENTION_HOURS", "24"))
+EXPORT_MAX_DOCUMENTS = int(os.getenv("EXPORT_MAX_DOCUMENTS", "500"))
+
+# First-page thumbnails for PDFs and images, rendered once per stored blob.
+# Sizes are the longest edge in pixels.
+PREVIEW_SIZES = {"small": 160, "medium": 320, "large": 640}
+PREVIEW_RENDER_TIMEOUT_SECONDS = int(os.getenv("PREVIEW_RENDER_TIMEOUT_SECONDS", "60"))
+
+# Estimated Jaccard similarity above which uploads are reported as probable duplicates.
+DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.8"))
+
+# Correspondence reference numbers come from one counter per (registry office,
+# year, series). Formats may use {office}, {year}, {series} and {number}.
+CORRESPONDENCE_REFERENCE_FORMAT = os.getenv(
+    "CORRESPONDENCE_REFERENCE_FORMAT", "NPA/{series}/{office}/{year}/{number:05d}"
+)
+CORRESPONDENCE_REFERENCE_SERIES = {"REG": CORRESPONDENCE_REFERENCE_FORMAT}
+CORRESPONDENCE_REFERENCE_DEFAULT_SERIES = "REG"
+# Office code used in {office} for items registered without an owning office.
+CORRESPONDENCE_REFERENCE_NO_OFFICE = os.getenv("CORRESPONDENCE_REFERENCE_NO_OFFICE", "GEN")
+CORRESPONDENCE_REFERENCE_RESERVE_MAX = int(os.getenv("CORRESPONDENCE_REFERENCE_RESERVE_MAX", "500"))
+
+# Correspondence search matches misspelt references, subjects and senders with
+# pg_trgm word similarity when the extension is installed; otherwise (or when
+# disabled here) it falls back to plain substring matching.
+CORRESPONDENCE_SEARCH_FUZZY = os.getenv("CORRESPONDENCE_SEARCH_FUZZY", "True").lower() == "true"
+
+# Soft-deleted documents and correspondence are removed for good once they have
+# been deleted for RETENTION_DAYS, RETENTION_BATCH_SIZE rows per transaction.
+# With RETENTION_ARCHIVE each batch is first written to a ZIP under retention/.
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "90"))
+RETENTION_ARCHIVE = os.getenv("RETENTION_ARCHIVE", "False").lower() == "true"
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "100"))
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "50"))
+
 # ---------------------------------------------------------------------------
 # Django REST Framework & OpenAPI
 # ---------------------------------------------------------------------------
@@ -255,12 +320,55 @@ CHANNEL_LAYERS = {
     }
 }
 
+# Shared cache for short-lived computed results (e.g. DMS facet counts); falls
+# back to a per-process memory cache when CACHE_URL is not set.
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}
+        if CACHE_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+# Short-lived application state (buffers, presence) outside the channel layer.
+REDIS_URL = os.getenv(
+    "REDIS_URL",
+    f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/2",
+)
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    "dms-purge-expired-uploads": {
+        "task": "dms.purge_expired_uploads",
+        "schedule": timedelta(hours=1),
+    },
+    "dms-prune-editor-presence": {
+        "task": "dms.prune_editor_presence",
+        "schedule": timedelta(minutes=1),
+    },
+    "dms-flush-access-logs": {
+        "task": "dms.flush_access_logs",
+        "schedule": timedelta(seconds=DMS_ACCESS_LOG_FLUSH_SECONDS),
+    },
+    "common-purge-expired-exports": {
+        "task": "common.purge_expired_exports",
+        "schedule": timedelta(hours=1),
+    },
+    "common-purge-soft-deleted": {
+        "task": "common.purge_soft_deleted",
+        "schedule": timedelta(days=1),
+    },
+    "correspondence-reconcile-inbox-counters": {
+        "task": "correspondence.reconcile_inbox_counters",
+        "schedule": timedelta(days=1),
+    },
+}
 
 
 # ---------------------------------------------------------------------------
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 
@@ -155,3 +156,39 @@ async def send_unread_count_update(user_id, count):
             }
         )
 
+
+async def send_notifications_to_users(messages):
+    """Send ``(user_id, notification_data, unread_count)`` messages concurrently.
+
+    The group sends are issued together instead of two awaited round trips per
+    user, so fanning out to a whole division does not serialize on Redis latency.
+    """
+    from channels.layers import get_channel_layer
+
+    channel_layer = get_channel_layer()
+
+    if not channel_layer or not messages:
+        return
+
+    sends = []
+    for user_id, notification_data, unread_count in messages:
+        group_name = f"notifications_{user_id}"
+        sends.append(
+            channel_layer.group_send(
+                group_name,
+                {
+                    "type": "notification_created",
+                    "notification": notification_data,
+                },
+            )
+        )
+        sends.append(
+            channel_layer.group_send(
+                group_name,
+                {
+                    "type": "unread_count_changed",
+                    "count": unread_count,
+                },
+            )
+        )
+    await asyncio.gather(*sends)
@@ -68,6 +68,7 @@ class Notification(UUIDModel, TimeStampedModel):
         indexes = [
             models.Index(fields=["recipient", "status", "-created_at"]),
             models.Index(fields=["recipient", "notification_type", "-created_at"]),
+            models.Index(fields=["recipient", "-created_at", "-id"], name="notif_recipient_created_id_idx"),
         ]
 
     def __str__(self) -> str:
@@ -4,10 +4,11 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db.models import Count
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -37,7 +38,16 @@ class NotificationService:
         Returns (should_send_in_app, should_send_email)
         """
         preferences = NotificationService.get_or_create_preferences(user)
+        return NotificationService.evaluate_preferences(preferences, notification_type, priority, module)
 
+    @staticmethod
+    def evaluate_preferences(
+        preferences: NotificationPreferences,
+        notification_type: str,
+        priority: str,
+        module: str = "",
+    ) -> tuple[bool, bool]:
+        """Apply already-loaded preferences; returns (should_send_in_app, should_send_email)."""
         # Check quiet hours
         if preferences.quiet_hours_enabled:
             now = timezone.now().time()
@@ -155,6 +165,100 @@ class NotificationService:
 
         return notification
 
+    @staticmethod
+    def create_bulk_notifications(
+        recipients: Iterable,
+        title: str,
+        message: str,
+        notification_type: str = Notification.NotificationType.SYSTEM,
+        priority: str = Notification.Priority.NORMAL,
+        sender=None,
+        module: str = "",
+        related_object_type: str = "",
+        related_object_id: str = "",
+        action_url: str = "",
+        action_required: bool = False,
+        expires_in_hours: Optional[int] = None,
+    ) -> list[Notification]:
+        """Fan the same notification out to many users with a fixed number of queries.
+
+        Preferences are loaded (and missing rows bulk-created) in one pass, the
+        notifications are bulk-inserted, unread counts come from one grouped
+        query, and the WebSocket messages are sent concurrently.
+        """
+        recipients = {recipient.id: recipient for recipient in recipients}
+        if not recipients:
+            return []
+
+        preferences = {
+            preference.user_id: preference
+            for preference in NotificationPreferences.objects.filter(user_id__in=recipients)
+        }
+        missing = [NotificationPreferences(user_id=user_id) for user_id in recipients if user_id not in preferences]
+        if missing:
+            NotificationPreferences.objects.bulk_create(missing, ignore_conflicts=True)
+            preferences.update((preference.user_id, preference) for preference in missing)
+
+        expires_at = timezone.now() + timedelta(hours=expires_in_hours) if expires_in_hours else None
+        notifications = []
+        email_recipients = set()
+        for user_id, recipient in recipients.items():
+            should_in_app, should_email = NotificationService.evaluate_preferences(
+                preferences[user_id], notification_type, priority, module
+            )
+            if not should_in_app and not should_email:
+                continue
+            if should_email:
+                email_recipients.add(user_id)
+            notifications.append(
+                Notification(
+                    recipient=recipient,
+                    sender=sender,
+                    title=title,
+                    message=message,
+                    notification_type=notification_type,
+                    priority=priority,
+                    module=module,
+                    related_object_type=related_object_type,
+                    related_object_id=related_object_id,
+                    action_url=action_url,
+                    action_required=action_required,
+                    expires_at=expires_at,
+                )
+            )
+
+        notifications = Notification.objects.bulk_create(notifications, batch_size=500)
+
+        for notification in notifications:
+            if notification.recipient_id in email_recipients:
+                NotificationService.send_email_notification(notification)
+
+        try:
+            from asgiref.sync import async_to_sync
+            from .consumers import send_notifications_to_users
+            from .serializers import NotificationSerializer
+
+            unread_counts = dict(
+                Notification.objects.filter(
+                    recipient_id__in=[notification.recipient_id for notification in notifications],
+                    status=Notification.Status.UNREAD,
+                )
+                .values("recipient_id")
+                .annotate(total=Count("id"))
+                .values_list("recipient_id", "total")
+            )
+            payloads = NotificationSerializer(notifications, many=True).data
+            async_to_sync(send_notifications_to_users)(
+                [
+                    (str(notification.recipient_id), payload, unread_counts.get(notification.recipient_id, 0))
+                    for notification, payload in zip(notifications, payloads)
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send bulk notifications via WebSocket: {e}")
+
+        return notifications
+
     @staticmethod
     def send_email_notification(notification: Notification) -> bool:
         """Send email notification."""
@@ -6,16 +6,23 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from common.pagination import KeysetPagination, KeysetPaginationMixin
+
 from .models import Notification, NotificationPreferences
 from .serializers import NotificationPreferencesSerializer, NotificationSerializer
 from .services import NotificationService
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class NotificationViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for user notifications."""
 
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    keyset_pagination_class = NotificationCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ["status", "notification_type", "priority", "module"]
     search_fields = ["title", "message"]
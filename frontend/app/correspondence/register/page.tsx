@@ -36,17 +36,10 @@ import { useOrganization } from '@/contexts/OrganizationContext';
 import { useCorrespondence } from '@/contexts/CorrespondenceContext';
 import { useCurrentUser } from '@/hooks/use-current-user';
 import { useUserPermissions } from '@/hooks/use-user-permissions';
-import { generateUUID } from '@/lib/utils';
 
 // Force dynamic rendering - prevent static generation
 export const dynamic = 'force-dynamic';
 
-const generateReferenceNumber = () => {
-  const uuid = generateUUID();
-  const shortId = uuid.replace(/-/g, '').slice(0, 8).toUpperCase();
-  return `NPA/REG/${new Date().getFullYear()}/${shortId}`;
-};
-
 const CorrespondenceRegister = () => {
   const router = useRouter();
   const {
@@ -71,7 +64,7 @@ const CorrespondenceRegister = () => {
     letterDate: '',
     dispatchDate: '',
     priority: 'medium',
-    referenceNumber: generateReferenceNumber(),
+    referenceNumber: '',
     assignTo: '',
     divisionId: '',
     documentType: 'letter',
@@ -410,7 +403,10 @@ const CorrespondenceRegister = () => {
 
     const form = new FormData();
     form.append('subject', formData.subject);
-    form.append('reference_number', formData.referenceNumber);
+    // Left blank, the registry allocates the next number for the owning office.
+    if (formData.referenceNumber.trim()) {
+      form.append('reference_number', formData.referenceNumber.trim());
+    }
     form.append('sender_name', formData.senderName);
     form.append('sender_organization', formData.senderOrganization);
     const registrationDate =
@@ -754,23 +750,14 @@ const CorrespondenceRegister = () => {
                 {/* Reference Number */}
                 <div className="space-y-2 md:col-span-2">
                   <Label htmlFor="referenceNumber">Reference Number</Label>
-                  <div className="flex gap-2">
-                    <Input
-                      id="referenceNumber"
-                      name="referenceNumber"
-                      autoComplete="off"
-                      value={formData.referenceNumber}
-                      onChange={(event) => setFormData({ ...formData, referenceNumber: event.target.value })}
-                      required
-                    />
-                    <Button
-                      type="button"
-                      variant="outline"
-                      onClick={() => setFormData({ ...formData, referenceNumber: generateReferenceNumber() })}
-                    >
-                      Regenerate
-                    </Button>
-                  </div>
+                  <Input
+                    id="referenceNumber"
+                    name="referenceNumber"
+                    autoComplete="off"
+                    placeholder="Assigned automatically on registration"
+                    value={formData.referenceNumber}
+                    onChange={(event) => setFormData({ ...formData, referenceNumber: event.target.value })}
+                  />
                 </div>
 
                 {flowType === 'inward' ? (
@@ -1219,7 +1206,7 @@ const CorrespondenceRegister = () => {
                   <div className="space-y-2 text-sm">
                     <div className="flex justify-between">
                       <span className="text-muted-foreground">Reference:</span>
-                      <span className="font-medium">{formData.referenceNumber}</span>
+                      <span className="font-medium">{formData.referenceNumber || 'Assigned on registration'}</span>
                     </div>
                     <div className="flex justify-between">
                       <span className="text-muted-foreground">Priority:</span>
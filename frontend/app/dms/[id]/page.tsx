@@ -372,6 +372,19 @@ const DocumentDetailPage = () => {
     };
   }, [currentEditorSession]);
 
+  // Keep the editor session alive; the backend expires it when heartbeats stop
+  useEffect(() => {
+    if (!params?.id || !currentUser || !currentEditorSession) return;
+
+    const interval = setInterval(() => {
+      createEditorSession(params.id, currentUser.id).catch((error) =>
+        logWarn('Editor session heartbeat failed (non-critical)', error),
+      );
+    }, 30000);
+
+    return () => clearInterval(interval);
+  }, [params?.id, currentUser, currentEditorSession]);
+
   // Poll for active editors every 5 seconds
   useEffect(() => {
     if (!params?.id) return;
@@ -1,6 +1,6 @@
 "use client";
 
-import { useMemo, useState } from 'react';
+import { useEffect, useMemo, useState } from 'react';
 import {
   Dialog,
   DialogContent,
@@ -11,7 +11,7 @@ import {
 import { Button } from '@/components/ui/button';
 import { ScrollArea } from '@/components/ui/scroll-area';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
-import { type DocumentVersion } from '@/lib/dms-storage';
+import { type DocumentVersion, fetchVersionDiff, hasTokens } from '@/lib/dms-storage';
 import { Diff, computeLineDiff } from '@/lib/diff-utils';
 
 interface VersionCompareDialogProps {
@@ -31,11 +31,30 @@ export const VersionCompareDialog = ({ open, onOpenChange, versions, baseVersion
     return versions.find((version) => version.id === selectedTarget) ?? versions[0];
   }, [versions, selectedTarget]);
 
+  const [serverDiff, setServerDiff] = useState<Diff[] | null>(null);
+
+  // Older revisions are stored as deltas, so ask the server for the diff instead of
+  // loading both bodies; fall back to a local diff when offline.
+  useEffect(() => {
+    setServerDiff(null);
+    if (!open || !baselineVersion || !targetVersion || !hasTokens()) return;
+    let cancelled = false;
+    fetchVersionDiff(baselineVersion.documentId, baselineVersion.versionNumber, targetVersion.versionNumber)
+      .then((result) => {
+        if (!cancelled) setServerDiff(result.changes);
+      })
+      .catch(() => undefined);
+    return () => {
+      cancelled = true;
+    };
+  }, [open, baselineVersion, targetVersion]);
+
   const diff: Diff[] = useMemo(() => {
+    if (serverDiff) return serverDiff;
     const baselineText = baselineVersion?.contentHtml ?? '';
     const targetText = targetVersion?.contentHtml ?? '';
     return computeLineDiff(baselineText, targetText);
-  }, [baselineVersion, targetVersion]);
+  }, [serverDiff, baselineVersion, targetVersion]);
 
   return (
     <Dialog open={open} onOpenChange={onOpenChange}>
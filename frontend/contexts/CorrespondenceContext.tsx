@@ -312,7 +312,8 @@ export const CorrespondenceProvider = ({ children }: { children: ReactNode }) =>
 
     try {
       const [correspondenceRaw, minutesRaw, delegationsRaw] = await Promise.all([
-        apiFetch('/correspondence/items/'),
+        // The shared store keeps full records; plain list requests return compact pages.
+        apiFetch('/correspondence/items/?include_timeline=true'),
         apiFetch('/correspondence/minutes/'),
         apiFetch('/correspondence/delegations/'),
       ]);
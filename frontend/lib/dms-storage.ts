@@ -166,7 +166,11 @@ const mapDocument = (item: any): DocumentRecord => ({
   divisionId: item.division ?? item.division_id ?? undefined,
   departmentId: item.department ?? item.department_id ?? undefined,
   tags: Array.isArray(item.tags) ? item.tags.map(String) : [],
-  versions: Array.isArray(item.versions) ? item.versions.map(mapDocumentVersion) : [],
+  versions: Array.isArray(item.versions)
+    ? item.versions.map(mapDocumentVersion)
+    : item.latest_version
+      ? [mapDocumentVersion(item.latest_version)]
+      : [],
   permissions: Array.isArray(item.permissions) ? item.permissions.map(mapDocumentPermission) : [],
   createdAt: item.created_at ?? new Date().toISOString(),
   updatedAt: item.updated_at ?? new Date().toISOString(),
@@ -566,6 +570,24 @@ export const getAccessibleDocumentsForUser = (user: User): DocumentRecord[] => {
 };
 
 // Document Comments API
+export interface VersionDiff {
+  from: number;
+  to: number;
+  added: number;
+  removed: number;
+  changes: { type: 'added' | 'removed' | 'unchanged'; value: string }[];
+}
+
+export const fetchVersionDiff = async (
+  documentId: string,
+  fromVersion: number,
+  toVersion: number,
+  field: 'html' | 'text' = 'html',
+): Promise<VersionDiff> => {
+  const params = new URLSearchParams({ from: String(fromVersion), to: String(toVersion), field });
+  return apiFetch<VersionDiff>(`/dms/documents/${documentId}/diff/?${params.toString()}`);
+};
+
 export const getDocumentComments = async (documentId: string, versionId?: string | null): Promise<DocumentComment[]> => {
   if (!hasTokens()) return [];
   